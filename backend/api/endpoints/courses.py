@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 from core.dependencies import get_course_service
+from core.routing import UnitOfWorkRoute
 from domain.courses import (
     CourseService,
     CourseCreate,
@@ -24,7 +25,7 @@ from domain.courses import (
     LessonNotFoundError
 )
 
-router = APIRouter(tags=["courses"])
+router = APIRouter(tags=["courses"], route_class=UnitOfWorkRoute)
 
 # Temporary - will implement proper auth later
 def get_current_user_id() -> int:
@@ -2,11 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 
 from core.dependencies import get_deck_service
+from core.routing import UnitOfWorkRoute
 from domain.decks import schemas
 from domain.decks.service import DeckService
 from domain.decks.exceptions import DeckNotFoundError, DeckAccessDeniedError
 
-router = APIRouter(tags=["decks"], redirect_slashes=False)
+router = APIRouter(tags=["decks"], redirect_slashes=False, route_class=UnitOfWorkRoute)
 
 
 @router.post("", response_model=schemas.DeckResponse, status_code=status.HTTP_201_CREATED)
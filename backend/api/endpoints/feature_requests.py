@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 
 from core.dependencies import get_feature_request_service
+from core.routing import UnitOfWorkRoute
 from domain.feature_requests import (
     FeatureRequestService,
     FeatureRequestCreate,
@@ -13,7 +14,7 @@ from domain.feature_requests import (
     FeatureRequestNotFoundError,
 )
 
-router = APIRouter(tags=["feature_requests"])
+router = APIRouter(tags=["feature_requests"], route_class=UnitOfWorkRoute)
 
 
 def get_current_user_id() -> int:
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from core.dependencies import get_verse_service
+from core.routing import UnitOfWorkRoute
 from domain.verses import schemas
 from domain.verses.service import VerseService
 from domain.verses.exceptions import VerseNotFoundError
 
-router = APIRouter(tags=["verses"])
+router = APIRouter(tags=["verses"], route_class=UnitOfWorkRoute)
 
 
 @router.get("/{user_id}", response_model=List[schemas.UserVerseResponse])
@@ -3,8 +3,9 @@ from typing import List
 
 from domain.books import BookService, Book
 from core.dependencies import get_book_service
+from core.routing import UnitOfWorkRoute
 
-router = APIRouter(prefix="/books", tags=["books"])
+router = APIRouter(prefix="/books", tags=["books"], route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=List[Book])
 def list_books(service: BookService = Depends(get_book_service)):
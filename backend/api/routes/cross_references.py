@@ -1,15 +1,36 @@
 """Cross-references API routes"""
 
 import logging
+from functools import lru_cache
+from operator import attrgetter
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel
 from core.dependencies import get_db
+from core.routing import UnitOfWorkRoute
 from database import DatabaseConnection
+from bible_books import books
+from cross_reference_graph import get_graph
+from prepared_statements import prepared
+from verse_catalog import get_catalog
+from verse_ranges import VerseRange, columns, display_reference, group_ranges
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/verses", tags=["cross-references"])
+router = APIRouter(prefix="/verses", tags=["cross-references"], route_class=UnitOfWorkRoute)
+
+# Per-user memorization overlay; the references themselves come from the
+# in-process graph (cross_reference_graph)
+USER_OVERLAY = prepared("cross_reference_user_overlay", """
+    SELECT
+        v.verse_id,
+        COALESCE(uv.practice_count, 0) as practice_count,
+        COALESCE(uvc.confidence_score, 0.0) as confidence_score
+    FROM unnest(%s::int[]) AS v(verse_id)
+    LEFT JOIN user_verses uv ON uv.verse_id = v.verse_id AND uv.user_id = %s
+    LEFT JOIN user_verse_confidence uvc ON uvc.verse_id = v.verse_id AND uvc.user_id = %s
+    WHERE uv.verse_id IS NOT NULL OR uvc.verse_id IS NOT NULL
+""")
 
 
 class CrossReferenceResponse(BaseModel):
@@ -32,6 +53,39 @@ class CrossReferenceResponse(BaseModel):
     display_reference: Optional[str] = None
 
 
+class ExploredReferenceResponse(CrossReferenceResponse):
+    hops: int  # distance from the starting verse(s); 1 = direct cross-reference
+    score: float  # aggregated confidence over shortest paths, see CrossReferenceGraph.explore
+
+
+class ChapterReferenceTarget(BaseModel):
+    verse_id: int
+    verse_code: str
+    display_reference: str
+    cross_ref_confidence: float
+    direction: str  # 'from' or 'to'
+
+
+class ChapterVerseReferences(BaseModel):
+    verse_id: int
+    verse_code: str
+    verse_number: int
+    outgoing_count: int  # verses this verse refers to
+    incoming_count: int  # verses referring to this verse
+    top_references: List[ChapterReferenceTarget]
+
+
+class ChapterCrossReferencesResponse(BaseModel):
+    book_id: int
+    book_name: str
+    chapter: int
+    verses: List[ChapterVerseReferences]
+
+
+# Longest passage accepted as the starting point of an exploration
+MAX_EXPLORE_PASSAGE = 200
+
+
 def get_current_user_id() -> int:
     """Placeholder for auth"""
     return 1
@@ -42,18 +96,20 @@ def lookup_verse(
     book_id: int = Query(...),
     chapter: int = Query(...),
     verse: int = Query(...),
-    db: DatabaseConnection = Depends(get_db),
 ):
     """Look up a verse by book, chapter, and verse number"""
-    query = """
-        SELECT id, verse_code, book_id, chapter_number, verse_number
-        FROM bible_verses
-        WHERE book_id = %s AND chapter_number = %s AND verse_number = %s
-    """
-    result = db.fetch_one(query, (book_id, chapter, verse))
-    if not result:
+    catalog = get_catalog()
+    pos = catalog.position_of(book_id, chapter, verse)
+    if pos < 0:
         raise HTTPException(status_code=404, detail="Verse not found")
-    return result
+    result = catalog.verse_at(pos)
+    return {
+        "id": result.id,
+        "verse_code": result.verse_code,
+        "book_id": result.book_id,
+        "chapter_number": result.chapter_number,
+        "verse_number": result.verse_number,
+    }
 
 
 @router.get("/{verse_id}/cross-references", response_model=List[CrossReferenceResponse])
@@ -66,170 +122,109 @@ def get_cross_references(
     logger.info(f"Getting cross-references for verse_id: {verse_id}")
     
     # Get both "from" and "to" references
-    query = """
-        WITH cross_refs AS (
-            -- References FROM this verse (this verse references others)
-            SELECT 
-                bv.id as verse_id,
-                bv.verse_code,
-                bb.book_name,
-                bb.book_id,
-                bv.chapter_number as chapter,
-                bv.verse_number,
-                cr.confidence_score as cross_ref_confidence,
-                'to' as direction
-            FROM cross_references cr
-            JOIN bible_verses bv ON cr.to_verse_id = bv.id
-            JOIN bible_books bb ON bv.book_id = bb.book_id
-            WHERE cr.from_verse_id = %s
-            
-            UNION ALL
-            
-            -- References TO this verse (other verses reference this one)
-            SELECT 
-                bv.id as verse_id,
-                bv.verse_code,
-                bb.book_name,
-                bb.book_id,
-                bv.chapter_number as chapter,
-                bv.verse_number,
-                cr.confidence_score as cross_ref_confidence,
-                'from' as direction
-            FROM cross_references cr
-            JOIN bible_verses bv ON cr.from_verse_id = bv.id
-            JOIN bible_books bb ON bv.book_id = bb.book_id
-            WHERE cr.to_verse_id = %s
-        )
-        SELECT DISTINCT
-            cr.*,
-            COALESCE(uv.practice_count, 0) as practice_count,
-            COALESCE(uv.practice_count > 0, false) as is_memorized,
-            COALESCE(uvc.confidence_score, 0.0) as confidence_score
-        FROM cross_refs cr
-        LEFT JOIN user_verses uv ON cr.verse_id = uv.verse_id AND uv.user_id = %s
-        LEFT JOIN user_verse_confidence uvc ON cr.verse_id = uvc.verse_id AND uvc.user_id = %s
-        ORDER BY cr.direction, cr.book_id, cr.chapter, cr.verse_number
-    """
-    
-    results = db.fetch_all(query, (verse_id, verse_id, user_id, user_id))
+    results = _neighbour_rows(verse_id)
+    _apply_user_overlay(results, user_id, db)
     
     logger.info(f"Found {len(results)} cross-references for verse_id {verse_id}")
     
     # Group consecutive verses into ranges
-    grouped_refs = _group_into_ranges(results)
-    logger.info(f"Grouped into {len(grouped_refs)} ranges from {len(results)} individual verses")
-    
-    # Convert to response format
-    cross_refs = []
-    for group in grouped_refs:
-        first_verse = group[0]
-        last_verse = group[-1] if len(group) > 1 else first_verse
-        is_range = len(group) > 1
-        
-        # Create display reference string
-        if is_range:
-            if first_verse["chapter"] == last_verse["chapter"]:
-                # Same chapter range
-                display_ref = f"{first_verse['book_name']} {first_verse['chapter']}:{first_verse['verse_number']}-{last_verse['verse_number']}"
-            else:
-                # Cross-chapter range
-                display_ref = f"{first_verse['book_name']} {first_verse['chapter']}:{first_verse['verse_number']}-{last_verse['chapter']}:{last_verse['verse_number']}"
-            logger.debug(f"Created range: {display_ref} from {len(group)} verses")
-        else:
-            display_ref = f"{first_verse['book_name']} {first_verse['chapter']}:{first_verse['verse_number']}"
-        
-        # Check if all verses in range are memorized
-        all_memorized = all(v["is_memorized"] for v in group)
-        
-        # Use highest confidence and sum practice counts
-        max_confidence = max(v["cross_ref_confidence"] for v in group)
-        total_practice = sum(v["practice_count"] for v in group)
-        avg_score = sum(v["confidence_score"] for v in group) / len(group)
-        
-        cross_refs.append(CrossReferenceResponse(
-            verse_id=first_verse["verse_id"],
-            verse_code=first_verse["verse_code"],
-            book_name=first_verse["book_name"],
-            chapter=first_verse["chapter"],
-            verse_number=first_verse["verse_number"],
-            verse_text=None,  # Will be fetched separately by frontend
-            is_memorized=all_memorized,
-            practice_count=total_practice,
-            confidence_score=avg_score,
-            cross_ref_confidence=max_confidence,
-            direction=first_verse["direction"],
-            # Range fields
-            end_verse_id=last_verse["verse_id"] if is_range else None,
-            end_chapter=last_verse["chapter"] if is_range else None,
-            end_verse_number=last_verse["verse_number"] if is_range else None,
-            is_range=is_range,
-            display_reference=display_ref
-        ))
+    ranges = _group_rows(results)
+    logger.info(f"Grouped into {len(ranges)} ranges from {len(results)} individual verses")
     
-    return cross_refs
+    return [_range_response(results, verse_range) for verse_range in ranges]
 
 
-def _group_into_ranges(verses: List[dict]) -> List[List[dict]]:
-    """Group consecutive verses into ranges"""
-    if not verses:
-        return []
-    
-    # Log input for debugging
-    logger.info(f"Grouping {len(verses)} verses into ranges")
-    if len(verses) > 0:
-        first_verses = [f"{v['book_name']} {v['chapter']}:{v['verse_number']}" for v in verses[:5]]
-        logger.info(f"First few verses: {first_verses}")
-    
-    grouped = []
-    current_group = [verses[0]]
-    
-    for i in range(1, len(verses)):
-        prev = verses[i - 1]
-        curr = verses[i]
-        
-        # Log each comparison for debugging
-        prev_ref = f"{prev['book_name']} {prev['chapter']}:{prev['verse_number']}"
-        curr_ref = f"{curr['book_name']} {curr['chapter']}:{curr['verse_number']}"
-        logger.debug(f"Comparing {prev_ref} with {curr_ref}")
-        
-        # Check if verses are consecutive (same book and direction)
-        same_book = prev["book_id"] == curr["book_id"]
-        same_direction = prev["direction"] == curr["direction"]
-        
-        # Check if consecutive within chapter
-        same_chapter = prev["chapter"] == curr["chapter"]
-        consecutive_in_chapter = same_chapter and curr["verse_number"] == prev["verse_number"] + 1
-        
-        logger.debug(f"  same_book={same_book}, same_direction={same_direction}, same_chapter={same_chapter}, consecutive={consecutive_in_chapter}")
-        
-        if same_book and same_direction and consecutive_in_chapter:
-            # Add to current group for consecutive verses in same chapter
-            logger.debug(f"  -> Adding to current group")
-            current_group.append(curr)
-        else:
-            # Start new group
-            logger.debug(f"  -> Starting new group")
-            grouped.append(current_group)
-            current_group = [curr]
-    
-    # Add the last group
-    if current_group:
-        grouped.append(current_group)
-    
-    # Log grouping results
-    logger.info(f"Created {len(grouped)} groups")
-    for i, group in enumerate(grouped[:5]):  # Log first 5 groups
-        if len(group) > 1:
-            range_ref = f"{group[0]['book_name']} {group[0]['chapter']}:{group[0]['verse_number']}-{group[-1]['verse_number']}"
-            logger.info(f"  Group {i}: {range_ref} ({len(group)} verses)")
-        else:
-            single_ref = f"{group[0]['book_name']} {group[0]['chapter']}:{group[0]['verse_number']}"
-            logger.info(f"  Group {i}: {single_ref} (single verse)")
-    
-    # Sort groups by the highest confidence score in each group (highest first)
-    grouped.sort(key=lambda g: max(v["cross_ref_confidence"] for v in g), reverse=True)
-    
-    return grouped
+def _group_rows(rows: List[dict]) -> List[VerseRange]:
+    """Ranges of consecutive verses in the same direction, strongest first"""
+    book_ids, chapters, verse_numbers, confidence, practice, user_confidence, directions = columns(
+        rows, "book_id", "chapter", "verse_number", "cross_ref_confidence",
+        "practice_count", "confidence_score", "direction",
+    )
+    ranges = group_ranges(book_ids, chapters, verse_numbers, confidence, practice, user_confidence, keys=directions)
+    ranges.sort(key=attrgetter("max_score"), reverse=True)
+    return ranges
+
+
+def _range_response(rows: List[dict], verse_range: VerseRange) -> CrossReferenceResponse:
+    """Convert one range from ``_group_rows`` to the response format"""
+    first = rows[verse_range.start]
+    last = rows[verse_range.end - 1]
+    is_range = verse_range.is_range
+    return CrossReferenceResponse(
+        verse_id=first["verse_id"],
+        verse_code=first["verse_code"],
+        book_name=first["book_name"],
+        chapter=first["chapter"],
+        verse_number=first["verse_number"],
+        verse_text=None,  # Will be fetched separately by frontend
+        is_memorized=verse_range.all_memorized,
+        practice_count=verse_range.practice_total,
+        confidence_score=verse_range.confidence_mean,
+        cross_ref_confidence=verse_range.max_score,
+        direction=first["direction"],
+        # Range fields
+        end_verse_id=last["verse_id"] if is_range else None,
+        end_chapter=last["chapter"] if is_range else None,
+        end_verse_number=last["verse_number"] if is_range else None,
+        is_range=is_range,
+        display_reference=display_reference(
+            first["book_name"], first["chapter"], first["verse_number"], last["chapter"], last["verse_number"]
+        ),
+    )
+
+
+def _neighbour_rows(verse_id: int) -> List[dict]:
+    """One row per referenced/referencing verse, ordered like the old SQL
+    (direction, then canonical order)"""
+    graph = get_graph()
+    catalog = get_catalog()
+    rows = []
+    for direction, (neighbours, _, confidence) in (
+        ("from", graph.incoming(verse_id)),
+        ("to", graph.outgoing(verse_id)),
+    ):
+        positioned = []
+        for neighbour, score in zip(neighbours, confidence):
+            pos = catalog.position_of_id(neighbour)
+            if pos >= 0:
+                positioned.append((pos, score))
+        positioned.sort()
+        for pos, score in positioned:
+            rows.append(_verse_row(catalog.verse_at(pos), score, direction))
+    return rows
+
+
+def _verse_row(verse, cross_ref_confidence: float, direction: str) -> dict:
+    """Row shape consumed by ``_group_rows`` and ``_range_response``"""
+    return {
+        "verse_id": verse.id,
+        "verse_code": verse.verse_code,
+        "book_name": books.name(verse.book_id),
+        "book_id": verse.book_id,
+        "chapter": verse.chapter_number,
+        "verse_number": verse.verse_number,
+        "cross_ref_confidence": cross_ref_confidence,
+        "direction": direction,
+        "practice_count": 0,
+        "is_memorized": False,
+        "confidence_score": 0.0,
+    }
+
+
+def _apply_user_overlay(rows: List[dict], user_id: int, db: DatabaseConnection) -> None:
+    """Fill in the user's practice counts and confidence (one query)"""
+    if not rows:
+        return
+    overlay = {
+        row.verse_id: row
+        for row in db.fetch_rows(USER_OVERLAY, (list({r["verse_id"] for r in rows}), user_id, user_id))
+    }
+    for r in rows:
+        user_row = overlay.get(r["verse_id"])
+        if user_row is not None:
+            r["practice_count"] = user_row.practice_count
+            r["is_memorized"] = user_row.practice_count > 0
+            r["confidence_score"] = float(user_row.confidence_score)
 
 
 @router.get("/cross-references/by-reference", response_model=List[CrossReferenceResponse])
@@ -242,15 +237,143 @@ def get_cross_references_by_reference(
 ):
     """Get cross-references by book, chapter, and verse"""
     # First look up the verse
-    verse_query = """
-        SELECT id FROM bible_verses
-        WHERE book_id = %s AND chapter_number = %s AND verse_number = %s
-    """
-    verse_result = db.fetch_one(verse_query, (book_id, chapter, verse))
+    verse_id = get_catalog().id_for(book_id, chapter, verse)
     
-    if not verse_result:
+    if verse_id is None:
         logger.warning(f"Verse not found: book_id={book_id}, chapter={chapter}, verse={verse}")
         return []
     
     # Get cross-references for this verse
-    return get_cross_references(verse_result["id"], user_id, db)
\ No newline at end of file
+    return get_cross_references(verse_id, user_id, db)
+
+
+@router.get("/{verse_id}/cross-references/explore", response_model=List[ExploredReferenceResponse])
+def explore_cross_references(
+    verse_id: int,
+    end_verse_id: Optional[int] = Query(None, description="Explore from the passage verse_id..end_verse_id"),
+    depth: int = Query(2, ge=1, le=4, description="Number of hops to follow"),
+    max_fanout: int = Query(10, ge=1, le=100, description="Strongest edges followed per verse"),
+    max_nodes: int = Query(100, ge=1, le=1000, description="Maximum verses returned"),
+    min_votes: int = Query(0, ge=0, description="Ignore cross-references with fewer votes"),
+    direction: str = Query("both", pattern="^(both|to|from)$"),
+    user_id: int = Depends(get_current_user_id),
+    db: DatabaseConnection = Depends(get_db),
+):
+    """Multi-hop cross-reference neighbourhood of a verse or passage.
+
+    Walks the in-memory graph breadth-first and returns the reached verses
+    grouped into ranges, strongest aggregated confidence first.
+    """
+    catalog = get_catalog()
+    start = catalog.position_of_id(verse_id)
+    if start < 0:
+        raise HTTPException(status_code=404, detail="Verse not found")
+    end = start
+    if end_verse_id is not None:
+        end = catalog.position_of_id(end_verse_id)
+        if end < start:
+            raise HTTPException(status_code=400, detail="end_verse_id must be a verse at or after verse_id")
+        if end - start >= MAX_EXPLORE_PASSAGE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Passages are limited to {MAX_EXPLORE_PASSAGE} verses",
+            )
+    seeds = [catalog.verse_at(pos).id for pos in range(start, end + 1)]
+
+    hits = get_graph().explore(
+        seeds,
+        depth=depth,
+        max_fanout=max_fanout,
+        max_nodes=max_nodes,
+        min_votes=min_votes,
+        direction=direction,
+    )
+    logger.info(f"Explored {len(hits)} verses within {depth} hops of {len(seeds)} verse(s) from {verse_id}")
+
+    # Group each hop level separately so a range never mixes distances
+    by_hops = {}
+    for hit in hits:
+        pos = catalog.position_of_id(hit.verse_id)
+        if pos >= 0:
+            by_hops.setdefault(hit.hops, []).append((pos, hit))
+    levels = []
+    for level in sorted(by_hops):
+        level_rows = []
+        for pos, hit in sorted(by_hops[level]):
+            row = _verse_row(catalog.verse_at(pos), hit.confidence, hit.direction)
+            row["hops"] = hit.hops
+            row["score"] = hit.score
+            level_rows.append(row)
+        levels.append(level_rows)
+    _apply_user_overlay([row for level_rows in levels for row in level_rows], user_id, db)
+
+    explored = []
+    for level_rows in levels:
+        for verse_range in _group_rows(level_rows):
+            explored.append(ExploredReferenceResponse(
+                **_range_response(level_rows, verse_range).model_dump(),
+                hops=level_rows[verse_range.start]["hops"],
+                score=max(row["score"] for row in level_rows[verse_range.start:verse_range.end]),
+            ))
+    explored.sort(key=lambda ref: ref.score, reverse=True)
+    return explored
+
+
+@router.get("/cross-references/by-chapter", response_model=ChapterCrossReferencesResponse)
+def get_chapter_cross_references(
+    book_id: int = Query(...),
+    chapter: int = Query(...),
+    top: int = Query(5, ge=0, le=50, description="Strongest references listed per verse"),
+):
+    """Cross-reference counts and strongest references for every verse of a chapter"""
+    summary = _chapter_summary(get_graph().generation, book_id, chapter, top)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+    return summary
+
+
+@lru_cache(maxsize=1024)
+def _chapter_summary(generation: int, book_id: int, chapter: int, top: int) -> Optional[ChapterCrossReferencesResponse]:
+    """Per-chapter aggregates, built on first request from the in-memory graph.
+
+    Keyed by the graph's generation rather than the graph itself, so entries
+    for a replaced graph (after ``reload_graph``) are never served and age
+    out of the cache without keeping the old graph in memory.
+    """
+    graph = get_graph()
+    catalog = get_catalog()
+    verse_ids = catalog.chapter_ids(book_id, chapter)
+    if not verse_ids:
+        return None
+
+    verses = []
+    for verse_id in verse_ids:
+        verse = catalog.by_id(verse_id)
+        targets = []
+        for confidence, neighbour, direction in sorted(graph.strongest_edges(verse_id, top), reverse=True):
+            target = catalog.by_id(neighbour)
+            if target is None:
+                continue
+            targets.append(ChapterReferenceTarget(
+                verse_id=target.id,
+                verse_code=target.verse_code,
+                display_reference=display_reference(
+                    books.name(target.book_id), target.chapter_number, target.verse_number
+                ),
+                cross_ref_confidence=confidence,
+                direction=direction,
+            ))
+        verses.append(ChapterVerseReferences(
+            verse_id=verse_id,
+            verse_code=verse.verse_code,
+            verse_number=verse.verse_number,
+            outgoing_count=graph.forward.degree(verse_id),
+            incoming_count=graph.reverse.degree(verse_id),
+            top_references=targets,
+        ))
+    return ChapterCrossReferencesResponse(
+        book_id=book_id,
+        book_name=books.name(book_id),
+        chapter=chapter,
+        verses=verses,
+    )
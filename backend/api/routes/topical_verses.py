@@ -5,11 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel
 from core.dependencies import get_db
+from core.routing import UnitOfWorkRoute
 from database import DatabaseConnection
+from verse_ranges import VerseRange, columns, display_reference, group_ranges
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/topical", tags=["topical-verses"])
+router = APIRouter(prefix="/topical", tags=["topical-verses"], route_class=UnitOfWorkRoute)
 
 
 class TopicalVerseResponse(BaseModel):
@@ -46,38 +48,12 @@ def get_current_user_id() -> int:
     return 1
 
 
-def _group_into_ranges(verses: List[dict]) -> List[List[dict]]:
-    """Group consecutive verses into ranges"""
-    if not verses:
-        return []
-    
-    grouped = []
-    current_group = [verses[0]]
-    
-    for i in range(1, len(verses)):
-        prev = verses[i - 1]
-        curr = verses[i]
-        
-        # Check if verses are consecutive (same book)
-        same_book = prev.get("book_id") == curr.get("book_id") or prev.get("book_name") == curr.get("book_name")
-        
-        # Check if consecutive within chapter
-        same_chapter = prev["chapter"] == curr["chapter"]
-        consecutive_in_chapter = same_chapter and curr["verse_number"] == prev["verse_number"] + 1
-        
-        if same_book and consecutive_in_chapter:
-            # Add to current group for consecutive verses in same chapter
-            current_group.append(curr)
-        else:
-            # Start new group
-            grouped.append(current_group)
-            current_group = [curr]
-    
-    # Add the last group
-    if current_group:
-        grouped.append(current_group)
-    
-    return grouped
+def _group_rows(rows: List[dict]) -> List[VerseRange]:
+    """Ranges of consecutive verses, in input order"""
+    book_ids, chapters, verse_numbers, relevance, practice, user_confidence = columns(
+        rows, "book_id", "chapter", "verse_number", "topic_relevance", "practice_count", "confidence_score",
+    )
+    return group_ranges(book_ids, chapters, verse_numbers, relevance, practice, user_confidence)
 
 
 # Sample topics - in a real implementation, these would be in the database
@@ -194,34 +170,15 @@ def get_topical_verses(
         logger.info(f"Found {len(results)} verses for topic: {topic_name}")
         
         # Group consecutive verses into ranges
-        grouped_refs = _group_into_ranges(results)
-        logger.info(f"Grouped into {len(grouped_refs)} ranges from {len(results)} individual verses")
+        ranges = _group_rows(results)
+        logger.info(f"Grouped into {len(ranges)} ranges from {len(results)} individual verses")
         
         # Convert to response format
         verses = []
-        for group in grouped_refs:
-            first_verse = group[0]
-            last_verse = group[-1] if len(group) > 1 else first_verse
-            is_range = len(group) > 1
-            
-            # Create display reference string
-            if is_range:
-                if first_verse["chapter"] == last_verse["chapter"]:
-                    # Same chapter range
-                    display_ref = f"{first_verse['book_name']} {first_verse['chapter']}:{first_verse['verse_number']}-{last_verse['verse_number']}"
-                else:
-                    # Cross-chapter range
-                    display_ref = f"{first_verse['book_name']} {first_verse['chapter']}:{first_verse['verse_number']}-{last_verse['chapter']}:{last_verse['verse_number']}"
-            else:
-                display_ref = f"{first_verse['book_name']} {first_verse['chapter']}:{first_verse['verse_number']}"
-            
-            # Check if all verses in range are memorized
-            all_memorized = all(v["is_memorized"] for v in group)
-            
-            # Use highest topic relevance and sum practice counts
-            max_relevance = max(v["topic_relevance"] for v in group)
-            total_practice = sum(v["practice_count"] for v in group)
-            avg_score = sum(v["confidence_score"] for v in group) / len(group)
+        for verse_range in ranges:
+            first_verse = results[verse_range.start]
+            last_verse = results[verse_range.end - 1]
+            is_range = verse_range.is_range
             
             verses.append(TopicalVerseResponse(
                 verse_id=first_verse["verse_id"],
@@ -230,17 +187,20 @@ def get_topical_verses(
                 chapter=first_verse["chapter"],
                 verse_number=first_verse["verse_number"],
                 verse_text=None,  # Will be fetched separately by frontend
-                is_memorized=all_memorized,
-                practice_count=total_practice,
-                confidence_score=avg_score,
-                topic_relevance=max_relevance,
+                is_memorized=verse_range.all_memorized,
+                practice_count=verse_range.practice_total,
+                confidence_score=verse_range.confidence_mean,
+                topic_relevance=verse_range.max_score,
                 topic_name=topic_name,
                 # Range fields
                 end_verse_id=last_verse["verse_id"] if is_range else None,
                 end_chapter=last_verse["chapter"] if is_range else None,
                 end_verse_number=last_verse["verse_number"] if is_range else None,
                 is_range=is_range,
-                display_reference=display_ref
+                display_reference=display_reference(
+                    first_verse["book_name"], first_verse["chapter"], first_verse["verse_number"],
+                    last_verse["chapter"], last_verse["verse_number"],
+                ),
             ))
         
         # Sort by relevance (highest first)
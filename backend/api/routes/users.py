@@ -15,8 +15,9 @@ from domain.users import (
 )
 from domain.core.exceptions import ValidationError
 from core.dependencies import get_user_service
+from core.routing import UnitOfWorkRoute
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=UnitOfWorkRoute)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -1,8 +1,10 @@
 """Verses API routes - unified from all implementations"""
 
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional, Dict
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional, Dict
 from pydantic import BaseModel
 from domain.verses import (
     VerseService,
@@ -17,15 +19,19 @@ from domain.verses import (
     InvalidVerseCodeError,
 )
 from domain.core.exceptions import ValidationError
-from core.dependencies import get_verse_service, get_db
-from database import DatabaseConnection
+from core.dependencies import get_verse_service, get_async_db
+from core.routing import UnitOfWorkRoute
+from database import AsyncDatabaseConnection
+from bible_books import books
+import csv
+import io
 import json
 from datetime import datetime, timedelta
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-def resolve_bible_id(bible_identifier: str, db: DatabaseConnection) -> str:
+async def resolve_bible_id(bible_identifier: str, db: AsyncDatabaseConnection) -> str:
     """
     Resolve a Bible identifier (ID or abbreviation) to an actual API.Bible ID.
     Uses cached Bible data to find the correct ID.
@@ -51,12 +57,12 @@ def resolve_bible_id(bible_identifier: str, db: DatabaseConnection) -> str:
     """
     cache_expiry = datetime.now() - timedelta(days=29)
     
-    cached = db.fetch_one(cache_query, (cache_key, cache_expiry))
+    cached = await db.fetch_one(cache_query, (cache_key, cache_expiry))
     
     if not cached:
         # Try language-specific cache
         cache_key = "bibles_available_eng"  # Default to English
-        cached = db.fetch_one(cache_query, (cache_key, cache_expiry))
+        cached = await db.fetch_one(cache_query, (cache_key, cache_expiry))
     
     if cached:
         try:
@@ -86,7 +92,7 @@ def resolve_bible_id(bible_identifier: str, db: DatabaseConnection) -> str:
     logger.warning(f"Could not resolve Bible identifier '{bible_identifier}', using as-is")
     return bible_identifier
 
-router = APIRouter(prefix="/verses", tags=["verses"])
+router = APIRouter(prefix="/verses", tags=["verses"], route_class=UnitOfWorkRoute)
 
 
 def get_current_user_id() -> int:
@@ -109,6 +115,70 @@ def get_user_verses(
     return service.get_user_verses(user_id, include_apocrypha)
 
 
+@router.get("/stream")
+def stream_user_verses(
+    include_apocrypha: bool = False,
+    user_id: int = Depends(get_current_user_id),
+    service: VerseService = Depends(get_verse_service),
+):
+    """Stream the current user's verses as NDJSON (one UserVerseResponse per line)"""
+    verses = service.iter_user_verses(user_id, include_apocrypha)
+    return StreamingResponse(
+        (verse.model_dump_json() + "\n" for verse in verses),
+        media_type="application/x-ndjson",
+    )
+
+
+EXPORT_COLUMNS = [
+    "reference", "verse_code", "book_name", "chapter", "verse", "practice_count",
+    "confidence_score", "last_practiced", "last_reviewed", "created_at",
+]
+
+
+def _csv_lines(verses: Iterator[UserVerseResponse]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield flush()
+    for v in verses:
+        detail = v.verse
+        writer.writerow([
+            f"{detail.book_name} {detail.chapter_number}:{detail.verse_number}",
+            detail.verse_id,
+            detail.book_name,
+            detail.chapter_number,
+            detail.verse_number,
+            v.practice_count,
+            v.confidence_score,
+            v.last_practiced,
+            v.last_reviewed,
+            v.created_at,
+        ])
+        yield flush()
+
+
+@router.get("/export")
+def export_user_verses(
+    include_apocrypha: bool = False,
+    user_id: int = Depends(get_current_user_id),
+    service: VerseService = Depends(get_verse_service),
+):
+    """Download the current user's memorized verses as CSV, streamed row by row"""
+    verses = service.iter_user_verses(user_id, include_apocrypha)
+    return StreamingResponse(
+        _csv_lines(verses),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="verses-{user_id}.csv"'},
+    )
+
+
 @router.put("/{book_id}/{chapter}/{verse}", response_model=dict)
 def save_or_update_verse(
     book_id: int,
@@ -220,25 +290,24 @@ def clear_all_memorization(
 async def get_verse_texts(
     request: VerseTextsRequestBody,
     user_id: int = Depends(get_current_user_id),
-    service: VerseService = Depends(get_verse_service),
-    db: DatabaseConnection = Depends(get_db),
+    db: AsyncDatabaseConnection = Depends(get_async_db),
 ):
     """Get verse texts from Bible API"""
-    from services.api_bible import APIBibleService
     from services.esv_api import ESVService, ESVRateLimitError
+    from services.verse_text_batcher import verse_text_batcher
     from config import Config
 
     verse_codes = request.verse_codes
     requested_bible = request.bible_id or Config.DEFAULT_BIBLE_ID
     
     # Resolve abbreviation to actual API.Bible ID dynamically
-    bible_id = resolve_bible_id(requested_bible, db)
+    bible_id = await resolve_bible_id(requested_bible, db)
     
     logger.info(f"Getting texts for {len(verse_codes)} verses for user {user_id}")
     logger.info(f"Bible ID requested: {requested_bible}, resolved to: {bible_id}")
 
     try:
-        user_pref = db.fetch_one(
+        user_pref = await db.fetch_one(
             "SELECT use_esv_api, esv_api_token FROM users WHERE user_id = %s",
             (user_id,),
         )
@@ -247,24 +316,16 @@ async def get_verse_texts(
 
         if use_esv and esv_token:
             logger.info("Using ESV API for verse texts")
-            refs_query = """
-                SELECT bv.verse_code, bb.book_name, bv.chapter_number, bv.verse_number
-                FROM bible_verses bv
-                JOIN bible_books bb ON bv.book_id = bb.book_id
-                WHERE bv.verse_code = ANY(%s)
-            """
-            refs = db.fetch_all(refs_query, (verse_codes,))
-            ref_map = {
-                r["verse_code"]: f"{r['book_name']} {r['chapter_number']}:{r['verse_number']}"
-                for r in refs
-            }
+            ref_map = books.references(verse_codes)
 
+            # Don't hold the request's connection during upstream calls
+            await db.release()
             esv = ESVService(esv_token)
-            verse_texts = esv.get_verses_batch(ref_map)
+            verse_texts = await asyncio.to_thread(esv.get_verses_batch, ref_map)
         else:
             logger.info("Using API.Bible for verse texts")
-            api_bible = APIBibleService(Config.API_BIBLE_KEY, bible_id)
-            verse_texts = api_bible.get_verses_batch(verse_codes, bible_id)
+            await db.release()
+            verse_texts = await verse_text_batcher.get_verse_texts(verse_codes, bible_id)
 
         logger.info(f"Successfully retrieved {len(verse_texts)} verse texts")
         return {code: verse_texts.get(code, "") for code in verse_codes}
@@ -0,0 +1,150 @@
+"""Compare the ESV verse cache with the previous full-scan implementation.
+
+The previous cache pruned expired entries by walking every entry on each
+``get``/``set`` and parsed display references ("John 3:16") on every insert;
+``services.esv_api.VerseCache`` keeps a time-ordered expiry queue and keys by
+ESV verse id.  Both are filled to ``size`` entries and then driven with the
+same mix of hits, misses and inserts.  Half-book caps are lifted in both so
+the caches actually reach the target size.  No network or database access.
+Every legacy operation scans the whole cache, so filling it is quadratic:
+sizes much above 10,000 take minutes.
+
+    cd backend
+    python -m benchmarks.esv_cache
+    python -m benchmarks.esv_cache --sizes 1000 10000 --iterations 1
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from services.esv_api import VerseCache
+
+
+class LegacyVerseCache:
+    """The previous algorithm: string keys, full expiry scan on every access"""
+
+    def __init__(self, max_size: int, ttl: int = 60 * 60 * 24):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self.book_chapter_lru: Dict[str, OrderedDict] = {}
+        self.chapter_refs: Dict[Tuple[str, int], Set[str]] = {}
+
+    def _parse_book_chapter(self, reference: str) -> Tuple[str, int]:
+        book_part, rest = reference.rsplit(" ", 1)
+        return book_part, int(rest.split(":", 1)[0])
+
+    def _evict(self, reference: str) -> None:
+        _, _, book, chapter = self.cache.pop(reference)
+        refs = self.chapter_refs.get((book, chapter))
+        if refs:
+            refs.discard(reference)
+            if not refs:
+                self.chapter_refs.pop((book, chapter), None)
+                self.book_chapter_lru.get(book, {}).pop(chapter, None)
+
+    def _prune_expired(self) -> None:
+        now = time.time()
+        for ref in [r for r, (_, ts, _, _) in self.cache.items() if now - ts > self.ttl]:
+            self._evict(ref)
+
+    def get(self, reference: str) -> Optional[str]:
+        self._prune_expired()
+        entry = self.cache.get(reference)
+        if not entry:
+            return None
+        self.cache.move_to_end(reference)
+        lru = self.book_chapter_lru.setdefault(entry[2], OrderedDict())
+        if entry[3] in lru:
+            lru.move_to_end(entry[3])
+        return entry[0]
+
+    def set(self, reference: str, text: str) -> None:
+        self._prune_expired()
+        book, chapter = self._parse_book_chapter(reference)
+        if reference in self.cache:
+            self.cache.move_to_end(reference)
+            return
+        while len(self.cache) >= self.max_size:
+            self._evict(next(iter(self.cache)))
+        self.cache[reference] = (text, time.time(), book, chapter)
+        self.chapter_refs.setdefault((book, chapter), set()).add(reference)
+        lru = self.book_chapter_lru.setdefault(book, OrderedDict())
+        lru[chapter] = None
+        lru.move_to_end(chapter)
+
+
+def verse_ids(count: int) -> List[Tuple[int, str]]:
+    """``count`` distinct (ESV verse id, display reference) pairs"""
+    keys = []
+    for book in range(1, 67):
+        for chapter in range(1, 151):
+            for verse in range(1, 177):
+                keys.append((book * 1_000_000 + chapter * 1_000 + verse, f"Book {book} {chapter}:{verse}"))
+                if len(keys) == count:
+                    return keys
+    return keys
+
+
+def workload(size: int, ops: int, seed: int = 1) -> List[Tuple[str, int]]:
+    """Operations after the fill: 70% hits, 15% misses, 15% inserts of new verses"""
+    rng = random.Random(seed)
+    plan = []
+    for i in range(ops):
+        roll = rng.random()
+        if roll < 0.70:
+            plan.append(("get", rng.randrange(size)))
+        elif roll < 0.85:
+            plan.append(("get", size + ops + rng.randrange(ops)))
+        else:
+            plan.append(("set", size + i))
+    return plan
+
+
+def run(make: Callable, key: Callable, keys: List, size: int, plan: List) -> float:
+    """Fill a fresh cache to ``size``, then time ``plan``; µs per operation"""
+    cache = make(size)
+    for pair in keys[:size]:
+        cache.set(key(pair), "text")
+    start = time.perf_counter()
+    for op, index in plan:
+        if op == "get":
+            cache.get(key(keys[index]))
+        else:
+            cache.set(key(keys[index]), "text")
+    return (time.perf_counter() - start) / len(plan) * 1e6
+
+
+def new_cache(size: int) -> VerseCache:
+    cache = VerseCache(max_size=size)
+    cache.book_limits = {}
+    return cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5_000])
+    parser.add_argument("--ops", type=int, default=2_000)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    keys = verse_ids(max(args.sizes) + 3 * args.ops)
+    print(f"ESV verse cache - {args.ops} operations after filling, median of {args.iterations}")
+    print(f"{'entries':>8}{'legacy µs/op':>15}{'new µs/op':>12}{'speedup':>10}")
+    for size in args.sizes:
+        plan = workload(size, args.ops)
+        legacy = statistics.median(
+            run(LegacyVerseCache, lambda pair: pair[1], keys, size, plan) for _ in range(args.iterations)
+        )
+        new = statistics.median(
+            run(new_cache, lambda pair: pair[0], keys, size, plan) for _ in range(args.iterations)
+        )
+        print(f"{size:>8}{legacy:>15.2f}{new:>12.2f}{legacy / new:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Compare range grouping with the previous per-route implementation.
+
+The previous ``_group_into_ranges`` in ``api/routes/cross_references.py``
+formatted log strings for every pair of rows (even with DEBUG off), and the
+route then took max/sum/mean per group in separate passes.
+``verse_ranges.group_ranges`` groups column arrays and aggregates in one
+pass.  Both produce the same ranges and aggregates, sorted by highest
+confidence; building the response models is identical and not timed.  No
+network or database access.
+
+    cd backend
+    python -m benchmarks.range_grouping
+    python -m benchmarks.range_grouping --sizes 50 500 --iterations 500
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+from operator import attrgetter
+from typing import Callable, Dict, List
+
+from verse_ranges import columns, group_ranges
+
+logger = logging.getLogger("benchmarks.range_grouping.legacy")
+
+
+def legacy_group_into_ranges(verses: List[dict]) -> List[List[dict]]:
+    """The previous cross-reference grouping, logging included"""
+    if not verses:
+        return []
+
+    logger.info(f"Grouping {len(verses)} verses into ranges")
+    if len(verses) > 0:
+        first_verses = [f"{v['book_name']} {v['chapter']}:{v['verse_number']}" for v in verses[:5]]
+        logger.info(f"First few verses: {first_verses}")
+
+    grouped = []
+    current_group = [verses[0]]
+    for i in range(1, len(verses)):
+        prev = verses[i - 1]
+        curr = verses[i]
+        prev_ref = f"{prev['book_name']} {prev['chapter']}:{prev['verse_number']}"
+        curr_ref = f"{curr['book_name']} {curr['chapter']}:{curr['verse_number']}"
+        logger.debug(f"Comparing {prev_ref} with {curr_ref}")
+        same_book = prev["book_id"] == curr["book_id"]
+        same_direction = prev["direction"] == curr["direction"]
+        same_chapter = prev["chapter"] == curr["chapter"]
+        consecutive_in_chapter = same_chapter and curr["verse_number"] == prev["verse_number"] + 1
+        logger.debug(f"  same_book={same_book}, same_direction={same_direction}, same_chapter={same_chapter}, consecutive={consecutive_in_chapter}")
+        if same_book and same_direction and consecutive_in_chapter:
+            logger.debug(f"  -> Adding to current group")
+            current_group.append(curr)
+        else:
+            logger.debug(f"  -> Starting new group")
+            grouped.append(current_group)
+            current_group = [curr]
+    if current_group:
+        grouped.append(current_group)
+
+    logger.info(f"Created {len(grouped)} groups")
+    for i, group in enumerate(grouped[:5]):
+        if len(group) > 1:
+            range_ref = f"{group[0]['book_name']} {group[0]['chapter']}:{group[0]['verse_number']}-{group[-1]['verse_number']}"
+            logger.info(f"  Group {i}: {range_ref} ({len(group)} verses)")
+        else:
+            single_ref = f"{group[0]['book_name']} {group[0]['chapter']}:{group[0]['verse_number']}"
+            logger.info(f"  Group {i}: {single_ref} (single verse)")
+
+    grouped.sort(key=lambda g: max(v["cross_ref_confidence"] for v in g), reverse=True)
+    return grouped
+
+
+def legacy(rows: List[dict]) -> List[tuple]:
+    """Group, then aggregate each group in separate passes"""
+    result = []
+    for group in legacy_group_into_ranges(rows):
+        result.append((
+            group[0]["verse_id"],
+            group[-1]["verse_id"],
+            max(v["cross_ref_confidence"] for v in group),
+            sum(v["practice_count"] for v in group),
+            all(v["is_memorized"] for v in group),
+            sum(v["confidence_score"] for v in group) / len(group),
+        ))
+    return result
+
+
+def columnar(rows: List[dict]) -> List[tuple]:
+    """What ``api.routes.cross_references._group_rows`` does now"""
+    book_ids, chapters, verse_numbers, confidence, practice, user_confidence, directions = columns(
+        rows, "book_id", "chapter", "verse_number", "cross_ref_confidence",
+        "practice_count", "confidence_score", "direction",
+    )
+    ranges = group_ranges(book_ids, chapters, verse_numbers, confidence, practice, user_confidence, keys=directions)
+    ranges.sort(key=attrgetter("max_score"), reverse=True)
+    return [
+        (rows[r.start]["verse_id"], rows[r.end - 1]["verse_id"], r.max_score,
+         r.practice_total, r.all_memorized, r.confidence_mean)
+        for r in ranges
+    ]
+
+
+def cross_reference_rows(count: int, seed: int = 1) -> List[dict]:
+    """``count`` rows shaped like ``_neighbour_rows``: "from" then "to", canonical
+    order, with about a third of the verses continuing a run"""
+    rng = random.Random(seed)
+    rows = []
+    for direction in ("from", "to"):
+        book, chapter, verse = 1, 1, 1
+        for i in range(count // 2):
+            if rng.random() < 0.35:
+                verse += 1
+            else:
+                book += rng.random() < 0.1
+                chapter = chapter + 1 if rng.random() < 0.5 else chapter
+                verse += rng.randrange(2, 20)
+            practice = rng.choice((0, 0, 0, 2, 5))
+            rows.append({
+                "verse_id": book * 1_000_000 + chapter * 1_000 + verse,
+                "verse_code": f"{book}-{chapter}-{verse}",
+                "book_name": f"Book {book}",
+                "book_id": book,
+                "chapter": chapter,
+                "verse_number": verse,
+                "cross_ref_confidence": rng.random(),
+                "direction": direction,
+                "practice_count": practice,
+                "is_memorized": practice > 0,
+                "confidence_score": rng.random() if practice else 0.0,
+            })
+    return rows
+
+
+def timed(fn: Callable, rows: List[dict], iterations: int) -> float:
+    """µs per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(rows)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 1_000])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    # As in production: INFO enabled for the route loggers, DEBUG off.  The
+    # legacy INFO lines go to a null handler so only their formatting is paid
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    print(f"Range grouping - median of {args.repeats} runs of {args.iterations} calls")
+    print(f"{'rows':>8}{'ranges':>8}{'legacy µs':>12}{'new µs':>10}{'speedup':>10}")
+    for size in args.sizes:
+        rows = cross_reference_rows(size)
+        expected = legacy(rows)
+        assert columnar(rows) == expected, "grouping differs from the legacy implementation"
+        results: Dict[str, float] = {}
+        for name, fn in (("legacy", legacy), ("new", columnar)):
+            results[name] = statistics.median(timed(fn, rows, args.iterations) for _ in range(args.repeats))
+        print(f"{len(rows):>8}{len(expected):>8}{results['legacy']:>12.1f}{results['new']:>10.1f}"
+              f"{results['legacy'] / results['new']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
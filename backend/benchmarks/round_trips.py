@@ -0,0 +1,229 @@
+"""Count database round trips per request for the hot endpoints.
+
+Drives the same dependency chain the routes use (``core.dependencies``)
+against the database configured in ``.env`` and counts every statement,
+COMMIT and ROLLBACK sent over pooled connections.
+
+    cd backend
+    python -m benchmarks.round_trips                # current behaviour
+    python -m benchmarks.round_trips --legacy       # SET search_path on every checkout
+    python -m benchmarks.round_trips --deck-id 3 --user-id 1 --iterations 50
+
+Verse texts are not fetched from API.Bible; only database traffic is measured.
+The deck endpoint runs on the asyncio pool, which ``--legacy`` does not change.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager, contextmanager
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+import psycopg
+from psycopg.pq import TransactionStatus
+from psycopg2 import extensions
+
+from config import Config
+import db_pool
+from core import dependencies
+
+
+class RoundTripCounter:
+    """Shared counter bumped by every counted connection"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+
+COUNTER = RoundTripCounter()
+_cursor_classes: Dict[type, type] = {}
+
+
+def _counting_cursor(base: type) -> type:
+    """Subclass ``base`` so that execute/executemany are counted"""
+    if base not in _cursor_classes:
+        class CountingCursor(base):
+            def execute(self, query, vars=None):
+                COUNTER.count += 1
+                return super().execute(query, vars)
+
+            def executemany(self, query, vars_list):
+                vars_list = list(vars_list)
+                COUNTER.count += len(vars_list)
+                return super().executemany(query, vars_list)
+
+        _cursor_classes[base] = CountingCursor
+    return _cursor_classes[base]
+
+
+class CountingConnection(extensions.connection):
+    """psycopg2 connection that counts statements and transaction ends"""
+
+    def cursor(self, *args, **kwargs):
+        base = kwargs.pop("cursor_factory", None) or self.cursor_factory or extensions.cursor
+        kwargs["cursor_factory"] = _counting_cursor(base)
+        return super().cursor(*args, **kwargs)
+
+    def commit(self):
+        if self.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            COUNTER.count += 1
+        return super().commit()
+
+    def rollback(self):
+        if self.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            COUNTER.count += 1
+        return super().rollback()
+
+
+class CountingAsyncCursor(psycopg.AsyncCursor):
+    """psycopg 3 cursor that counts execute/executemany"""
+
+    async def execute(self, query, params=None, **kwargs):
+        COUNTER.count += 1
+        return await super().execute(query, params, **kwargs)
+
+    async def executemany(self, query, params_seq, **kwargs):
+        params_seq = list(params_seq)
+        COUNTER.count += len(params_seq)
+        return await super().executemany(query, params_seq, **kwargs)
+
+
+class CountingAsyncConnection(psycopg.AsyncConnection):
+    """psycopg 3 connection that counts statements and transaction ends"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = CountingAsyncCursor
+
+    async def commit(self):
+        if self.info.transaction_status != TransactionStatus.IDLE:
+            COUNTER.count += 1
+        return await super().commit()
+
+    async def rollback(self):
+        if self.info.transaction_status != TransactionStatus.IDLE:
+            COUNTER.count += 1
+        return await super().rollback()
+
+
+class LegacySearchPathPool:
+    """Wrap a pool to reproduce the old per-checkout ``SET search_path``"""
+
+    def __init__(self, pool: db_pool.ConnectionPool) -> None:
+        self._pool = pool
+
+    def getconn(self, *args, **kwargs):
+        conn = self._pool.getconn(*args, **kwargs)
+        # One extra statement per checkout, without leaving a transaction
+        # open (the unit of work switches autocommit off afterwards)
+        autocommit = conn.autocommit
+        conn.autocommit = True
+        conn.cursor().execute(f"SET search_path TO {Config.DATABASE_SCHEMA};")
+        conn.autocommit = autocommit
+        return conn
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+
+request_db = contextmanager(dependencies.get_db)
+async_request_db = asynccontextmanager(dependencies.get_async_db)
+LOOP = asyncio.new_event_loop()
+
+
+def _request() -> SimpleNamespace:
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+def get_verses(user_id: int) -> None:
+    """GET /api/verses"""
+    with request_db(_request()) as db:
+        service = dependencies.get_verse_service(dependencies.get_verse_repository(db))
+        service.get_user_verses(user_id, False)
+
+
+def get_deck(deck_id: int, user_id: int) -> None:
+    """GET /api/decks/{deck_id} (without the upstream verse-text fetch)"""
+    from services.api_bible import APIBibleService
+
+    APIBibleService.get_verses_batch = lambda self, codes, bible_id=None: {}
+
+    async def request() -> None:
+        async with async_request_db(_request()) as db:
+            service = dependencies.get_deck_service(dependencies.get_deck_repository(db))
+            await service.get_deck_with_cards(deck_id, user_id)
+
+    LOOP.run_until_complete(request())
+
+
+def measure(name: str, request: Callable[[], None], iterations: int) -> Dict:
+    counts: List[int] = []
+    timings: List[float] = []
+    request()  # warm up connections and caches
+    for _ in range(iterations):
+        before = COUNTER.count
+        start = time.perf_counter()
+        request()
+        timings.append((time.perf_counter() - start) * 1000)
+        counts.append(COUNTER.count - before)
+    return {
+        "endpoint": name,
+        "round_trips": statistics.mean(counts),
+        "p50_ms": statistics.median(timings),
+        "max_ms": max(timings),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legacy", action="store_true", help="emulate SET search_path on every checkout")
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--deck-id", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    pool = db_pool.ConnectionPool(
+        1,
+        4,
+        schema=Config.DATABASE_SCHEMA,
+        connection_factory=CountingConnection,
+        host=Config.DATABASE_HOST,
+        database=Config.DATABASE_NAME,
+        user=Config.DATABASE_USER,
+        password=Config.DATABASE_PASSWORD,
+        port=Config.DATABASE_PORT,
+    )
+    db_pool.db_pool = LegacySearchPathPool(pool) if args.legacy else pool
+    db_pool.async_db_pool = db_pool.create_async_pool(
+        1,
+        4,
+        schema=Config.DATABASE_SCHEMA,
+        connection_class=CountingAsyncConnection,
+        host=Config.DATABASE_HOST,
+        database=Config.DATABASE_NAME,
+        user=Config.DATABASE_USER,
+        password=Config.DATABASE_PASSWORD,
+        port=Config.DATABASE_PORT,
+    )
+    LOOP.run_until_complete(db_pool.async_db_pool.open())
+
+    try:
+        results = [
+            measure("GET /api/verses", lambda: get_verses(args.user_id), args.iterations),
+            measure(f"GET /api/decks/{args.deck_id}", lambda: get_deck(args.deck_id, args.user_id), args.iterations),
+        ]
+    finally:
+        LOOP.run_until_complete(db_pool.async_db_pool.close())
+        pool.closeall()
+
+    mode = "legacy (SET per checkout)" if args.legacy else "current"
+    print(f"Round trips per request - {mode}, {args.iterations} iterations")
+    print(f"{'endpoint':<28}{'round trips':>12}{'p50 ms':>10}{'max ms':>10}")
+    for r in results:
+        print(f"{r['endpoint']:<28}{r['round_trips']:>12.1f}{r['p50_ms']:>10.2f}{r['max_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Compare dict rows with named-tuple rows per 10k rows.
+
+Reads the same ``bible_verses`` rows through ``DatabaseConnection.fetch_all``
+(RealDictCursor plus a ``dict`` copy per row) and ``fetch_rows`` (named
+tuples), and optionally builds the ``VerseDetail`` models the API returns.
+Time is the median of ``--iterations`` runs; memory is the tracemalloc peak
+of one run, i.e. what the request holds while the rows are alive.
+
+    cd backend
+    python -m benchmarks.row_modes
+    python -m benchmarks.row_modes --rows 20000 --iterations 10
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from config import Config
+import db_pool
+from database import DatabaseConnection
+from domain.verses.schemas import VerseDetail
+
+QUERY = """
+    SELECT id, verse_code, book_id, chapter_number, verse_number, is_apocryphal
+    FROM bible_verses
+    ORDER BY id
+    LIMIT %s
+"""
+
+
+def dict_rows(db: DatabaseConnection, rows: int) -> List:
+    return db.fetch_all(QUERY, (rows,))
+
+
+def tuple_rows(db: DatabaseConnection, rows: int) -> List:
+    return db.fetch_rows(QUERY, (rows,))
+
+
+def dict_models(db: DatabaseConnection, rows: int) -> List:
+    return [
+        VerseDetail(
+            verse_id=r["verse_code"],
+            book_id=r["book_id"],
+            book_name="",
+            chapter_number=r["chapter_number"],
+            verse_number=r["verse_number"],
+            is_apocryphal=r["is_apocryphal"],
+        )
+        for r in db.fetch_all(QUERY, (rows,))
+    ]
+
+
+def tuple_models(db: DatabaseConnection, rows: int) -> List:
+    return [
+        VerseDetail.model_construct(
+            verse_id=r.verse_code,
+            book_id=r.book_id,
+            book_name="",
+            chapter_number=r.chapter_number,
+            verse_number=r.verse_number,
+            is_apocryphal=r.is_apocryphal,
+        )
+        for r in db.fetch_rows(QUERY, (rows,))
+    ]
+
+
+def measure(name: str, run: Callable[[], List], iterations: int) -> Dict:
+    run()  # warm up the connection and the named-tuple class cache
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = run()
+        timings.append((time.perf_counter() - start) * 1000)
+        del result
+
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(result)
+    del result
+
+    scale = 10_000 / count if count else 0
+    return {
+        "mode": name,
+        "rows": count,
+        "ms_per_10k": statistics.median(timings) * scale,
+        "kib_per_10k": peak / 1024 * scale,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    db_pool.db_pool = db_pool.ConnectionPool(
+        1,
+        2,
+        schema=Config.DATABASE_SCHEMA,
+        host=Config.DATABASE_HOST,
+        database=Config.DATABASE_NAME,
+        user=Config.DATABASE_USER,
+        password=Config.DATABASE_PASSWORD,
+        port=Config.DATABASE_PORT,
+    )
+    db = DatabaseConnection(db_pool.db_pool)
+
+    modes = [
+        ("dict rows (fetch_all)", dict_rows),
+        ("named tuples (fetch_rows)", tuple_rows),
+        ("dict rows + validated models", dict_models),
+        ("named tuples + model_construct", tuple_models),
+    ]
+    try:
+        results = [measure(name, lambda fn=fn: fn(db, args.rows), args.iterations) for name, fn in modes]
+    finally:
+        db_pool.db_pool.closeall()
+
+    print(f"Row modes - {results[0]['rows']} rows, {args.iterations} iterations")
+    print(f"{'mode':<34}{'ms / 10k':>10}{'KiB / 10k':>12}")
+    for r in results:
+        print(f"{r['mode']:<34}{r['ms_per_10k']:>10.2f}{r['kib_per_10k']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
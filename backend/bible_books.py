@@ -0,0 +1,216 @@
+# backend/bible_books.py
+"""Shared, read-only book metadata
+
+``bible_base_data.json`` is parsed once, at import, into a ``BookRegistry``
+keyed by the numeric ``book_id`` used in ``bible_books``/``bible_verses`` and
+verse codes (``"43-3-16"`` is John 3:16)::
+
+    from bible_books import books
+
+    books.name(43)                  # "John"
+    books.code(43)                  # "JHN" (API.Bible / USFM)
+    books[19].verse_count(119)      # 176
+    books.is_valid_verse(43, 3, 16)
+
+The JSON lists books in its own order; the database numbering (Protestant
+canon 1-66, then the deuterocanonical books 67-77) is fixed by
+``sql_setup/setup_database.py`` and mirrored in ``BOOK_IDS`` below.  Books the
+setup skips (``canonicalAffiliation: NONE``) are left out here as well.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Book name -> book_id, as populated by sql_setup/setup_database.py
+BOOK_IDS: Dict[str, int] = {
+    # Old Testament
+    "Genesis": 1, "Exodus": 2, "Leviticus": 3, "Numbers": 4, "Deuteronomy": 5,
+    "Joshua": 6, "Judges": 7, "Ruth": 8, "1 Samuel": 9, "2 Samuel": 10,
+    "1 Kings": 11, "2 Kings": 12, "1 Chronicles": 13, "2 Chronicles": 14,
+    "Ezra": 15, "Nehemiah": 16, "Esther": 17, "Job": 18, "Psalms": 19,
+    "Proverbs": 20, "Ecclesiastes": 21, "Song of Solomon": 22, "Isaiah": 23,
+    "Jeremiah": 24, "Lamentations": 25, "Ezekiel": 26, "Daniel": 27,
+    "Hosea": 28, "Joel": 29, "Amos": 30, "Obadiah": 31, "Jonah": 32,
+    "Micah": 33, "Nahum": 34, "Habakkuk": 35, "Zephaniah": 36,
+    "Haggai": 37, "Zechariah": 38, "Malachi": 39,
+    # New Testament
+    "Matthew": 40, "Mark": 41, "Luke": 42, "John": 43, "Acts": 44, "Romans": 45,
+    "1 Corinthians": 46, "2 Corinthians": 47, "Galatians": 48,
+    "Ephesians": 49, "Philippians": 50, "Colossians": 51,
+    "1 Thessalonians": 52, "2 Thessalonians": 53, "1 Timothy": 54,
+    "2 Timothy": 55, "Titus": 56, "Philemon": 57, "Hebrews": 58,
+    "James": 59, "1 Peter": 60, "2 Peter": 61, "1 John": 62,
+    "2 John": 63, "3 John": 64, "Jude": 65, "Revelation": 66,
+    # Apocryphal books
+    "Tobit": 67, "Judith": 68, "1 Maccabees": 69, "2 Maccabees": 70,
+    "Wisdom of Solomon": 71, "Sirach": 72, "Baruch": 73,
+    "1 Esdras": 74, "3 Maccabees": 75, "Prayer of Manasseh": 76,
+    "Psalm 151": 77,
+}
+
+# book_id -> API.Bible (USFM) book code
+BOOK_CODES: Dict[int, str] = {
+    1: "GEN", 2: "EXO", 3: "LEV", 4: "NUM", 5: "DEU",
+    6: "JOS", 7: "JDG", 8: "RUT", 9: "1SA", 10: "2SA",
+    11: "1KI", 12: "2KI", 13: "1CH", 14: "2CH", 15: "EZR",
+    16: "NEH", 17: "EST", 18: "JOB", 19: "PSA", 20: "PRO",
+    21: "ECC", 22: "SNG", 23: "ISA", 24: "JER", 25: "LAM",
+    26: "EZK", 27: "DAN", 28: "HOS", 29: "JOL", 30: "AMO",
+    31: "OBA", 32: "JON", 33: "MIC", 34: "NAM", 35: "HAB",
+    36: "ZEP", 37: "HAG", 38: "ZEC", 39: "MAL", 40: "MAT",
+    41: "MRK", 42: "LUK", 43: "JHN", 44: "ACT", 45: "ROM",
+    46: "1CO", 47: "2CO", 48: "GAL", 49: "EPH", 50: "PHP",
+    51: "COL", 52: "1TH", 53: "2TH", 54: "1TI", 55: "2TI",
+    56: "TIT", 57: "PHM", 58: "HEB", 59: "JAS", 60: "1PE",
+    61: "2PE", 62: "1JN", 63: "2JN", 64: "3JN", 65: "JUD",
+    66: "REV",
+    # Apocryphal books
+    67: "TOB", 68: "JDT", 69: "1MA", 70: "2MA", 71: "WIS",
+    72: "SIR", 73: "BAR", 74: "1ES", 75: "3MA", 76: "MAN",
+    77: "PS2",
+}
+
+_APOCRYPHAL_AFFILIATIONS = ("Catholic", "Eastern Orthodox")
+
+_DATA_PATHS = (
+    Path(__file__).resolve().parent / "bible_base_data.json",  # In Docker container
+    Path(__file__).resolve().parents[1] / "sql_setup" / "bible_base_data.json",  # Development
+)
+
+
+class Book(NamedTuple):
+    """Metadata for one book"""
+
+    book_id: int
+    name: str
+    code: str
+    testament: str
+    book_group: str
+    canonical_affiliation: str
+    is_apocryphal: bool
+    verse_counts: Tuple[int, ...]  # verses per chapter; chapter n is index n - 1
+
+    @property
+    def chapter_count(self) -> int:
+        return len(self.verse_counts)
+
+    @property
+    def total_verses(self) -> int:
+        return sum(self.verse_counts)
+
+    def verse_count(self, chapter: int) -> int:
+        """Verses in ``chapter`` (0 if the chapter does not exist)"""
+        return self.verse_counts[chapter - 1] if 0 < chapter <= len(self.verse_counts) else 0
+
+
+class BookRegistry:
+    """Immutable lookup of ``Book`` entries by id, name and code"""
+
+    def __init__(self, books: Iterable[Book], synonyms: Optional[Dict[str, str]] = None):
+        self._by_id: Dict[int, Book] = {book.book_id: book for book in sorted(books)}
+        by_name = {book.name: book for book in self._by_id.values()}
+        # Aliases first so that a full book name always wins over an alias
+        self._by_name: Dict[str, Book] = {
+            alias.lower(): by_name[name]
+            for alias, name in (synonyms or {}).items()
+            if name in by_name
+        }
+        self._by_name.update((name.lower(), book) for name, book in by_name.items())
+        self._by_code: Dict[str, Book] = {book.code: book for book in self._by_id.values()}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, book_id: int) -> bool:
+        return book_id in self._by_id
+
+    def __getitem__(self, book_id: int) -> Book:
+        return self._by_id[book_id]
+
+    def get(self, book_id: int) -> Optional[Book]:
+        return self._by_id.get(book_id)
+
+    def by_name(self, name: str) -> Optional[Book]:
+        """Look a book up by name or a known abbreviation, case-insensitively"""
+        return self._by_name.get(name.strip().lower())
+
+    def by_code(self, code: str) -> Optional[Book]:
+        return self._by_code.get(code.upper())
+
+    def name(self, book_id: int) -> str:
+        book = self._by_id.get(book_id)
+        return book.name if book else f"Book {book_id}"
+
+    def code(self, book_id: int) -> Optional[str]:
+        book = self._by_id.get(book_id)
+        return book.code if book else None
+
+    def is_valid_verse(self, book_id: int, chapter: int, verse: int) -> bool:
+        book = self._by_id.get(book_id)
+        return book is not None and 0 < verse <= book.verse_count(chapter)
+
+    def reference(self, book_id: int, chapter: int, verse: int) -> str:
+        """Human-readable reference, e.g. ``"John 3:16"``"""
+        return f"{self.name(book_id)} {chapter}:{verse}"
+
+    def references(self, verse_codes: Iterable[str]) -> Dict[str, str]:
+        """Map verse codes to references, skipping malformed or unknown codes"""
+        refs = {}
+        for code in verse_codes:
+            try:
+                book_id, chapter, verse = (int(part) for part in code.split("-"))
+            except ValueError:
+                continue
+            if self.is_valid_verse(book_id, chapter, verse):
+                refs[code] = self.reference(book_id, chapter, verse)
+        return refs
+
+
+def load_books(path: Optional[Path] = None) -> BookRegistry:
+    """Parse ``bible_base_data.json`` into a registry"""
+    if path is None:
+        path = next((p for p in _DATA_PATHS if p.exists()), None)
+        if path is None:
+            raise FileNotFoundError(f"bible_base_data.json not found in any of: {list(_DATA_PATHS)}")
+
+    with open(path) as f:
+        data = json.load(f)
+
+    entries = []
+    for entry in data.get("books", []):
+        book_id = BOOK_IDS.get(entry.get("name"))
+        if book_id is None:
+            continue
+        affiliation = entry.get("canonicalAffiliation", "All")
+        entries.append(Book(
+            book_id=book_id,
+            name=entry["name"],
+            code=BOOK_CODES[book_id],
+            testament=entry.get("testament", ""),
+            book_group=entry.get("bookGroup", ""),
+            canonical_affiliation=affiliation,
+            is_apocryphal=affiliation in _APOCRYPHAL_AFFILIATIONS,
+            verse_counts=tuple(entry.get("chapters", [])),
+        ))
+
+    # ``synonyms`` maps each alias to a 1-based position in the JSON ``books`` list
+    json_names = [entry.get("name") for entry in data.get("books", [])]
+    synonyms = {
+        alias: json_names[index - 1]
+        for alias, index in data.get("synonyms", {}).items()
+        if 0 < index <= len(json_names)
+    }
+
+    registry = BookRegistry(entries, synonyms)
+    logger.debug(f"Loaded metadata for {len(registry)} books from {path}")
+    return registry
+
+
+books = load_books()
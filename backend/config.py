@@ -27,6 +27,14 @@ class Config:
         raise ValueError("DATABASE_PASSWORD not found in environment. Add to .bashrc or .env file")
     
     DATABASE_PORT = int(os.getenv('DATABASE_PORT', '5432'))
+    DATABASE_SCHEMA = os.getenv('DATABASE_SCHEMA', 'wellversed01DEV')
+
+    # Connection pool
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '20'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds to wait for a free connection
+    DB_POOL_MAX_AGE = float(os.getenv('DB_POOL_MAX_AGE', '1800'))  # recycle connections after 30 minutes
+    DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '300'))  # close idle connections above the minimum
     
     # API
     API_HOST = os.getenv('API_HOST', '0.0.0.0')
@@ -56,6 +64,20 @@ class Config:
 
     DEFAULT_BIBLE_ID = os.getenv('DEFAULT_BIBLE_ID', 'de4e12af7f28f599-02')  # KJV
 
+    # Verse text cache
+    VERSE_TEXT_CACHE_SIZE = int(os.getenv('VERSE_TEXT_CACHE_SIZE', '50000'))  # verses held in memory per worker
+    VERSE_TEXT_CACHE_PERSIST = os.getenv('VERSE_TEXT_CACHE_PERSIST', 'true').lower() == 'true'  # verse_text_cache table
+    VERSE_TEXT_BATCH_WINDOW_MS = int(os.getenv('VERSE_TEXT_BATCH_WINDOW_MS', '10'))  # collect lookups this long per translation
+    VERSE_TEXT_BATCH_SIZE = int(os.getenv('VERSE_TEXT_BATCH_SIZE', '200'))  # verse codes per upstream batch
+    LOCAL_BIBLE_DIR = os.getenv('LOCAL_BIBLE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'bibles'))  # packed local translations
+
+    # Upstream Bible APIs (shared keep-alive HTTP client)
+    UPSTREAM_MAX_PER_HOST = int(os.getenv('UPSTREAM_MAX_PER_HOST', '8'))  # concurrent requests per API host
+    UPSTREAM_MAX_WORKERS = int(os.getenv('UPSTREAM_MAX_WORKERS', '16'))  # threads for parallel chapter fetches
+    UPSTREAM_CONNECT_TIMEOUT = float(os.getenv('UPSTREAM_CONNECT_TIMEOUT', '3.05'))  # seconds
+    UPSTREAM_READ_TIMEOUT = float(os.getenv('UPSTREAM_READ_TIMEOUT', '10'))  # seconds
+    UPSTREAM_HEALTH_INTERVAL = float(os.getenv('UPSTREAM_HEALTH_INTERVAL', '60'))  # seconds between API.Bible probes
+
     @classmethod
     def get_database_url(cls):
         return f"postgresql://{cls.DATABASE_USER}:{cls.DATABASE_PASSWORD}@{cls.DATABASE_HOST}:{cls.DATABASE_PORT}/{cls.DATABASE_NAME}"
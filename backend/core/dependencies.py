@@ -1,6 +1,8 @@
-from fastapi import Depends
-from database import DatabaseConnection
+from typing import AsyncIterator, Iterator
+from fastapi import Depends, Request
+from database import AsyncDatabaseConnection, DatabaseConnection
 import db_pool
+from domain.core import AsyncUnitOfWork, UnitOfWork
 from domain.users import UserRepository, UserService
 from domain.decks.repository import DeckRepository
 from domain.decks.service import DeckService
@@ -11,9 +13,25 @@ from domain.feature_requests import FeatureRequestService, FeatureRequestReposit
 from domain.courses import CourseRepository, CourseService
 
 
-def get_db() -> DatabaseConnection:
-    """Get database connection"""
-    return DatabaseConnection(db_pool.db_pool)
+def get_db(request: Request) -> Iterator[DatabaseConnection]:
+    """Get a request-scoped database connection
+
+    FastAPI caches this dependency per request, so every repository built for
+    the request shares one pinned connection and one transaction, committed
+    once when the request finishes (see ``core.routing.UnitOfWorkRoute``).
+    """
+    unit_of_work = UnitOfWork(db_pool.db_pool)
+    request.state.unit_of_work = unit_of_work
+    with unit_of_work.scope():
+        yield DatabaseConnection(db_pool.db_pool, unit_of_work=unit_of_work)
+
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncDatabaseConnection]:
+    """Request-scoped connection from the asyncio pool, for ``async def`` services"""
+    unit_of_work = AsyncUnitOfWork(db_pool.async_db_pool)
+    request.state.async_unit_of_work = unit_of_work
+    async with unit_of_work.scope():
+        yield AsyncDatabaseConnection(db_pool.async_db_pool, unit_of_work=unit_of_work)
 
 
 def get_user_repository(db: DatabaseConnection = Depends(get_db)) -> UserRepository:
@@ -26,7 +44,7 @@ def get_user_service(repo: UserRepository = Depends(get_user_repository)) -> Use
     return UserService(repo)
 
 
-def get_deck_repository(db: DatabaseConnection = Depends(get_db)) -> DeckRepository:
+def get_deck_repository(db: AsyncDatabaseConnection = Depends(get_async_db)) -> DeckRepository:
     return DeckRepository(db)
 
 
@@ -0,0 +1,43 @@
+import logging
+from typing import Callable, Coroutine, Any
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from domain.core import WritesDiscardedError
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Route that commits the request's unit of work before responding
+
+    FastAPI runs the teardown of ``yield`` dependencies after the response
+    has been sent, so a commit failing there would be invisible to the
+    client.  Committing here turns it into a normal 500 instead, as does a
+    unit of work whose writes were rolled back after a failed statement
+    (even if the handler caught that error).  The dependency teardown still
+    rolls back on errors and returns the connections to the pool.
+
+    ``get_db`` and ``get_async_db`` keep separate units of work
+    (``request.state.unit_of_work`` / ``async_unit_of_work``); both are
+    committed.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            try:
+                unit_of_work = getattr(request.state, "unit_of_work", None)
+                if unit_of_work is not None and unit_of_work.active:
+                    await run_in_threadpool(unit_of_work.commit)
+                async_unit_of_work = getattr(request.state, "async_unit_of_work", None)
+                if async_unit_of_work is not None and async_unit_of_work.active:
+                    await async_unit_of_work.commit()
+            except WritesDiscardedError as e:
+                logger.error(f"{request.method} {request.url.path}: {e}")
+                raise HTTPException(status_code=500, detail="The request's changes could not be saved")
+            return response
+
+        return route_handler
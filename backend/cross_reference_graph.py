@@ -0,0 +1,223 @@
+# backend/cross_reference_graph.py
+"""In-process cross-reference graph
+
+The OpenBible ``cross_references`` table (~340k edges) is static reference
+data, so it is read once at startup into compressed sparse row (CSR) arrays
+instead of being joined per request::
+
+    graph = cross_reference_graph.get_graph()
+    targets, votes, confidence = graph.outgoing(verse_id)   # verse_id -> others
+    sources, votes, confidence = graph.incoming(verse_id)   # others -> verse_id
+    hits = graph.explore([verse_id], depth=3)               # bounded k-hop BFS
+
+Edges are grouped by source verse id (forward) and by target verse id
+(reverse).  ``offsets[v]:offsets[v + 1]`` is the slice of verse ``v``'s
+edges in the parallel ``verses``/``votes``/``confidence`` columns, so a
+neighbour lookup is an array slice with no per-lookup containers.  The graph
+is immutable; ``reload_graph`` swaps in a new one after the table changes.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import db_pool
+from database import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+_generations = itertools.count(1)
+
+GRAPH_QUERY = """
+    SELECT from_verse_id, to_verse_id, votes, confidence_score
+    FROM cross_references
+    ORDER BY from_verse_id, to_verse_id
+"""
+
+
+class Adjacency(NamedTuple):
+    """One direction of the graph in CSR form"""
+
+    offsets: array      # 'i', max_verse_id + 2 entries
+    verses: array       # 'i', neighbour verse id per edge
+    votes: array        # 'i'
+    confidence: array   # 'd'
+
+    def edges(self, verse_id: int) -> Tuple[memoryview, memoryview, memoryview]:
+        """Neighbours, votes and confidence of ``verse_id`` (views, not copies)"""
+        if not 0 <= verse_id < len(self.offsets) - 1:
+            start = end = 0
+        else:
+            start, end = self.offsets[verse_id], self.offsets[verse_id + 1]
+        return (
+            memoryview(self.verses)[start:end],
+            memoryview(self.votes)[start:end],
+            memoryview(self.confidence)[start:end],
+        )
+
+    def degree(self, verse_id: int) -> int:
+        if not 0 <= verse_id < len(self.offsets) - 1:
+            return 0
+        return self.offsets[verse_id + 1] - self.offsets[verse_id]
+
+
+def _csr(keys: array, others: array, votes: array, confidence: array, size: int) -> Adjacency:
+    """Counting-sort edges by ``keys`` into CSR arrays of ``size`` verse slots"""
+    offsets = array("i", [0]) * (size + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+
+    count = len(keys)
+    out_verses = array("i", [0]) * count
+    out_votes = array("i", [0]) * count
+    out_confidence = array("d", [0.0]) * count
+    cursor = array("i", offsets[:-1])
+    for i in range(count):
+        key = keys[i]
+        slot = cursor[key]
+        cursor[key] = slot + 1
+        out_verses[slot] = others[i]
+        out_votes[slot] = votes[i]
+        out_confidence[slot] = confidence[i]
+    return Adjacency(offsets, out_verses, out_votes, out_confidence)
+
+
+class Hit(NamedTuple):
+    """A verse reached by ``CrossReferenceGraph.explore``"""
+
+    verse_id: int
+    hops: int            # BFS depth at which the verse was first reached
+    score: float         # aggregated confidence over every path that reached it
+    confidence: float    # highest single-edge confidence into the verse
+    direction: str       # 'to' or 'from' for the edge that first reached it
+
+
+class CrossReferenceGraph:
+    """Immutable forward and reverse CSR adjacency of cross-references"""
+
+    __slots__ = ("forward", "reverse", "edge_count", "generation")
+
+    def __init__(self, rows: Iterable[Tuple[int, int, int, float]]):
+        sources = array("i")
+        targets = array("i")
+        votes = array("i")
+        confidence = array("d")
+        for from_id, to_id, vote_count, score in rows:
+            sources.append(from_id)
+            targets.append(to_id)
+            votes.append(vote_count or 0)
+            confidence.append(float(score or 0.0))
+
+        size = max(max(sources, default=0), max(targets, default=0)) + 1
+        self.edge_count = len(sources)
+        self.forward = _csr(sources, targets, votes, confidence, size)
+        self.reverse = _csr(targets, sources, votes, confidence, size)
+        # Distinguishes a reloaded graph in caches without holding on to it
+        self.generation = next(_generations)
+
+    def __len__(self) -> int:
+        return self.edge_count
+
+    def outgoing(self, verse_id: int) -> Tuple[memoryview, memoryview, memoryview]:
+        """Verses ``verse_id`` refers to, with votes and confidence"""
+        return self.forward.edges(verse_id)
+
+    def incoming(self, verse_id: int) -> Tuple[memoryview, memoryview, memoryview]:
+        """Verses referring to ``verse_id``, with votes and confidence"""
+        return self.reverse.edges(verse_id)
+
+    def strongest_edges(self, verse_id: int, limit: int, min_votes: int = 0,
+                        direction: str = "both") -> List[Tuple[float, int, str]]:
+        """Up to ``limit`` strongest ``(confidence, neighbour, direction)`` edges"""
+        edges = []
+        if direction in ("both", "to"):
+            targets, votes, confidence = self.forward.edges(verse_id)
+            edges += [(c, v, "to") for v, n, c in zip(targets, votes, confidence) if n >= min_votes]
+        if direction in ("both", "from"):
+            sources, votes, confidence = self.reverse.edges(verse_id)
+            edges += [(c, v, "from") for v, n, c in zip(sources, votes, confidence) if n >= min_votes]
+        if len(edges) <= limit:
+            return edges
+        return heapq.nlargest(limit, edges)
+
+    def explore(self, seeds: Sequence[int], depth: int = 2, max_fanout: int = 10,
+                max_nodes: int = 100, min_votes: int = 0, direction: str = "both") -> List[Hit]:
+        """Bounded breadth-first walk from ``seeds``, strongest verses first.
+
+        Each level follows at most ``max_fanout`` edges (highest confidence
+        first, ignoring edges below ``min_votes``) from every frontier verse.
+        A verse is scored only at the level that first reaches it: the sum,
+        over the edges from the previous level's verses, of the source's score
+        times the edge confidence (seeds score 1), so verses reached by many
+        strong shortest paths rank first.  Edges back to seeds or to verses
+        from earlier levels add nothing.  At most ``max_nodes`` verses are
+        returned; seeds are not.
+        """
+        score: Dict[int, float] = {seed: 1.0 for seed in seeds}
+        hits: Dict[int, List] = {}  # verse -> [hops, best confidence, direction]
+        frontier = list(score)
+        for level in range(1, depth + 1):
+            reached = []
+            # Scores of the previous level, fixed before this level adds any
+            source_scores = [score[verse_id] for verse_id in frontier]
+            for verse_id, source_score in zip(frontier, source_scores):
+                for confidence, neighbour, edge_direction in self.strongest_edges(
+                    verse_id, max_fanout, min_votes, direction
+                ):
+                    hit = hits.get(neighbour)
+                    if hit is None:
+                        if neighbour in score or len(hits) >= max_nodes:
+                            continue  # a seed, or the node budget is spent
+                        hits[neighbour] = [level, confidence, edge_direction]
+                        score[neighbour] = 0.0
+                        reached.append(neighbour)
+                    elif hit[0] != level:
+                        continue  # reached at an earlier level
+                    elif confidence > hit[1]:
+                        hit[1] = confidence
+                    score[neighbour] += source_score * confidence
+            if not reached:
+                break
+            # Expand the strongest verses first so the budget goes to them
+            frontier = sorted(reached, key=score.__getitem__, reverse=True)
+
+        ranked = [
+            Hit(verse_id, hops, score[verse_id], confidence, edge_direction)
+            for verse_id, (hops, confidence, edge_direction) in hits.items()
+        ]
+        ranked.sort(key=lambda hit: hit.score, reverse=True)
+        return ranked
+
+
+_graph: Optional[CrossReferenceGraph] = None
+_lock = threading.Lock()
+
+
+def load_graph(db: DatabaseConnection) -> CrossReferenceGraph:
+    """Read ``cross_references`` into a new graph"""
+    graph = CrossReferenceGraph(db.stream(GRAPH_QUERY, batch_size=50_000, named_tuples=True))
+    logger.info(f"Cross-reference graph loaded: {len(graph)} edges")
+    return graph
+
+
+def reload_graph(db: Optional[DatabaseConnection] = None) -> CrossReferenceGraph:
+    """(Re)load the process-wide graph from the database"""
+    global _graph
+    graph = load_graph(db or DatabaseConnection(db_pool.db_pool))
+    _graph = graph
+    return graph
+
+
+def get_graph() -> CrossReferenceGraph:
+    """The process-wide graph, loaded on first use if startup did not"""
+    global _graph
+    if _graph is None:
+        with _lock:
+            if _graph is None:
+                _graph = load_graph(DatabaseConnection(db_pool.db_pool))
+    return _graph
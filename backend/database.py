@@ -1,15 +1,119 @@
 # backend/database.py
+import io
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import NamedTupleCursor, RealDictCursor
+from psycopg.rows import dict_row, namedtuple_row
 import logging
-from contextlib import contextmanager
-from typing import Dict, List, Any, Optional, Set
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Union, TYPE_CHECKING
+import uuid
+import prepared_statements
+from prepared_statements import PreparedStatement
+
+if TYPE_CHECKING:
+    from domain.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
 
 logger = logging.getLogger(__name__)
 
+# SQL text, or a statement registered with ``prepared_statements.prepared``
+Query = Union[str, PreparedStatement]
+
+
+def _copy_statements(table: str, columns: Sequence[str], conflict: Sequence[str],
+                     update: Optional[str]) -> tuple:
+    """SQL for ``copy_upsert``: (create staging, COPY into it, merge into ``table``)
+
+    Table and column names are interpolated as-is and must come from code,
+    never from user input.  Rows sharing a conflict key are collapsed to one
+    (arbitrary) row, since ``ON CONFLICT DO UPDATE`` cannot touch a row twice.
+    """
+    staging = f"_copy_{table}"
+    cols = ", ".join(columns)
+    if update is None:
+        update = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict)
+    action = f"DO UPDATE SET {update}" if update else "DO NOTHING"
+    create = (
+        f"DROP TABLE IF EXISTS {staging}; "
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {cols} FROM {table} WITH NO DATA"
+    )
+    copy = f"COPY {staging} ({cols}) FROM STDIN"
+    merge = (
+        f"INSERT INTO {table} ({cols}) "
+        f"SELECT DISTINCT ON ({', '.join(conflict)}) {cols} FROM {staging} "
+        f"ON CONFLICT ({', '.join(conflict)}) {action}"
+    )
+    return create, copy, merge
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value in COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _CopyBuffer(io.TextIOBase):
+    """File-like view of ``rows`` in COPY text format, encoded as it is read"""
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._rows = iter(rows)
+        self._pending = ""
+        self.rows = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self.rows += 1
+            self._pending += "\t".join(_copy_field(v) for v in row) + "\n"
+        if size < 0:
+            size = len(self._pending)
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+class _UnitOfWorkConnection:
+    """Pinned connection handed out inside a unit of work.
+
+    ``commit()`` only marks the unit dirty so that repositories committing
+    after each statement still end up in one transaction, committed once by
+    the unit of work.  ``rollback()`` goes through ``mark_failed`` so that
+    rolling back earlier writes fails the request instead of losing them.
+    """
+
+    def __init__(self, conn, unit_of_work: "UnitOfWork"):
+        self._conn = conn
+        self._unit_of_work = unit_of_work
+
+    def commit(self) -> None:
+        self._unit_of_work.mark_dirty()
+
+    def rollback(self) -> None:
+        self._unit_of_work.mark_failed(RuntimeError("transaction rolled back by the caller"))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
 class DatabaseConnection:
-    def __init__(self, pool):
+    # Rows fetched per round trip by ``stream()``
+    stream_batch_size = 2000
+
+    def __init__(self, pool, unit_of_work: Optional["UnitOfWork"] = None):
         self.pool = pool
+        self.unit_of_work = unit_of_work
         self.query_count = 0
         self.query_log: List[str] = []  # Track actual queries for debugging
         self._enable_query_logging = False
@@ -26,12 +130,25 @@ class DatabaseConnection:
 
     @contextmanager
     def get_db(self):
-        """Get database connection from pool"""
+        """Get database connection from pool.
+
+        The pool sets ``search_path`` once when it opens each physical
+        connection, so a checkout costs no extra round trip.  Inside a unit of
+        work the pinned request connection is reused instead.
+        """
+        if self.unit_of_work is not None and self.unit_of_work.active:
+            try:
+                yield _UnitOfWorkConnection(self.unit_of_work.connection(), self.unit_of_work)
+            except Exception as e:
+                self.unit_of_work.mark_failed(e)
+                logger.error(f"Database error: {e}")
+                raise
+            return
+
         conn = None
         try:
             logger.debug("Acquiring DB connection from pool")
             conn = self.pool.getconn()
-            conn.cursor().execute("SET search_path TO wellversed01DEV;")
             yield conn
         except Exception as e:
             if conn:
@@ -43,43 +160,94 @@ class DatabaseConnection:
                 self.pool.putconn(conn)
                 logger.debug("Connection returned to pool")
 
+    def release(self) -> None:
+        """Return a pinned unit-of-work connection to the pool early (no-op otherwise)"""
+        if self.unit_of_work is not None and self.unit_of_work.active:
+            self.unit_of_work.release()
+
     def _log_query(self, query: str, params: tuple):
         """Log query for debugging if enabled"""
         if self._enable_query_logging:
             query_preview = query[:200] + '...' if len(query) > 200 else query
             self.query_log.append(f"{query_preview} -- params: {params}")
+
+    def _run(self, cur, query: Query, params: tuple) -> None:
+        """Execute plain SQL or a named prepared statement"""
+        self.query_count += 1
+        if isinstance(query, PreparedStatement):
+            logger.debug(f"Executing prepared statement: {query.name}")
+            prepared_statements.registry.execute(cur, query, params)
+        else:
+            logger.debug(f"Executing query: {query[:100]}...")
+            cur.execute(query, params)
     
-    def fetch_one(self, query: str, params: tuple = (), *, commit: bool = False) -> Optional[Dict]:
+    def fetch_one(self, query: Query, params: tuple = (), *, commit: bool = False) -> Optional[Dict]:
         """Execute query and fetch one result. Optionally commit after execution."""
         with self.get_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                logger.debug(f"Executing query: {query[:100]}...")
-                self.query_count += 1
-                cur.execute(query, params)
+                self._run(cur, query, params)
                 result = cur.fetchone()
                 if commit:
                     conn.commit()
                 logger.debug(f"Query returned {'1 row' if result else '0 rows'}")
                 return dict(result) if result else None
     
-    def fetch_all(self, query: str, params: tuple = ()) -> List[Dict]:
+    def fetch_all(self, query: Query, params: tuple = ()) -> List[Dict]:
         """Execute query and fetch all results"""
         with self.get_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                logger.debug(f"Executing query: {query[:100]}...")
-                self.query_count += 1
-                cur.execute(query, params)
+                self._run(cur, query, params)
                 results = cur.fetchall()
                 logger.debug(f"Query returned {len(results)} rows")
                 return [dict(row) for row in results]
+
+    def fetch_rows(self, query: Query, params: tuple = ()) -> List[tuple]:
+        """Execute query and fetch all results as named tuples.
+
+        Cheaper than ``fetch_all`` for large results: one tuple per row and no
+        ``dict`` copy, with the column names resolved once per result shape.
+        Columns are read as attributes (``row.verse_code``).
+        """
+        with self.get_db() as conn:
+            with conn.cursor(cursor_factory=NamedTupleCursor) as cur:
+                self._run(cur, query, params)
+                results = cur.fetchall()
+                logger.debug(f"Query returned {len(results)} rows")
+                return results
     
-    def execute(self, query: str, params: tuple = ()) -> None:
+    def stream(self, query: Query, params: tuple = (), *, batch_size: Optional[int] = None,
+               named_tuples: bool = False) -> Iterator[Any]:
+        """Yield rows lazily through a named server-side cursor.
+
+        Only ``batch_size`` rows (default ``stream_batch_size``) are held in
+        memory at a time.  The stream checks out its own pooled connection on
+        the first ``next()`` and returns it when the iterator is exhausted or
+        closed, so it can back a ``StreamingResponse`` whose body is produced
+        after the request's unit of work has finished.  Rows are dicts, or
+        named tuples as in ``fetch_rows`` with ``named_tuples=True``.
+        """
+        text = query.text if isinstance(query, PreparedStatement) else query
+        conn = self.pool.getconn()
+        try:
+            factory = NamedTupleCursor if named_tuples else RealDictCursor
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=factory) as cur:
+                cur.itersize = batch_size or self.stream_batch_size
+                logger.debug(f"Streaming query: {text[:100]}...")
+                self.query_count += 1
+                cur.execute(text, params)
+                yield from cur
+        except Exception as e:
+            logger.error(f"Database error while streaming: {e}")
+            raise
+        finally:
+            # putconn rolls back the read-only transaction the cursor lived in
+            self.pool.putconn(conn)
+
+    def execute(self, query: Query, params: tuple = ()) -> None:
         """Execute query without returning results"""
         with self.get_db() as conn:
             with conn.cursor() as cur:
-                logger.debug(f"Executing query: {query[:100]}...")
-                self.query_count += 1
-                cur.execute(query, params)
+                self._run(cur, query, params)
                 conn.commit()
                 logger.debug(f"Affected rows: {cur.rowcount}")
     
@@ -98,6 +266,31 @@ class DatabaseConnection:
                 conn.commit()
                 logger.debug(f"Total affected rows: {cur.rowcount}")
 
+    def copy_upsert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]], *,
+                    conflict: Sequence[str], update: Optional[str] = None) -> int:
+        """Bulk upsert ``rows`` into ``table`` through ``COPY ... FROM STDIN``.
+
+        Rows are streamed into a temporary staging table and merged with a
+        single ``INSERT ... SELECT ... ON CONFLICT (conflict)``, so the cost is
+        three round trips however many rows there are.  ``update`` is the
+        ``DO UPDATE SET`` clause (it may reference ``EXCLUDED`` and ``table``);
+        by default every non-conflict column is overwritten, and ``""`` means
+        ``DO NOTHING``.  Returns the number of rows inserted or updated.
+        """
+        create, copy, merge = _copy_statements(table, columns, conflict, update)
+        buffer = _CopyBuffer(rows)
+        with self.get_db() as conn:
+            with conn.cursor() as cur:
+                logger.debug(f"Copying rows into {table}")
+                self.query_count += 3
+                self._log_query(merge, ('copy rows',))
+                cur.execute(create)
+                cur.copy_expert(copy, buffer)
+                cur.execute(merge)
+                conn.commit()
+                logger.debug(f"Copied {buffer.rows} rows, merged {cur.rowcount} into {table}")
+                return cur.rowcount
+
     def execute_values(self, query: str, values: List[tuple]) -> List[Dict]:
         """Execute a query with multiple value sets using execute_values"""
         from psycopg2.extras import execute_values
@@ -111,3 +304,159 @@ class DatabaseConnection:
                 conn.commit()
                 logger.debug(f"Query returned {len(results) if results else 0} rows")
                 return [dict(row) for row in (results or [])]
+
+
+class AsyncDatabaseConnection:
+    """asyncio version of ``DatabaseConnection`` backed by psycopg 3.
+
+    Same query helpers (awaitable) and the same ``query_count``/query log
+    accounting, so ``track_queries`` works on async repositories too.  Queries
+    use the same ``%s`` placeholders and rows come back as dicts.
+    """
+
+    def __init__(self, pool, unit_of_work: Optional["AsyncUnitOfWork"] = None):
+        self.pool = pool
+        self.unit_of_work = unit_of_work
+        self.query_count = 0
+        self.query_log: List[str] = []
+        self._enable_query_logging = False
+
+    def enable_query_logging(self, enable: bool = True):
+        """Enable or disable query logging for debugging"""
+        self._enable_query_logging = enable
+        if enable:
+            self.query_log = []
+
+    def get_query_log(self) -> List[str]:
+        """Get the log of executed queries"""
+        return self.query_log.copy()
+
+    @property
+    def _scoped(self) -> bool:
+        return self.unit_of_work is not None and self.unit_of_work.active
+
+    @asynccontextmanager
+    async def get_db(self):
+        """Get a connection from the async pool (or the unit of work's pinned one)"""
+        if self._scoped:
+            try:
+                yield await self.unit_of_work.connection()
+            except Exception as e:
+                await self.unit_of_work.mark_failed(e)
+                logger.error(f"Database error: {e}")
+                raise
+            return
+
+        try:
+            # The pool commits on a clean exit and rolls back on errors
+            async with self.pool.connection() as conn:
+                yield conn
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            raise
+
+    async def _commit(self, conn) -> None:
+        if self._scoped:
+            self.unit_of_work.mark_dirty()
+        else:
+            await conn.commit()
+
+    async def release(self) -> None:
+        """Return a pinned unit-of-work connection to the pool early (no-op otherwise)"""
+        if self._scoped:
+            await self.unit_of_work.release()
+
+    def _log_query(self, query: str, params: tuple):
+        """Log query for debugging if enabled"""
+        if self._enable_query_logging:
+            query_preview = query[:200] + '...' if len(query) > 200 else query
+            self.query_log.append(f"{query_preview} -- params: {params}")
+
+    async def _run(self, cur, query: Query, params: tuple) -> None:
+        """Execute plain SQL or a named prepared statement"""
+        self.query_count += 1
+        if isinstance(query, PreparedStatement):
+            logger.debug(f"Executing prepared statement: {query.name}")
+            await prepared_statements.registry.execute_async(cur, query, params)
+        else:
+            logger.debug(f"Executing query: {query[:100]}...")
+            await cur.execute(query, params or None)
+
+    async def fetch_one(self, query: Query, params: tuple = (), *, commit: bool = False) -> Optional[Dict]:
+        """Execute query and fetch one result. Optionally commit after execution."""
+        async with self.get_db() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await self._run(cur, query, params)
+                result = await cur.fetchone()
+                if commit:
+                    await self._commit(conn)
+                logger.debug(f"Query returned {'1 row' if result else '0 rows'}")
+                return result
+
+    async def fetch_all(self, query: Query, params: tuple = ()) -> List[Dict]:
+        """Execute query and fetch all results"""
+        async with self.get_db() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await self._run(cur, query, params)
+                results = await cur.fetchall()
+                logger.debug(f"Query returned {len(results)} rows")
+                return results
+
+    async def fetch_rows(self, query: Query, params: tuple = ()) -> List[tuple]:
+        """Execute query and fetch all results as named tuples (see ``DatabaseConnection.fetch_rows``)"""
+        async with self.get_db() as conn:
+            async with conn.cursor(row_factory=namedtuple_row) as cur:
+                await self._run(cur, query, params)
+                results = await cur.fetchall()
+                logger.debug(f"Query returned {len(results)} rows")
+                return results
+
+    async def execute(self, query: Query, params: tuple = ()) -> None:
+        """Execute query without returning results"""
+        async with self.get_db() as conn:
+            async with conn.cursor() as cur:
+                await self._run(cur, query, params)
+                await self._commit(conn)
+                logger.debug(f"Affected rows: {cur.rowcount}")
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        """Execute query multiple times with different parameters (pipelined)"""
+        async with self.get_db() as conn:
+            async with conn.cursor() as cur:
+                logger.debug(f"Executing batch query: {query[:100]}...")
+                self.query_count += len(params_list)
+                if self._enable_query_logging:
+                    for params in params_list[:3]:
+                        self._log_query(query, params)
+                    if len(params_list) > 3:
+                        self.query_log.append(f"... and {len(params_list) - 3} more")
+                await cur.executemany(query, params_list)
+                await self._commit(conn)
+                logger.debug(f"Total affected rows: {cur.rowcount}")
+
+    async def execute_values(self, query: str, values: List[tuple], page_size: int = 100) -> List[Dict]:
+        """Execute a ``VALUES %s`` query with multiple value sets
+
+        Mirrors ``psycopg2.extras.execute_values(..., fetch=True)``: the single
+        ``%s`` is expanded into one row placeholder per value set, ``page_size``
+        rows per statement.
+        """
+        results: List[Dict] = []
+        if not values:
+            return results
+        head, tail = query.split("%s", 1)
+        async with self.get_db() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                logger.debug(f"Executing values query: {query[:100]}...")
+                self._log_query(query, ('batch values',))
+                for start in range(0, len(values), page_size):
+                    page = values[start:start + page_size]
+                    row = "(" + ", ".join(["%s"] * len(page[0])) + ")"
+                    params = [param for value in page for param in value]
+                    self.query_count += 1
+                    await cur.execute(head + ", ".join([row] * len(page)) + tail, params)
+                    if cur.description:
+                        results.extend(await cur.fetchall())
+                await self._commit(conn)
+                logger.debug(f"Query returned {len(results)} rows")
+                return results
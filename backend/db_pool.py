@@ -1,4 +1,355 @@
 # backend/db_pool.py
 """Global database connection pool"""
 
-db_pool = None
\ No newline at end of file
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+def _with_search_path(connect_kwargs: Dict[str, Any], schema: Optional[str]) -> Dict[str, Any]:
+    """Add ``schema`` to the libpq startup ``options`` as the search path"""
+    if schema:
+        options = connect_kwargs.get("options", "")
+        connect_kwargs["options"] = f"{options} -c search_path={schema}".strip()
+    return connect_kwargs
+
+
+class PoolTimeout(PoolError):
+    """Raised when no connection became available within the checkout timeout"""
+
+
+class _ConnectionInfo:
+    """Bookkeeping for a single physical connection"""
+
+    __slots__ = ("created_at", "last_used")
+
+    def __init__(self) -> None:
+        now = time.monotonic()
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Thread-safe psycopg2 connection pool.
+
+    Drop-in replacement for ``psycopg2.pool.SimpleConnectionPool`` (``getconn``,
+    ``putconn`` and ``closeall``) that is safe to share between FastAPI's
+    threadpool workers.  Callers block for up to ``timeout`` seconds when every
+    connection is checked out, idle connections are pinged before reuse,
+    connections older than ``max_age`` are recycled, and idle connections above
+    ``minconn`` are closed after ``max_idle`` seconds.
+
+    When ``schema`` is given it is sent as the ``search_path`` startup option,
+    so every physical connection starts in the right schema without an extra
+    ``SET`` round trip.  The liveness ping doubles as a check that the
+    search path has not drifted (e.g. after a ``RESET ALL``).
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        *,
+        timeout: float = 30.0,
+        max_age: float = 1800.0,
+        max_idle: float = 300.0,
+        ping_after: float = 30.0,
+        schema: Optional[str] = None,
+        **connect_kwargs: Any,
+    ) -> None:
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Invalid pool bounds: minconn={minconn}, maxconn={maxconn}")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self.schema = schema
+        self.closed = False
+
+        self._connect_kwargs = _with_search_path(connect_kwargs, schema)
+        self._lock = threading.Condition(threading.Lock())
+        self._idle: Deque[Any] = deque()
+        self._info: Dict[int, _ConnectionInfo] = {}
+        self._in_use: Dict[int, float] = {}
+        self._size = 0
+        self._waiting = 0
+
+        # Telemetry
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._discarded = 0
+        self._peak_in_use = 0
+
+        for _ in range(minconn):
+            conn = self._connect()
+            with self._lock:
+                self._size += 1
+                self._idle.append(conn)
+
+    # ------------------------------------------------------------------
+    # Public API (psycopg2.pool compatible)
+    # ------------------------------------------------------------------
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Check a connection out, waiting up to ``timeout`` seconds for one"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            conn = None
+            create = False
+            with self._lock:
+                if self.closed:
+                    raise PoolError("connection pool is closed")
+                self._waiting += 1
+                try:
+                    while not self._idle and self._size >= self.maxconn:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeout(
+                                f"no connection available after {timeout:.1f}s "
+                                f"({self._size} open, {len(self._in_use)} in use)"
+                            )
+                        self._lock.wait(remaining)
+                        if self.closed:
+                            raise PoolError("connection pool is closed")
+                finally:
+                    self._waiting -= 1
+
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    # Reserve the slot now, connect outside the lock
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+            elif self._expired(self._info.get(id(conn))):
+                self._discard(conn, recycled=True)
+                continue
+            elif not self._is_alive(conn):
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - start
+            with self._lock:
+                self._in_use[id(conn)] = time.monotonic()
+                self._checkouts += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+                self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+            if waited > 1.0:
+                logger.warning(f"Waited {waited:.3f}s for a database connection")
+            return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        """Return a connection to the pool"""
+        with self._lock:
+            if self._in_use.pop(id(conn), None) is None:
+                raise PoolError("trying to put unkeyed connection")
+
+        info = self._info.get(id(conn))
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                # Leave no half-finished transaction behind for the next caller
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+
+        expired = self._expired(info)
+        if close or conn.closed or self.closed or expired:
+            self._discard(conn, recycled=expired)
+            return
+
+        if info:
+            info.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(conn)
+            self._lock.notify()
+        self._shrink()
+
+    def closeall(self) -> None:
+        """Close every pooled connection"""
+        with self._lock:
+            self.closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._lock.notify_all()
+        for conn in idle:
+            self._discard(conn)
+        logger.info("Connection pool closed")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool size and checkout telemetry"""
+        with self._lock:
+            now = time.monotonic()
+            checkouts = self._checkouts
+            longest_held = max((now - t for t in self._in_use.values()), default=0.0)
+            return {
+                "min_size": self.minconn,
+                "max_size": self.maxconn,
+                "size": self._size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": checkouts,
+                "avg_wait_ms": round(self._total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "timeouts": self._timeouts,
+                "longest_held_ms": round(longest_held * 1000, 3),
+                "connections_created": self._created,
+                "connections_recycled": self._recycled,
+                "connections_discarded": self._discarded,
+            }
+
+    def reset_stats(self) -> None:
+        """Reset checkout telemetry counters"""
+        with self._lock:
+            self._checkouts = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+            self._timeouts = 0
+            self._peak_in_use = len(self._in_use)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _connect(self):
+        conn = psycopg2.connect(**self._connect_kwargs)
+        self._info[id(conn)] = _ConnectionInfo()
+        with self._lock:
+            self._created += 1
+        logger.debug("Opened new database connection")
+        return conn
+
+    def _expired(self, info: Optional[_ConnectionInfo]) -> bool:
+        return info is not None and time.monotonic() - info.created_at > self.max_age
+
+    def _is_alive(self, conn) -> bool:
+        """Ping an idle connection that has not been used for a while"""
+        if conn.closed:
+            return False
+        info = self._info.get(id(conn))
+        if info and time.monotonic() - info.last_used > self.ping_after:
+            try:
+                if not self.verify_search_path(conn):
+                    logger.warning("search_path drifted on pooled connection, resetting it")
+                    with conn.cursor() as cur:
+                        cur.execute(f"SET search_path TO {self.schema}")
+                conn.rollback()
+            except psycopg2.Error as e:
+                logger.warning(f"Discarding dead pooled connection: {e}")
+                return False
+        return True
+
+    def verify_search_path(self, conn) -> bool:
+        """Return True if ``conn`` is still using the pool's schema.
+
+        Runs a single ``SELECT current_schema()``; without a configured schema
+        this is a plain liveness check.
+        """
+        with conn.cursor() as cur:
+            cur.execute("SELECT current_schema()")
+            row = cur.fetchone()
+        if not self.schema:
+            return True
+        current = row[0] if row else None
+        expected = self.schema[1:-1] if self.schema.startswith('"') else self.schema.lower()
+        return current == expected
+
+    def _discard(self, conn, recycled: bool = False) -> None:
+        self._info.pop(id(conn), None)
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing connection: {e}")
+        with self._lock:
+            self._size -= 1
+            if recycled:
+                self._recycled += 1
+            else:
+                self._discarded += 1
+            self._lock.notify()
+
+    def _shrink(self) -> None:
+        """Close connections idle longer than ``max_idle`` down to ``minconn``"""
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            # Oldest idle connections sit at the left of the deque
+            while self._size - len(stale) > self.minconn and self._idle:
+                info = self._info.get(id(self._idle[0]))
+                if info is None or now - info.last_used <= self.max_idle:
+                    break
+                stale.append(self._idle.popleft())
+        for conn in stale:
+            self._discard(conn)
+
+
+def create_async_pool(
+    minconn: int,
+    maxconn: int,
+    *,
+    timeout: float = 30.0,
+    max_age: float = 1800.0,
+    max_idle: float = 300.0,
+    schema: Optional[str] = None,
+    connection_class: Optional[type] = None,
+    **connect_kwargs: Any,
+) -> AsyncConnectionPool:
+    """Build the asyncio (psycopg 3) pool used by ``async def`` endpoints.
+
+    Takes the same bounds and schema handling as ``ConnectionPool``.  The pool
+    is returned closed; ``await pool.open()`` it from the running event loop.
+    """
+    if "database" in connect_kwargs:
+        connect_kwargs["dbname"] = connect_kwargs.pop("database")
+    return AsyncConnectionPool(
+        "",
+        connection_class=connection_class or AsyncConnection,
+        kwargs=_with_search_path(connect_kwargs, schema),
+        min_size=minconn,
+        max_size=maxconn,
+        timeout=timeout,
+        max_lifetime=max_age,
+        max_idle=max_idle,
+        name="async",
+        open=False,
+    )
+
+
+db_pool: Optional[ConnectionPool] = None
+async_db_pool: Optional[AsyncConnectionPool] = None
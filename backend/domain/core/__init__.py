@@ -9,7 +9,7 @@ from .exceptions import (
     AccessDeniedError,
     ConflictError,
 )
-from .unit_of_work import UnitOfWork
+from .unit_of_work import AsyncUnitOfWork, UnitOfWork, WritesDiscardedError
 
 __all__ = [
     "BaseRepository",
@@ -20,4 +20,6 @@ __all__ = [
     "AccessDeniedError",
     "ConflictError",
     "UnitOfWork",
+    "AsyncUnitOfWork",
+    "WritesDiscardedError",
 ]
@@ -1,21 +1,64 @@
 """Unit of Work pattern for transaction management"""
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 import logging
+from psycopg.pq import TransactionStatus
 import db_pool
 
 logger = logging.getLogger(__name__)
 
 
+class WritesDiscardedError(Exception):
+    """A request's writes were rolled back because a statement failed
+
+    Raised by ``commit()`` of a failed unit of work that held writes, so the
+    caller reports an error instead of a success whose writes were lost.
+    """
+
+
 class UnitOfWork:
-    """Manages database transactions"""
+    """Manages database transactions
+
+    ``transaction()`` runs a single block in its own transaction.
+
+    ``scope()`` pins one pooled connection for a longer unit of work (an HTTP
+    request, see ``core.dependencies.get_db``).  The connection is checked out
+    lazily on first use, every repository sharing the unit of work runs inside
+    the same transaction, and writes are committed once when the scope ends.
+    Any database error rolls the whole unit back; if that loses writes, the
+    unit is doomed and ``commit()`` raises ``WritesDiscardedError``.  A failed
+    statement before any write (e.g. a read the handler catches) only ends
+    the transaction, and later writes commit normally.
+    """
+
+    def __init__(self, pool=None) -> None:
+        self._pool = pool
+        self._conn = None
+        self._scoped = False
+        self.dirty = False
+        self.discarded = False  # writes were lost to a failed statement
+
+    @property
+    def pool(self):
+        return self._pool or db_pool.db_pool
+
+    @property
+    def active(self) -> bool:
+        """True while inside ``scope()``"""
+        return self._scoped
 
     @contextmanager
     def transaction(self):
         """Context manager for database transactions"""
+        if self._scoped:
+            # Already inside a request-wide transaction; commit happens at scope end
+            yield self.connection()
+            self.dirty = True
+            return
+
         conn = None
         try:
-            conn = db_pool.db_pool.getconn()
+            conn = self.pool.getconn()
             conn.autocommit = False
             yield conn
             conn.commit()
@@ -27,4 +70,176 @@ class UnitOfWork:
             raise
         finally:
             if conn:
-                db_pool.db_pool.putconn(conn)
+                self.pool.putconn(conn)
+
+    @contextmanager
+    def scope(self):
+        """Pin one connection for the block and commit once when it exits"""
+        self._scoped = True
+        try:
+            yield self
+        except Exception:
+            self.rollback()
+            raise
+        else:
+            self.commit()
+        finally:
+            self._scoped = False
+            self._release_connection()
+
+    def connection(self):
+        """Return the pinned connection, checking one out on first use"""
+        if self._conn is None:
+            self._conn = self.pool.getconn()
+            self._conn.autocommit = False
+            logger.debug("Unit of work pinned a pooled connection")
+        return self._conn
+
+    def mark_dirty(self) -> None:
+        """Record that the transaction holds writes that must be committed"""
+        self.dirty = True
+
+    def mark_failed(self, error: Exception) -> None:
+        """Roll back after a statement error, dooming the unit if writes were lost"""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.rollback()
+        if self.dirty:
+            logger.error(f"Unit of work rolled back: {error}")
+            self.discarded = True
+        self.dirty = False
+
+    def commit(self) -> None:
+        """Commit pending writes.
+
+        A unit of work that already lost writes is rolled back instead and
+        raises ``WritesDiscardedError``.
+        """
+        if self.discarded:
+            if self._conn is not None and not self._conn.closed:
+                self._conn.rollback()
+            self.dirty = False
+            raise WritesDiscardedError("Writes were rolled back after an earlier database error")
+        if self._conn is None:
+            return
+        if self.dirty:
+            self._conn.commit()
+            logger.debug("Unit of work committed")
+        self.dirty = False
+
+    def rollback(self) -> None:
+        """Discard everything done in the current transaction"""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.rollback()
+        self.dirty = False
+
+    def release(self) -> None:
+        """Commit pending work and hand the connection back to the pool early.
+
+        Use before slow non-database work (e.g. upstream HTTP calls) so the
+        request does not hold a connection it is not using.  A later statement
+        simply checks out a fresh connection.
+        """
+        try:
+            self.commit()
+        finally:
+            self._release_connection()
+
+    def _release_connection(self) -> None:
+        if self._conn is not None:
+            self.pool.putconn(self._conn)
+            self._conn = None
+
+
+class AsyncUnitOfWork:
+    """asyncio counterpart of ``UnitOfWork`` for the psycopg 3 pool
+
+    Only the request scope is supported: ``scope()`` pins one connection from
+    ``db_pool.async_db_pool`` lazily and commits once when the block exits
+    (see ``core.dependencies.get_async_db``).
+    """
+
+    def __init__(self, pool=None) -> None:
+        self._pool = pool
+        self._conn = None
+        self._scoped = False
+        self.dirty = False
+        self.discarded = False  # writes were lost to a failed statement
+
+    @property
+    def pool(self):
+        return self._pool or db_pool.async_db_pool
+
+    @property
+    def active(self) -> bool:
+        """True while inside ``scope()``"""
+        return self._scoped
+
+    @asynccontextmanager
+    async def scope(self):
+        """Pin one connection for the block and commit once when it exits"""
+        self._scoped = True
+        try:
+            yield self
+        except Exception:
+            await self.rollback()
+            raise
+        else:
+            await self.commit()
+        finally:
+            self._scoped = False
+            await self._release_connection()
+
+    async def connection(self):
+        """Return the pinned connection, checking one out on first use"""
+        if self._conn is None:
+            self._conn = await self.pool.getconn()
+            logger.debug("Unit of work pinned a pooled connection")
+        return self._conn
+
+    def mark_dirty(self) -> None:
+        """Record that the transaction holds writes that must be committed"""
+        self.dirty = True
+
+    async def mark_failed(self, error: Exception) -> None:
+        """Roll back after a statement error, dooming the unit if writes were lost"""
+        if self._conn is not None and not self._conn.closed:
+            await self._conn.rollback()
+        if self.dirty:
+            logger.error(f"Unit of work rolled back: {error}")
+            self.discarded = True
+        self.dirty = False
+
+    async def commit(self) -> None:
+        """Commit pending writes (see ``UnitOfWork.commit``)"""
+        if self.discarded:
+            if self._conn is not None and not self._conn.closed:
+                await self._conn.rollback()
+            self.dirty = False
+            raise WritesDiscardedError("Writes were rolled back after an earlier database error")
+        if self._conn is None:
+            return
+        if self.dirty:
+            await self._conn.commit()
+            logger.debug("Unit of work committed")
+        self.dirty = False
+
+    async def rollback(self) -> None:
+        """Discard everything done in the current transaction"""
+        if self._conn is not None and not self._conn.closed:
+            await self._conn.rollback()
+        self.dirty = False
+
+    async def release(self) -> None:
+        """Commit pending work and hand the connection back to the pool early"""
+        try:
+            await self.commit()
+        finally:
+            await self._release_connection()
+
+    async def _release_connection(self) -> None:
+        if self._conn is not None:
+            if not self._conn.closed and self._conn.info.transaction_status != TransactionStatus.IDLE:
+                # Read-only work leaves a transaction open; end it quietly
+                await self._conn.rollback()
+            await self.pool.putconn(self._conn)
+            self._conn = None
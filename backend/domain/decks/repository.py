@@ -1,18 +1,58 @@
 from typing import List, Optional, Dict
-from database import DatabaseConnection
+from bible_books import books
+from database import AsyncDatabaseConnection
 from datetime import datetime
 from . import schemas
 from utils.performance import track_queries
+from prepared_statements import prepared
+from verse_catalog import get_catalog
+
+DECK_WITH_TAGS = prepared("deck_with_tags", """
+    SELECT 
+        d.deck_id, d.user_id, u.name AS creator_name, d.name, d.description,
+        d.is_public, d.created_at, d.updated_at,
+        ARRAY_REMOVE(ARRAY_AGG(DISTINCT t.tag_name), NULL) AS tags
+    FROM decks d
+    JOIN users u ON d.user_id = u.user_id
+    LEFT JOIN deck_tag_map m ON d.deck_id = m.deck_id
+    LEFT JOIN deck_tags t ON m.tag_id = t.tag_id
+    WHERE d.deck_id = %s
+    GROUP BY d.deck_id, d.user_id, u.name, d.name, d.description, d.is_public, d.created_at, d.updated_at
+""")
+
+DECK_CARDS = prepared("deck_cards", """
+    SELECT 
+        c.card_id,
+        c.card_type,
+        c.reference,
+        c.position,
+        c.added_at,
+        bv.id AS verse_id,
+        bv.verse_code,
+        bv.book_id,
+        bb.book_name,
+        bv.chapter_number,
+        bv.verse_number,
+        bv.is_apocryphal,
+        cv.verse_order
+    FROM deck_cards c
+    JOIN card_verses cv ON c.card_id = cv.card_id
+    JOIN bible_verses bv ON cv.verse_id = bv.id
+    JOIN bible_books bb ON bv.book_id = bb.book_id
+    WHERE c.deck_id = %s
+    ORDER BY c.position, cv.verse_order
+""")
+
 
 class DeckRepository:
     """Data access layer for decks using PostgreSQL"""
 
-    def __init__(self, db: DatabaseConnection):
+    def __init__(self, db: AsyncDatabaseConnection):
         self.db = db
 
     async def create_deck(self, deck_data: schemas.DeckCreate, user_id: int) -> Dict:
         """Create a new deck and optionally initial cards"""
-        row = self.db.fetch_one(
+        row = await self.db.fetch_one(
             """
             INSERT INTO decks (user_id, name, description, is_public)
             VALUES (%s, %s, %s, %s)
@@ -27,42 +67,40 @@ class DeckRepository:
 
         # Tags
         for tag in deck_data.tags or []:
-            tag_row = self.db.fetch_one(
+            tag_row = await self.db.fetch_one(
                 "INSERT INTO deck_tags (tag_name) VALUES (%s) "
                 "ON CONFLICT (tag_name) DO UPDATE SET tag_name = EXCLUDED.tag_name RETURNING tag_id",
                 (tag,),
                 commit=True,
             )
-            self.db.execute(
+            await self.db.execute(
                 "INSERT INTO deck_tag_map (deck_id, tag_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
                 (deck_id, tag_row["tag_id"]),
             )
 
         # Add verses as single cards
+        catalog = get_catalog()
         position = 1
         for code in deck_data.verse_codes or []:
-            verse = self.db.fetch_one(
-                "SELECT id FROM bible_verses WHERE verse_code = %s",
-                (code,),
-            )
-            if not verse:
+            verse_id = catalog.id_for_code(code)
+            if verse_id is None:
                 continue
-            card_row = self.db.fetch_one(
+            card_row = await self.db.fetch_one(
                 """
                 INSERT INTO deck_cards (deck_id, card_type, reference, start_verse_id, position)
                 VALUES (%s, 'single_verse', %s, %s, %s)
                 RETURNING card_id
                 """,
-                (deck_id, code, verse["id"], position),
+                (deck_id, code, verse_id, position),
                 commit=True,
             )
-            self.db.execute(
+            await self.db.execute(
                 "INSERT INTO card_verses (card_id, verse_id, verse_order) VALUES (%s, %s, 1)",
-                (card_row["card_id"], verse["id"]),
+                (card_row["card_id"], verse_id),
             )
             position += 1
 
-        creator = self.db.fetch_one("SELECT name FROM users WHERE user_id = %s", (user_id,))
+        creator = await self.db.fetch_one("SELECT name FROM users WHERE user_id = %s", (user_id,))
         return {
             "deck_id": deck_id,
             "creator_id": user_id,
@@ -80,7 +118,7 @@ class DeckRepository:
         }
 
     async def get_deck_by_id(self, deck_id: int, user_id: int) -> Optional[Dict]:
-        row = self.db.fetch_one(
+        row = await self.db.fetch_one(
             """
             SELECT d.deck_id, d.user_id, u.name AS creator_name, d.name, d.description,
                    d.is_public, d.created_at, d.updated_at,
@@ -97,7 +135,7 @@ class DeckRepository:
         if not row:
             return None
 
-        cards_rows = self.db.fetch_all(
+        cards_rows = await self.db.fetch_all(
             """
             SELECT c.card_id, c.card_type, c.reference, c.position, c.added_at,
                    bv.id AS verse_id, bv.verse_code, bv.book_id, bb.book_name,
@@ -161,7 +199,7 @@ class DeckRepository:
         }
 
     async def get_public_decks(self, skip: int = 0, limit: int = 20) -> List[Dict]:
-        rows = self.db.fetch_all(
+        rows = await self.db.fetch_all(
             """
             SELECT d.deck_id, d.user_id, u.name AS creator_name, d.name, d.description,
                    d.is_public, d.created_at, d.updated_at,
@@ -215,11 +253,11 @@ class DeckRepository:
             return None
         params.append(deck_id)
         query = f"UPDATE decks SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP WHERE deck_id = %s"
-        self.db.execute(query, tuple(params))
+        await self.db.execute(query, tuple(params))
         return await self.get_deck_by_id(deck_id, 0)
 
     async def delete_deck(self, deck_id: int) -> bool:
-        row = self.db.fetch_one(
+        row = await self.db.fetch_one(
             "DELETE FROM decks WHERE deck_id = %s RETURNING deck_id",
             (deck_id,),
             commit=True,
@@ -229,27 +267,28 @@ class DeckRepository:
     async def add_card(self, deck_id: int, verse_codes: List[str], reference: str | None = None) -> Optional[Dict]:
         if not verse_codes:
             return None
-        position_row = self.db.fetch_one(
+        position_row = await self.db.fetch_one(
             "SELECT COALESCE(MAX(position), 0) + 1 AS pos FROM deck_cards WHERE deck_id = %s",
             (deck_id,),
         )
         position = position_row["pos"] if position_row else 1
 
+        catalog = get_catalog()
         start_verse_id = None
         end_verse_id = None
         verses_data = []
         for idx, code in enumerate(verse_codes, start=1):
-            verse = self.db.fetch_one("SELECT id FROM bible_verses WHERE verse_code = %s", (code,))
+            verse = catalog.by_code(code)
             if not verse:
                 continue
-            verses_data.append((verse["id"], idx))
+            verses_data.append((verse, idx))
             if start_verse_id is None:
-                start_verse_id = verse["id"]
-            end_verse_id = verse["id"]
+                start_verse_id = verse.id
+            end_verse_id = verse.id
         if not verses_data:
             return None
 
-        card_row = self.db.fetch_one(
+        card_row = await self.db.fetch_one(
             """
             INSERT INTO deck_cards (deck_id, card_type, reference, start_verse_id, end_verse_id, position)
             VALUES (%s, %s, %s, %s, %s, %s)
@@ -267,30 +306,23 @@ class DeckRepository:
         )
         card_id = card_row["card_id"]
         added_at = card_row["added_at"].isoformat()
-        params_list = [(card_id, v_id, order) for v_id, order in verses_data]
-        self.db.execute_many(
+        params_list = [(card_id, v.id, order) for v, order in verses_data]
+        await self.db.execute_many(
             "INSERT INTO card_verses (card_id, verse_id, verse_order) VALUES (%s, %s, %s)",
             params_list,
         )
 
         verses_result = []
-        for v_id, order in verses_data:
-            v = self.db.fetch_one(
-                """
-                SELECT bv.id, bv.verse_code, bv.book_id, bb.book_name, bv.chapter_number, bv.verse_number, bv.is_apocryphal
-                FROM bible_verses bv JOIN bible_books bb ON bv.book_id = bb.book_id WHERE bv.id = %s
-                """,
-                (v_id,),
-            )
+        for v, order in verses_data:
             verses_result.append(
                 {
-                    "verse_id": v["id"],
-                    "verse_code": v["verse_code"],
-                    "book_id": v["book_id"],
-                    "book_name": v["book_name"],
-                    "chapter_number": v["chapter_number"],
-                    "verse_number": v["verse_number"],
-                    "reference": v["verse_code"],
+                    "verse_id": v.id,
+                    "verse_code": v.verse_code,
+                    "book_id": v.book_id,
+                    "book_name": books.name(v.book_id),
+                    "chapter_number": v.chapter_number,
+                    "verse_number": v.verse_number,
+                    "reference": v.verse_code,
                     "text": "",
                     "verse_order": order,
                 }
@@ -329,7 +361,7 @@ class DeckRepository:
             OFFSET %s LIMIT %s
         """
 
-        decks = self.db.fetch_all(decks_query, (user_id, skip, limit))
+        decks = await self.db.fetch_all(decks_query, (user_id, skip, limit))
         if not decks:
             return []
 
@@ -342,7 +374,7 @@ class DeckRepository:
             ORDER BY m.deck_id, t.tag_name
         """
 
-        tags_data = self.db.fetch_all(tags_query, (deck_ids,))
+        tags_data = await self.db.fetch_all(tags_query, (deck_ids,))
 
         tags_by_deck: Dict[int, List[str]] = {}
         for row in tags_data:
@@ -373,71 +405,35 @@ class DeckRepository:
     async def get_deck_with_cards(self, deck_id: int, user_id: int) -> Optional[Dict]:
         """Get a deck with all its cards and verses in just 2 queries"""
 
-        deck_query = """
-            SELECT 
-                d.deck_id, d.user_id, u.name AS creator_name, d.name, d.description,
-                d.is_public, d.created_at, d.updated_at,
-                ARRAY_REMOVE(ARRAY_AGG(DISTINCT t.tag_name), NULL) AS tags
-            FROM decks d
-            JOIN users u ON d.user_id = u.user_id
-            LEFT JOIN deck_tag_map m ON d.deck_id = m.deck_id
-            LEFT JOIN deck_tags t ON m.tag_id = t.tag_id
-            WHERE d.deck_id = %s
-            GROUP BY d.deck_id, d.user_id, u.name, d.name, d.description, d.is_public, d.created_at, d.updated_at
-        """
-
-        deck = self.db.fetch_one(deck_query, (deck_id,))
+        deck = await self.db.fetch_one(DECK_WITH_TAGS, (deck_id,))
         if not deck:
             return None
 
-        cards_query = """
-            SELECT 
-                c.card_id,
-                c.card_type,
-                c.reference,
-                c.position,
-                c.added_at,
-                bv.id AS verse_id,
-                bv.verse_code,
-                bv.book_id,
-                bb.book_name,
-                bv.chapter_number,
-                bv.verse_number,
-                bv.is_apocryphal,
-                cv.verse_order
-            FROM deck_cards c
-            JOIN card_verses cv ON c.card_id = cv.card_id
-            JOIN bible_verses bv ON cv.verse_id = bv.id
-            JOIN bible_books bb ON bv.book_id = bb.book_id
-            WHERE c.deck_id = %s
-            ORDER BY c.position, cv.verse_order
-        """
-
-        cards_data = self.db.fetch_all(cards_query, (deck_id,))
+        cards_data = await self.db.fetch_rows(DECK_CARDS, (deck_id,))
 
         cards_map: Dict[int, Dict] = {}
         for row in cards_data:
-            cid = row["card_id"]
+            cid = row.card_id
             if cid not in cards_map:
                 cards_map[cid] = {
                     "card_id": cid,
-                    "card_type": row["card_type"],
-                    "reference": row["reference"],
-                    "position": row["position"],
-                    "added_at": row["added_at"].isoformat(),
+                    "card_type": row.card_type,
+                    "reference": row.reference,
+                    "position": row.position,
+                    "added_at": row.added_at.isoformat(),
                     "verses": [],
                 }
             cards_map[cid]["verses"].append(
                 {
-                    "verse_id": row["verse_id"],
-                    "verse_code": row["verse_code"],
-                    "book_id": row["book_id"],
-                    "book_name": row["book_name"],
-                    "chapter_number": row["chapter_number"],
-                    "verse_number": row["verse_number"],
-                    "reference": row["reference"],
+                    "verse_id": row.verse_id,
+                    "verse_code": row.verse_code,
+                    "book_id": row.book_id,
+                    "book_name": row.book_name,
+                    "chapter_number": row.chapter_number,
+                    "verse_number": row.verse_number,
+                    "reference": row.reference,
                     "text": "",
-                    "verse_order": row["verse_order"],
+                    "verse_order": row.verse_order,
                 }
             )
 
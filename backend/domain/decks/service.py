@@ -1,5 +1,7 @@
+import asyncio
 from typing import List, Dict
 import logging
+from bible_books import books
 from . import schemas, repository
 from .exceptions import DeckNotFoundError
 
@@ -111,8 +113,8 @@ class DeckService:
     async def _get_verse_texts(self, verse_codes: List[str], user_id: int) -> Dict[str, str]:
         """Get verse texts using the same logic as the verse text endpoint"""
         try:
-            from services.api_bible import APIBibleService
             from services.esv_api import ESVService, ESVRateLimitError
+            from services.verse_text_batcher import verse_text_batcher
             from config import Config
             
             # Get user preferences 
@@ -121,7 +123,7 @@ class DeckService:
                 FROM users 
                 WHERE user_id = %s
             """
-            user_row = self.repo.db.fetch_one(user_query, (user_id,))
+            user_row = await self.repo.db.fetch_one(user_query, (user_id,))
             
             use_esv = user_row and user_row.get("use_esv_api", False)
             esv_token = user_row and user_row.get("esv_api_token")
@@ -129,25 +131,16 @@ class DeckService:
             
             if use_esv and esv_token:
                 logger.info("Using ESV API for verse texts")
-                # Get verse references
-                refs_query = """
-                    SELECT bv.verse_code, bb.book_name, bv.chapter_number, bv.verse_number
-                    FROM bible_verses bv
-                    JOIN bible_books bb ON bv.book_id = bb.book_id
-                    WHERE bv.verse_code = ANY(%s)
-                """
-                refs_rows = self.repo.db.fetch_all(refs_query, (verse_codes,))
-                ref_map = {
-                    row["verse_code"]: f"{row['book_name']} {row['chapter_number']}:{row['verse_number']}"
-                    for row in refs_rows
-                }
+                ref_map = books.references(verse_codes)
                 
+                # Don't hold the request's connection during upstream calls
+                await self.repo.db.release()
                 esv = ESVService(esv_token)
-                verse_texts = esv.get_verses_batch(ref_map)
+                verse_texts = await asyncio.to_thread(esv.get_verses_batch, ref_map)
             else:
                 logger.info("Using API.Bible for verse texts")
-                api_bible = APIBibleService(Config.API_BIBLE_KEY, bible_id)
-                verse_texts = api_bible.get_verses_batch(verse_codes, bible_id)
+                await self.repo.db.release()
+                verse_texts = await verse_text_batcher.get_verse_texts(verse_codes, bible_id)
             
             # Ensure all requested codes are present
             return {code: verse_texts.get(code, "") for code in verse_codes}
@@ -170,7 +163,7 @@ class DeckService:
                 JOIN bible_verses bv ON cv.verse_id = bv.id
                 WHERE dc.deck_id = %s
             """
-            deck_verses = self.repo.db.fetch_all(deck_verses_query, (deck_id,))
+            deck_verses = await self.repo.db.fetch_all(deck_verses_query, (deck_id,))
             
             if not deck_verses:
                 return {
@@ -188,7 +181,7 @@ class DeckService:
                 FROM user_verses 
                 WHERE user_id = %s AND verse_id = ANY(%s)
             """
-            memorized_verses = self.repo.db.fetch_all(memorized_query, (user_id, verse_ids))
+            memorized_verses = await self.repo.db.fetch_all(memorized_query, (user_id, verse_ids))
             memorized_count = len(memorized_verses)
             total_verses = len(deck_verses)
             
@@ -1,149 +1,94 @@
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict
 from datetime import datetime
 import logging
-import json
-from pathlib import Path
+from bible_books import books
 from database import DatabaseConnection
+from prepared_statements import prepared
 from domain.core import BaseRepository
 from utils.performance import track_queries
-from utils.batch_loader import BatchLoader
+from verse_catalog import get_catalog
 
 logger = logging.getLogger(__name__)
 
+_USER_VERSES_SQL = """
+    SELECT 
+        uv.verse_id,
+        bv.verse_code,
+        bv.book_id,
+        bv.chapter_number,
+        bv.verse_number,
+        bv.is_apocryphal,
+        uv.practice_count,
+        COALESCE(uvc.confidence_score, 0) as confidence_score,
+        uv.last_practiced,
+        uvc.last_reviewed,
+        uv.created_at,
+        uv.updated_at
+    FROM user_verses uv
+    JOIN bible_verses bv ON uv.verse_id = bv.id
+    LEFT JOIN user_verse_confidence uvc ON uv.user_id = uvc.user_id AND uv.verse_id = uvc.verse_id
+    WHERE uv.user_id = %s{apocrypha_filter}
+    ORDER BY bv.book_id, bv.chapter_number, bv.verse_number
+"""
+
+USER_VERSES = prepared("user_verses", _USER_VERSES_SQL.format(apocrypha_filter=""))
+USER_VERSES_CANONICAL = prepared(
+    "user_verses_canonical",
+    _USER_VERSES_SQL.format(apocrypha_filter=" AND bv.is_apocryphal = FALSE"),
+)
+
+# Upsert every verse matching ``verse_filter`` for a user in one statement;
+# the verses never leave the database, so a whole book is one round trip
+SAVE_VERSES = """
+    WITH verses AS (
+        SELECT id FROM bible_verses WHERE {verse_filter}
+    ), saved AS (
+        INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
+        SELECT %s, id, 1, NOW() FROM verses
+        ON CONFLICT (user_id, verse_id) DO UPDATE SET
+            practice_count = user_verses.practice_count + 1,
+            last_practiced = EXCLUDED.last_practiced,
+            updated_at = CURRENT_TIMESTAMP
+    )
+    SELECT COUNT(*) AS verses_count FROM verses
+"""
 
 class VerseRepository(BaseRepository):
     """Repository for verse operations"""
 
     def __init__(self, db: DatabaseConnection):
         super().__init__(db)
-        self._verse_cache: Dict[str, Dict] = {}
-        self._book_names_cache: Dict[int, str] = {}
 
-    def _get_book_name(self, book_id: int) -> str:
-        """Get book name from cache or JSON file"""
-        if book_id in self._book_names_cache:
-            return self._book_names_cache[book_id]
-
-        # Lazy load book names from bible_base_data.json
-        try:
-            if not hasattr(self, "_book_names"):
-                # Try multiple paths to find the file
-                possible_paths = [
-                    Path(__file__).resolve().parents[2] / "bible_base_data.json",  # In Docker container
-                    Path(__file__).resolve().parents[3] / "sql_setup" / "bible_base_data.json",  # Development
-                    Path(__file__).resolve().parents[2] / "sql_setup" / "bible_base_data.json",  # Original path
-                ]
-                
-                path = None
-                for p in possible_paths:
-                    if p.exists():
-                        path = p
-                        break
-                
-                if not path:
-                    raise FileNotFoundError(f"bible_base_data.json not found in any of: {possible_paths}")
-                    
-                with open(path) as f:
-                    data = json.load(f)
-                self._book_names = {
-                    idx + 1: book.get("name", f"Book {idx + 1}")
-                    for idx, book in enumerate(data.get("books", []))
-                }
-            name = self._book_names.get(book_id, f"Book {book_id}")
-        except Exception as e:
-            logger.error("Failed to load book names: %s", e)
-            name = f"Book {book_id}"
-        self._book_names_cache[book_id] = name
-        return name
+    def get_book_name(self, book_id: int) -> str:
+        """Get book name from the shared book registry"""
+        return books.name(book_id)
 
     @track_queries(max_queries=1)
-    def get_user_verses(self, user_id: int, include_apocrypha: bool = False) -> List[Dict]:
-        """Get all verses for a user"""
-        query = """
-            SELECT 
-                uv.verse_id,
-                bv.verse_code,
-                bv.book_id,
-                bv.chapter_number,
-                bv.verse_number,
-                bv.is_apocryphal,
-                uv.practice_count,
-                COALESCE(uvc.confidence_score, 0) as confidence_score,
-                uv.last_practiced,
-                uvc.last_reviewed,
-                uv.created_at,
-                uv.updated_at
-            FROM user_verses uv
-            JOIN bible_verses bv ON uv.verse_id = bv.id
-            LEFT JOIN user_verse_confidence uvc ON uv.user_id = uvc.user_id AND uv.verse_id = uvc.verse_id
-            WHERE uv.user_id = %s
-        """
-        if not include_apocrypha:
-            query += " AND bv.is_apocryphal = FALSE"
-        query += " ORDER BY bv.book_id, bv.chapter_number, bv.verse_number"
-
-        verses = self.db.fetch_all(query, (user_id,))
+    def get_user_verses(self, user_id: int, include_apocrypha: bool = False) -> List[tuple]:
+        """Get all verses for a user as named-tuple rows (book names via ``get_book_name``)"""
+        query = USER_VERSES if include_apocrypha else USER_VERSES_CANONICAL
+        return self.db.fetch_rows(query, (user_id,))
 
-        # Add book names
-        for verse in verses:
-            verse['book_name'] = self._get_book_name(verse['book_id'])
+    def iter_user_verses(self, user_id: int, include_apocrypha: bool = False,
+                         batch_size: Optional[int] = None) -> Iterator[tuple]:
+        """Stream a user's verses from a server-side cursor as named-tuple rows"""
+        query = USER_VERSES if include_apocrypha else USER_VERSES_CANONICAL
+        return self.db.stream(query, (user_id,), batch_size=batch_size, named_tuples=True)
 
-        return verses
-
-    @track_queries(max_queries=1)
     def get_verse_by_code(self, verse_code: str) -> Optional[Dict]:
-        """Get verse by code with caching"""
-        if verse_code in self._verse_cache:
-            return self._verse_cache[verse_code]
+        """Get verse by code from the in-process verse catalog"""
+        verse = get_catalog().by_code(verse_code)
+        return verse._asdict() if verse else None
 
-        verse = self.db.fetch_one(
-            """
-            SELECT 
-                id, verse_code, book_id, chapter_number, 
-                verse_number, is_apocryphal
-            FROM bible_verses 
-            WHERE verse_code = %s
-            """,
-            (verse_code,)
-        )
-
-        if verse:
-            self._verse_cache[verse_code] = verse
-        return verse
-
-    @track_queries(max_queries=2)
     def get_verses_batch(self, verse_codes: List[str]) -> Dict[str, Dict]:
-        """Get multiple verses efficiently"""
-        if not verse_codes:
-            return {}
-
-        # Check cache first
-        uncached_codes = []
-        cached_verses = {}
-
+        """Get multiple verses from the in-process verse catalog"""
+        catalog = get_catalog()
+        verses = {}
         for code in verse_codes:
-            if code in self._verse_cache:
-                cached_verses[code] = self._verse_cache[code]
-            else:
-                uncached_codes.append(code)
-
-        # Fetch uncached verses
-        if uncached_codes:
-            query = """
-                SELECT 
-                    verse_code, id, book_id, chapter_number, 
-                    verse_number, is_apocryphal
-                FROM bible_verses
-                WHERE verse_code = ANY(%s)
-            """
-            verses = self.db.fetch_all(query, (uncached_codes,))
-
-            for verse in verses:
-                code = verse['verse_code']
-                self._verse_cache[code] = verse
-                cached_verses[code] = verse
-
-        return cached_verses
+            verse = catalog.by_code(code)
+            if verse:
+                verses[code] = verse._asdict()
+        return verses
 
     @track_queries(max_queries=1)
     def save_verse(self, user_id: int, verse_id: int, practice_count: int = 1, 
@@ -183,31 +128,19 @@ class VerseRepository(BaseRepository):
         result = self.db.fetch_one(query, (user_id, verse_id), commit=True)
         return result is not None
 
-    @track_queries(max_queries=2)
+    @track_queries(max_queries=1)
     def save_chapter(self, user_id: int, book_id: int, chapter_num: int) -> Dict[str, any]:
         """Save all verses in a chapter"""
-        # Get all verses in chapter
-        verses = self.db.fetch_all(
-            "SELECT id FROM bible_verses WHERE book_id = %s AND chapter_number = %s",
-            (book_id, chapter_num)
+        row = self.db.fetch_one(
+            SAVE_VERSES.format(verse_filter="book_id = %s AND chapter_number = %s"),
+            (book_id, chapter_num, user_id),
+            commit=True,
         )
 
-        if not verses:
+        if not row["verses_count"]:
             raise ValueError(f"Chapter {book_id}:{chapter_num} not found")
 
-        # Bulk insert
-        verse_ids = [v['id'] for v in verses]
-        query = """
-            INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
-            SELECT %s, unnest(%s::int[]), 1, NOW()
-            ON CONFLICT (user_id, verse_id) DO UPDATE SET
-                practice_count = user_verses.practice_count + 1,
-                last_practiced = EXCLUDED.last_practiced,
-                updated_at = CURRENT_TIMESTAMP
-        """
-        self.db.execute(query, (user_id, verse_ids))
-
-        return {"message": "Chapter saved successfully", "verses_count": len(verses)}
+        return {"message": "Chapter saved successfully", "verses_count": row["verses_count"]}
 
     @track_queries(max_queries=2)
     def clear_chapter(self, user_id: int, book_id: int, chapter_num: int) -> Dict[str, str]:
@@ -222,34 +155,19 @@ class VerseRepository(BaseRepository):
         self.db.execute(query, (user_id, book_id, chapter_num))
         return {"message": "Chapter cleared successfully"}
 
-    @track_queries(max_queries=2)
+    @track_queries(max_queries=1)
     def save_book(self, user_id: int, book_id: int) -> Dict[str, any]:
         """Save all verses in a book"""
-        # Get all verses in book
-        verses = self.db.fetch_all(
-            "SELECT id FROM bible_verses WHERE book_id = %s",
-            (book_id,)
+        row = self.db.fetch_one(
+            SAVE_VERSES.format(verse_filter="book_id = %s"),
+            (book_id, user_id),
+            commit=True,
         )
 
-        if not verses:
+        if not row["verses_count"]:
             raise ValueError(f"Book {book_id} not found")
 
-        # Bulk insert in chunks to avoid query size limits
-        verse_ids = [v['id'] for v in verses]
-        chunks = BatchLoader.chunk_list(verse_ids, chunk_size=1000)
-
-        for chunk in chunks:
-            query = """
-                INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
-                SELECT %s, unnest(%s::int[]), 1, NOW()
-                ON CONFLICT (user_id, verse_id) DO UPDATE SET
-                    practice_count = user_verses.practice_count + 1,
-                    last_practiced = EXCLUDED.last_practiced,
-                    updated_at = CURRENT_TIMESTAMP
-            """
-            self.db.execute(query, (user_id, chunk))
-
-        return {"message": "Book saved successfully", "verses_count": len(verses)}
+        return {"message": "Book saved successfully", "verses_count": row["verses_count"]}
 
     @track_queries(max_queries=1)
     def clear_book(self, user_id: int, book_id: int) -> Dict[str, str]:
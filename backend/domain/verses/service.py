@@ -1,6 +1,7 @@
-from typing import List, Dict
+from typing import Iterator, List, Dict
 from datetime import datetime
 import logging
+from bible_books import books
 from domain.core import BaseService
 from domain.core.exceptions import ValidationError
 from .repository import VerseRepository
@@ -28,11 +29,12 @@ class VerseService(BaseService):
 
     def _validate_verse_code(self, book_id: int, chapter: int, verse: int) -> str:
         """Validate and format verse code"""
-        if book_id < 1 or book_id > 73:
+        book = books.get(book_id)
+        if book is None:
             raise InvalidVerseCodeError(f"Invalid book ID: {book_id}")
-        if chapter < 1:
+        if not 1 <= chapter <= book.chapter_count:
             raise InvalidVerseCodeError(f"Invalid chapter: {chapter}")
-        if verse < 1:
+        if not 1 <= verse <= book.verse_count(chapter):
             raise InvalidVerseCodeError(f"Invalid verse: {verse}")
         return f"{book_id}-{chapter}-{verse}"
 
@@ -40,29 +42,35 @@ class VerseService(BaseService):
         """Get all verses for a user"""
         logger.info(f"Getting verses for user {user_id}, include_apocrypha={include_apocrypha}")
         verses = self.repo.get_user_verses(user_id, include_apocrypha)
-        result: List[UserVerseResponse] = []
-        for v in verses:
-            result.append(
-                UserVerseResponse(
-                    verse=VerseDetail(
-                        verse_id=v["verse_code"],
-                        book_id=v["book_id"],
-                        book_name=v["book_name"],
-                        chapter_number=v["chapter_number"],
-                        verse_number=v["verse_number"],
-                        is_apocryphal=v.get("is_apocryphal", False),
-                    ),
-                    practice_count=v["practice_count"],
-                    confidence_score=v.get("confidence_score"),
-                    last_practiced=v["last_practiced"].isoformat() if v["last_practiced"] else None,
-                    last_reviewed=v["last_reviewed"].isoformat() if v.get("last_reviewed") else None,
-                    created_at=v["created_at"].isoformat(),
-                    updated_at=v["updated_at"].isoformat() if v["updated_at"] else None,
-                )
-            )
+        result = [self._to_user_verse_response(v) for v in verses]
         logger.info(f"Found {len(result)} verses for user {user_id}")
         return result
 
+    def iter_user_verses(self, user_id: int, include_apocrypha: bool = False) -> Iterator[UserVerseResponse]:
+        """Lazily yield a user's verses; for streaming responses and exports"""
+        logger.info(f"Streaming verses for user {user_id}, include_apocrypha={include_apocrypha}")
+        for v in self.repo.iter_user_verses(user_id, include_apocrypha):
+            yield self._to_user_verse_response(v)
+
+    def _to_user_verse_response(self, v: tuple) -> UserVerseResponse:
+        # Rows come straight from typed columns, so skip pydantic validation
+        return UserVerseResponse.model_construct(
+            verse=VerseDetail.model_construct(
+                verse_id=v.verse_code,
+                book_id=v.book_id,
+                book_name=self.repo.get_book_name(v.book_id),
+                chapter_number=v.chapter_number,
+                verse_number=v.verse_number,
+                is_apocryphal=bool(v.is_apocryphal),
+            ),
+            practice_count=v.practice_count,
+            confidence_score=v.confidence_score,
+            last_practiced=v.last_practiced.isoformat() if v.last_practiced else None,
+            last_reviewed=v.last_reviewed.isoformat() if v.last_reviewed else None,
+            created_at=v.created_at.isoformat(),
+            updated_at=v.updated_at.isoformat() if v.updated_at else None,
+        )
+
     def save_or_update_verse(self, user_id: int, book_id: int, chapter_num: int,
                              verse_num: int, update: VerseUpdate) -> Dict[str, str]:
         """Save or update a single verse"""
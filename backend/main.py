@@ -3,11 +3,14 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from contextlib import asynccontextmanager
-import psycopg2
-from psycopg2.pool import SimpleConnectionPool
 from database import DatabaseConnection
 from config import Config
 import db_pool
+import cross_reference_graph
+import verse_catalog
+from services.local_bible import local_bible
+from services.upstream_http import upstream
+from services.upstream_health import api_bible_health
 from api.auth_routes import router as auth_router
 
 # Configure logging
@@ -25,40 +28,74 @@ async def lifespan(app: FastAPI):
     Config.log_config()
 
     try:
-        db_pool.db_pool = SimpleConnectionPool(
-            1,
-            20,
+        db_pool.db_pool = db_pool.ConnectionPool(
+            Config.DB_POOL_MIN,
+            Config.DB_POOL_MAX,
+            timeout=Config.DB_POOL_TIMEOUT,
+            max_age=Config.DB_POOL_MAX_AGE,
+            max_idle=Config.DB_POOL_MAX_IDLE,
+            schema=Config.DATABASE_SCHEMA,
             host=Config.DATABASE_HOST,
             database=Config.DATABASE_NAME,
             user=Config.DATABASE_USER,
             password=Config.DATABASE_PASSWORD,
             port=Config.DATABASE_PORT,
         )
-        logger.info("Database connection pool created successfully")
+        db_pool.async_db_pool = db_pool.create_async_pool(
+            Config.DB_POOL_MIN,
+            Config.DB_POOL_MAX,
+            timeout=Config.DB_POOL_TIMEOUT,
+            max_age=Config.DB_POOL_MAX_AGE,
+            max_idle=Config.DB_POOL_MAX_IDLE,
+            schema=Config.DATABASE_SCHEMA,
+            host=Config.DATABASE_HOST,
+            dbname=Config.DATABASE_NAME,
+            user=Config.DATABASE_USER,
+            password=Config.DATABASE_PASSWORD,
+            port=Config.DATABASE_PORT,
+        )
+        await db_pool.async_db_pool.open()
+        logger.info("Database connection pools created successfully")
     except Exception as e:
         logger.error(f"Failed to create database pool: {e}")
         raise
 
-    # Test API.Bible on startup
+    # Reference data every verse route relies on: without it the schema is
+    # not set up, so refuse to start
     try:
-        from services.api_bible import APIBibleService
-        logger.info("Testing API.Bible connection...")
-        service = APIBibleService(Config.API_BIBLE_KEY, Config.DEFAULT_BIBLE_ID)
-        bibles = service.get_available_bibles()
-        
-        if not bibles:
-            raise Exception("API.Bible returned no Bibles. Check your API key.")
-        
-        logger.info(f"✓ API.Bible connection successful: {len(bibles)} Bibles available")
+        verse_catalog.reload_catalog()
     except Exception as e:
-        logger.error(f"✗ API.Bible connection FAILED: {e}")
-        logger.error("Please check your API_BIBLE_KEY in .bashrc file")
-        raise Exception(f"API.Bible startup check failed: {e}")
+        logger.error(f"Failed to load the verse catalog from bible_verses: {e}")
+        await close_pools()
+        raise
+    try:
+        cross_reference_graph.reload_graph()
+    except Exception as e:
+        logger.error(f"Failed to load the cross-reference graph from cross_references: {e}")
+        await close_pools()
+        raise
+
+    # Local translations are optional; API.Bible serves everything without them
+    try:
+        local_bible.reload()
+    except Exception as e:
+        logger.warning(f"Failed to load local translations, using API.Bible only: {e}")
+
+    # Probe API.Bible in the background; startup does not wait on it
+    api_bible_health.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down FastAPI application...")
+    await api_bible_health.stop()
+    await close_pools()
+    upstream.close()
+
+
+async def close_pools():
+    if db_pool.async_db_pool:
+        await db_pool.async_db_pool.close()
     if db_pool.db_pool:
         db_pool.db_pool.closeall()
         logger.info("Database connections closed")
@@ -100,54 +137,46 @@ app.include_router(bibles.router, prefix="/api/bibles", tags=["bibles"])
 app.include_router(monitoring.router, prefix="/api/monitoring", tags=["monitoring"])
 
 @app.get("/api/health")
-async def health_check():
+def health_check():
     """Health check endpoint"""
     logger.info("Health check requested")
 
     # Test database connection
     try:
-        conn = db_pool.db_pool.getconn()
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        cur.close()
-        db_pool.db_pool.putconn(conn)
-        db_status = "healthy"
+        conn = db_pool.db_pool.getconn(timeout=5)
+        try:
+            search_path_ok = db_pool.db_pool.verify_search_path(conn)
+        finally:
+            db_pool.db_pool.putconn(conn)
+        if search_path_ok:
+            db_status = "healthy"
+        else:
+            logger.error(f"Database health check failed: search_path is not {Config.DATABASE_SCHEMA}")
+            db_status = "unhealthy"
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
         db_status = "unhealthy"
 
-    # Test API.Bible connection
-    api_bible_status = "healthy"
-    api_bible_error = None
-    try:
-        from services.api_bible import APIBibleService
-        service = APIBibleService(Config.API_BIBLE_KEY, Config.DEFAULT_BIBLE_ID)
-        bibles = service.get_available_bibles()
-        
-        if not bibles:
-            api_bible_status = "unhealthy"
-            api_bible_error = "No Bibles returned from API.Bible"
-            logger.error("API.Bible health check failed: No Bibles returned")
-        else:
-            logger.info(f"API.Bible health check passed: {len(bibles)} Bibles available")
-    except Exception as e:
-        api_bible_status = "unhealthy"
-        api_bible_error = str(e)
-        logger.error(f"API.Bible health check failed: {e}")
+    # API.Bible status comes from the background probe; a third-party
+    # outage degrades the service but does not fail the health check
+    api_bible = api_bible_health.snapshot()
 
-    # Overall status
-    overall_status = "healthy"
-    if db_status == "unhealthy" or api_bible_status == "unhealthy":
+    if db_status == "unhealthy":
         overall_status = "unhealthy"
+    elif api_bible["status"] == "unhealthy":
+        overall_status = "degraded"
+    else:
+        overall_status = "healthy"
 
     response = {
         "status": overall_status,
         "database": db_status,
-        "api_bible": api_bible_status,
+        "api_bible": api_bible["status"],
+        "api_bible_checked_at": api_bible["checked_at"],
     }
     
-    if api_bible_error:
-        response["api_bible_error"] = api_bible_error
+    if api_bible["error"]:
+        response["api_bible_error"] = api_bible["error"]
 
     return response
 
@@ -0,0 +1,162 @@
+# backend/prepared_statements.py
+"""Server-side prepared statements for hot, fixed-shape queries
+
+Repositories register a query once at import time and pass the returned
+``PreparedStatement`` to ``DatabaseConnection``/``AsyncDatabaseConnection``
+instead of the SQL text::
+
+    VERSE_BY_CODE = prepared("verse_by_code", "SELECT ... WHERE verse_code = %s")
+    self.db.fetch_one(VERSE_BY_CODE, (code,))
+
+The first execution on a physical connection sends ``PREPARE``; later ones
+send ``EXECUTE`` so Postgres skips parsing and planning.  Which statements
+each connection has prepared is tracked here (weakly keyed by connection, so
+recycled connections start empty), together with per-statement hit rates
+for ``GET /api/monitoring/prepared-statements``.
+"""
+
+import logging
+import re
+import threading
+import weakref
+from typing import Any, Dict, Optional, Set
+
+import psycopg.errors
+import psycopg2.errors
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%%|%s")
+
+
+class PreparedStatement:
+    """A named query using ``%s`` placeholders"""
+
+    __slots__ = ("name", "text", "param_count", "prepare_sql", "execute_sql")
+
+    def __init__(self, name: str, text: str) -> None:
+        self.name = name
+        self.text = text
+        count = 0
+
+        def positional(match: "re.Match") -> str:
+            nonlocal count
+            if match.group() == "%%":
+                return "%"
+            count += 1
+            return f"${count}"
+
+        body = _PLACEHOLDER.sub(positional, text)
+        self.param_count = count
+        self.prepare_sql = f"PREPARE {name} AS {body}"
+        args = ", ".join(["%s"] * count)
+        self.execute_sql = f"EXECUTE {name} ({args})" if count else f"EXECUTE {name}"
+
+    def __repr__(self) -> str:
+        return f"PreparedStatement({self.name!r})"
+
+
+class PreparedStatementRegistry:
+    """Named statements plus the per-connection record of what is prepared"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._statements: Dict[str, PreparedStatement] = {}
+        self._prepared: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def register(self, name: str, text: str) -> PreparedStatement:
+        """Register ``text`` under ``name``; re-registering the same text is a no-op"""
+        if not name.isidentifier():
+            raise ValueError(f"Invalid prepared statement name: {name!r}")
+        with self._lock:
+            existing = self._statements.get(name)
+            if existing is not None:
+                if existing.text != text:
+                    raise ValueError(f"Prepared statement {name!r} is already registered with different SQL")
+                return existing
+            statement = PreparedStatement(name, text)
+            self._statements[name] = statement
+            self._stats[name] = {"executions": 0, "prepares": 0}
+            return statement
+
+    def get(self, name: str) -> Optional[PreparedStatement]:
+        return self._statements.get(name)
+
+    def execute(self, cur, statement: PreparedStatement, params: tuple = ()) -> None:
+        """Run ``statement`` on a psycopg2 cursor, preparing it on first use"""
+        conn = cur.connection
+        if self._checkout(conn, statement):
+            try:
+                cur.execute(statement.prepare_sql)
+            except Exception:
+                self._unmark(conn, statement)
+                raise
+            logger.debug(f"Prepared statement {statement.name}")
+        try:
+            cur.execute(statement.execute_sql, params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            # Something ran DEALLOCATE/DISCARD ALL behind our back
+            self.forget(conn)
+            raise
+
+    async def execute_async(self, cur, statement: PreparedStatement, params: tuple = ()) -> None:
+        """Run ``statement`` on a psycopg 3 cursor using the driver's own prepare"""
+        self._checkout(cur.connection, statement)
+        try:
+            await cur.execute(statement.text, params or None, prepare=True)
+        except psycopg.errors.InvalidSqlStatementName:
+            self.forget(cur.connection)
+            raise
+
+    def forget(self, conn) -> None:
+        """Drop the record of statements prepared on ``conn``"""
+        with self._lock:
+            self._prepared.pop(conn, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Executions, prepares and hit rate per statement"""
+        with self._lock:
+            report = {}
+            for name, counts in self._stats.items():
+                executions = counts["executions"]
+                hits = executions - counts["prepares"]
+                report[name] = {
+                    "executions": executions,
+                    "prepares": counts["prepares"],
+                    "hits": hits,
+                    "hit_rate": round(hits / executions, 3) if executions else None,
+                }
+            return report
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for counts in self._stats.values():
+                counts["executions"] = 0
+                counts["prepares"] = 0
+
+    def _unmark(self, conn, statement: PreparedStatement) -> None:
+        with self._lock:
+            self._prepared.get(conn, set()).discard(statement.name)
+
+    def _checkout(self, conn, statement: PreparedStatement) -> bool:
+        """Count an execution; return True if ``conn`` still has to prepare it"""
+        with self._lock:
+            names = self._prepared.get(conn)
+            if names is None:
+                names = self._prepared[conn] = set()
+            counts = self._stats[statement.name]
+            counts["executions"] += 1
+            if statement.name in names:
+                return False
+            names.add(statement.name)
+            counts["prepares"] += 1
+            return True
+
+
+registry = PreparedStatementRegistry()
+
+
+def prepared(name: str, text: str) -> PreparedStatement:
+    """Register a statement with the process-wide registry"""
+    return registry.register(name, text)
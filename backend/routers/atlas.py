@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-from database import DatabaseConnection
+from database import AsyncDatabaseConnection
 import db_pool
 import json
 
@@ -37,13 +37,13 @@ class JourneyResponse(BaseModel):
 
 
 def get_db():
-    return DatabaseConnection(db_pool.db_pool)
+    return AsyncDatabaseConnection(db_pool.async_db_pool)
 
 
 @router.get('/journeys', response_model=List[Journey])
-async def list_journeys(db: DatabaseConnection = Depends(get_db)):
+async def list_journeys(db: AsyncDatabaseConnection = Depends(get_db)):
     """Get all biblical journeys"""
-    rows = db.fetch_all(
+    rows = await db.fetch_all(
         """
         SELECT 
             journey_id AS id,
@@ -64,11 +64,11 @@ async def list_journeys(db: DatabaseConnection = Depends(get_db)):
 
 
 @router.get('/journeys/{journey_id}', response_model=JourneyResponse)
-async def get_journey(journey_id: int, db: DatabaseConnection = Depends(get_db)):
+async def get_journey(journey_id: int, db: AsyncDatabaseConnection = Depends(get_db)):
     """Get a specific journey with all its waypoints"""
     
     # Get journey details
-    journey_data = db.fetch_one(
+    journey_data = await db.fetch_one(
         """
         SELECT 
             journey_id AS id,
@@ -91,7 +91,7 @@ async def get_journey(journey_id: int, db: DatabaseConnection = Depends(get_db))
         raise HTTPException(status_code=404, detail="Journey not found")
     
     # Get waypoints
-    waypoints_data = db.fetch_all(
+    waypoints_data = await db.fetch_all(
         """
         SELECT 
             waypoint_id,
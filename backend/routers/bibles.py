@@ -13,10 +13,11 @@ ALTER TABLE users ADD COLUMN IF NOT EXISTS preferred_language VARCHAR(10) DEFAUL
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import logging
-from database import DatabaseConnection
+from database import AsyncDatabaseConnection
 import db_pool
 from services.api_bible import APIBibleService
 from config import Config
@@ -50,12 +51,12 @@ class AvailableBiblesResponse(BaseModel):
     cacheExpiry: str
 
 def get_db():
-    return DatabaseConnection(db_pool.db_pool)
+    return AsyncDatabaseConnection(db_pool.async_db_pool)
 
 @router.get("/available", response_model=AvailableBiblesResponse)
 async def get_available_bibles(
     language: Optional[str] = None,  # 3-letter ISO 639-3 code (e.g., "eng")
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Get available Bible versions and languages from API.Bible with caching"""
     logger.info(f"Getting available Bibles for language: {language}")
@@ -72,7 +73,7 @@ async def get_available_bibles(
     # Cache for 29 days to ensure it's removed before 30
     cache_expiry = datetime.now() - timedelta(days=29)
     
-    cached = db.fetch_one(cache_query, (cache_key, cache_expiry))
+    cached = await db.fetch_one(cache_query, (cache_key, cache_expiry))
     
     if cached:
         logger.info("Returning cached Bible data")
@@ -94,7 +95,7 @@ async def get_available_bibles(
         logger.info(f"API_BIBLE_KEY configured: {bool(Config.API_BIBLE_KEY)}")
         
         # Get all available Bibles (or filtered by language)
-        all_bibles = api_bible.get_available_bibles(language)
+        all_bibles = await run_in_threadpool(api_bible.get_available_bibles, language)
         logger.info(f"API.Bible returned {len(all_bibles)} bibles")
         
         # If no Bibles returned, this is likely an API key issue
@@ -147,10 +148,10 @@ async def get_available_bibles(
         }
         
         # Clear old cache entries
-        db.execute("DELETE FROM api_cache WHERE cache_key = %s", (cache_key,))
+        await db.execute("DELETE FROM api_cache WHERE cache_key = %s", (cache_key,))
         
         # Insert new cache
-        db.execute(
+        await db.execute(
             """
             INSERT INTO api_cache (cache_key, cache_data, created_at)
             VALUES (%s, %s, %s)
@@ -174,18 +175,18 @@ async def get_available_bibles(
         raise HTTPException(status_code=500, detail=f"Failed to fetch available Bibles: {str(e)}")
 
 @router.delete("/cache")
-async def clear_bible_cache(db: DatabaseConnection = Depends(get_db)):
+async def clear_bible_cache(db: AsyncDatabaseConnection = Depends(get_db)):
     """Clear the Bible cache"""
     logger.info("Clearing Bible cache")
     
-    db.execute("DELETE FROM api_cache WHERE cache_key LIKE 'bibles_available_%'")
+    await db.execute("DELETE FROM api_cache WHERE cache_key LIKE 'bibles_available_%'")
     
     return {"message": "Bible cache cleared"}
 
 @router.get("/bible/{bible_id}")
 async def get_bible_details(
     bible_id: str,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Get details for a specific Bible version"""
     logger.info(f"Getting details for Bible: {bible_id}")
@@ -200,7 +201,7 @@ async def get_bible_details(
     """
     
     cache_expiry = datetime.now() - timedelta(days=29)
-    cached = db.fetch_one(cache_query, (cache_key, cache_expiry))
+    cached = await db.fetch_one(cache_query, (cache_key, cache_expiry))
     
     if cached:
         logger.info("Returning cached Bible details")
@@ -212,13 +213,13 @@ async def get_bible_details(
         
         # This would need to be implemented in APIBibleService
         # For now, we'll get all Bibles and find the one
-        all_bibles = api_bible.get_available_bibles()
+        all_bibles = await run_in_threadpool(api_bible.get_available_bibles)
         
         for bible in all_bibles:
             if bible.get('id') == bible_id:
                 # Cache it
-                db.execute("DELETE FROM api_cache WHERE cache_key = %s", (cache_key,))
-                db.execute(
+                await db.execute("DELETE FROM api_cache WHERE cache_key = %s", (cache_key,))
+                await db.execute(
                     """
                     INSERT INTO api_cache (cache_key, cache_data, created_at)
                     VALUES (%s, %s, %s)
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends
 from typing import Dict, Any
-from database import DatabaseConnection
+from database import AsyncDatabaseConnection
 import db_pool
+import prepared_statements
+from services.verse_text_batcher import verse_text_batcher
+from services.verse_text_cache import verse_text_cache
 from utils.performance import get_performance_report, reset_performance_tracking
 import psutil
 import os
@@ -9,7 +12,7 @@ import os
 router = APIRouter(tags=["monitoring"])
 
 def get_db():
-    return DatabaseConnection(db_pool.db_pool)
+    return AsyncDatabaseConnection(db_pool.async_db_pool)
 
 @router.get("/performance/report")
 async def get_performance_metrics() -> Dict[str, Any]:
@@ -23,16 +26,42 @@ async def get_performance_metrics() -> Dict[str, Any]:
             "cpu_percent": process.cpu_percent(interval=0.1),
             "num_threads": process.num_threads(),
         },
+        "database_pool": _get_pool_stats(),
         "recommendations": _generate_recommendations(report)
     }
 
+@router.get("/pool")
+async def get_pool_metrics() -> Dict[str, Any]:
+    """Connection pool size, in-use counts and checkout wait times"""
+    stats = _get_pool_stats()
+    if stats is None:
+        return {"error": "Database pool not initialized"}
+    return stats
+
+@router.get("/prepared-statements")
+async def get_prepared_statement_metrics() -> Dict[str, Any]:
+    """Executions, PREPAREs and hit rate for each named prepared statement"""
+    return prepared_statements.registry.stats()
+
+@router.get("/verse-text-cache")
+async def get_verse_text_cache_metrics() -> Dict[str, Any]:
+    """Size, hit rates and evictions of the shared verse-text cache,
+    plus upstream fetches started and lookups coalesced onto them"""
+    return {**verse_text_cache.stats(), "batcher": verse_text_batcher.stats()}
+
 @router.post("/performance/reset")
 async def reset_performance_metrics():
     reset_performance_tracking()
+    prepared_statements.registry.reset_stats()
+    verse_text_cache.reset_stats()
+    if db_pool.db_pool is not None:
+        db_pool.db_pool.reset_stats()
+    if db_pool.async_db_pool is not None:
+        db_pool.async_db_pool.pop_stats()
     return {"message": "Performance tracking reset"}
 
 @router.get("/performance/slow-queries")
-async def get_slow_queries(threshold_ms: int = 100, db: DatabaseConnection = Depends(get_db)) -> Dict[str, Any]:
+async def get_slow_queries(threshold_ms: int = 100, db: AsyncDatabaseConnection = Depends(get_db)) -> Dict[str, Any]:
     query = """
         SELECT 
             query,
@@ -46,7 +75,7 @@ async def get_slow_queries(threshold_ms: int = 100, db: DatabaseConnection = Dep
         LIMIT 20
     """
     try:
-        slow_queries = db.fetch_all(query, (threshold_ms,))
+        slow_queries = await db.fetch_all(query, (threshold_ms,))
         return {
             "threshold_ms": threshold_ms,
             "slow_queries": slow_queries
@@ -57,6 +86,14 @@ async def get_slow_queries(threshold_ms: int = 100, db: DatabaseConnection = Dep
             "details": str(e)
         }
 
+def _get_pool_stats() -> Dict[str, Any] | None:
+    if db_pool.db_pool is None:
+        return None
+    stats = db_pool.db_pool.stats()
+    if db_pool.async_db_pool is not None:
+        stats["async"] = db_pool.async_db_pool.get_stats()
+    return stats
+
 def _generate_recommendations(report: Dict[str, Dict]) -> list:
     recommendations = []
     for method, stats in report.items():
@@ -1,11 +1,14 @@
 # backend/routers/user_verses.py
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import logging
 from datetime import datetime
-from database import DatabaseConnection
+from database import AsyncDatabaseConnection
 import db_pool
+from bible_books import books
+from verse_catalog import get_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +39,10 @@ class VerseTextsRequest(BaseModel):
 
 def get_db():
     """Dependency to get database connection"""
-    return DatabaseConnection(db_pool.db_pool)
+    return AsyncDatabaseConnection(db_pool.async_db_pool)
 
 @router.get("/{user_id}")
-async def get_user_verses(user_id: int, include_apocrypha: bool = False, db: DatabaseConnection = Depends(get_db)) -> List[UserVerseResponse]:
+async def get_user_verses(user_id: int, include_apocrypha: bool = False, db: AsyncDatabaseConnection = Depends(get_db)) -> List[UserVerseResponse]:
     """Get all verses memorized by user"""
     logger.info(f"Getting verses for user {user_id}, include_apocrypha={include_apocrypha}")
     
@@ -66,7 +69,7 @@ async def get_user_verses(user_id: int, include_apocrypha: bool = False, db: Dat
     
     query += " ORDER BY bv.book_id, bv.chapter_number, bv.verse_number"
     
-    verses = db.fetch_all(query, (user_id,))
+    verses = await db.fetch_all(query, (user_id,))
     
     result = []
     for v in verses:
@@ -94,24 +97,19 @@ async def save_verse(
     chapter_num: int,
     verse_num: int,
     verse_update: VerseUpdate,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Save or update a memorized verse using numerical IDs"""
     verse_code = f"{book_id}-{chapter_num}-{verse_num}"
     logger.info(f"Saving verse {verse_code} for user {user_id}")
     
     # Get verse ID from verse_code
-    verse = db.fetch_one(
-        "SELECT id FROM bible_verses WHERE verse_code = %s",
-        (verse_code,)
-    )
+    verse_id = get_catalog().id_for_code(verse_code)
     
-    if not verse:
+    if verse_id is None:
         logger.error(f"Verse {verse_code} not found")
         raise HTTPException(status_code=404, detail=f"Verse {verse_code} not found")
     
-    verse_id = verse['id']
-    
     # Upsert user verse
     query = """
         INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
@@ -123,7 +121,7 @@ async def save_verse(
             updated_at = CURRENT_TIMESTAMP
     """
     
-    db.execute(query, (
+    await db.execute(query, (
         user_id,
         verse_id,
         verse_update.practice_count,
@@ -139,21 +137,18 @@ async def delete_verse(
     book_id: int,
     chapter_num: int,
     verse_num: int,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Delete a memorized verse using numerical IDs"""
     verse_code = f"{book_id}-{chapter_num}-{verse_num}"
     logger.info(f"Deleting verse {verse_code} for user {user_id}")
     
     # Get verse ID from verse_code
-    verse = db.fetch_one(
-        "SELECT id FROM bible_verses WHERE verse_code = %s",
-        (verse_code,)
-    )
+    verse_id = get_catalog().id_for_code(verse_code)
     
-    if verse:
+    if verse_id is not None:
         query = "DELETE FROM user_verses WHERE user_id = %s AND verse_id = %s"
-        db.execute(query, (user_id, verse['id']))
+        await db.execute(query, (user_id, verse_id))
         logger.info(f"Verse {verse_code} deleted for user {user_id}")
     
     return {"message": "Verse deleted successfully"}
@@ -163,46 +158,39 @@ async def save_chapter(
     user_id: int,
     book_id: int,
     chapter_num: int,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Mark entire chapter as memorized"""
     logger.info(f"Saving chapter {book_id} {chapter_num} for user {user_id}")
     
-    # Get all verses in chapter
-    verses = db.fetch_all(
-        "SELECT id FROM bible_verses WHERE book_id = %s AND chapter_number = %s",
-        (book_id, chapter_num)
-    )
-    
-    if not verses:
-        raise HTTPException(status_code=404, detail="Chapter not found")
-    
-    # Insert all verses
-    params_list = [
-        (user_id, v['id'], 1, datetime.now().isoformat())
-        for v in verses
-    ]
-    
+    # Upsert straight from bible_verses: one round trip for the whole chapter
     query = """
-        INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (user_id, verse_id) DO UPDATE SET
-            practice_count = EXCLUDED.practice_count,
-            last_practiced = EXCLUDED.last_practiced,
-            updated_at = CURRENT_TIMESTAMP
+        WITH verses AS (
+            SELECT id FROM bible_verses WHERE book_id = %s AND chapter_number = %s
+        ), saved AS (
+            INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
+            SELECT %s, id, 1, NOW() FROM verses
+            ON CONFLICT (user_id, verse_id) DO UPDATE SET
+                practice_count = EXCLUDED.practice_count,
+                last_practiced = EXCLUDED.last_practiced,
+                updated_at = CURRENT_TIMESTAMP
+        )
+        SELECT COUNT(*) AS verses_count FROM verses
     """
+    row = await db.fetch_one(query, (book_id, chapter_num, user_id), commit=True)
     
-    db.execute_many(query, params_list)
+    if not row["verses_count"]:
+        raise HTTPException(status_code=404, detail="Chapter not found")
     
-    logger.info(f"Saved {len(verses)} verses for chapter {book_id} {chapter_num}")
-    return {"message": f"Chapter saved successfully", "verses_count": len(verses)}
+    logger.info(f"Saved {row['verses_count']} verses for chapter {book_id} {chapter_num}")
+    return {"message": f"Chapter saved successfully", "verses_count": row["verses_count"]}
 
 @router.delete("/{user_id}/chapters/{book_id:int}/{chapter_num}")
 async def clear_chapter(
     user_id: int,
     book_id: int,
     chapter_num: int,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Clear all memorized verses in a chapter"""
     logger.info(f"Clearing chapter {book_id} {chapter_num} for user {user_id}")
@@ -216,7 +204,7 @@ async def clear_chapter(
         )
     """
     
-    db.execute(query, (user_id, book_id, chapter_num))
+    await db.execute(query, (user_id, book_id, chapter_num))
     logger.info(f"Cleared chapter {book_id} {chapter_num} for user {user_id}")
     return {"message": "Chapter cleared successfully"}
 
@@ -224,45 +212,38 @@ async def clear_chapter(
 async def save_book(
     user_id: int,
     book_id: int,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Mark entire book as memorized"""
     logger.info(f"Saving book {book_id} for user {user_id}")
     
-    # Get all verses in book
-    verses = db.fetch_all(
-        "SELECT id FROM bible_verses WHERE book_id = %s",
-        (book_id,)
-    )
-    
-    if not verses:
-        raise HTTPException(status_code=404, detail="Book not found")
-    
-    # Insert all verses
-    params_list = [
-        (user_id, v['id'], 1, datetime.now().isoformat())
-        for v in verses
-    ]
-    
+    # Upsert straight from bible_verses: one round trip for the whole book
     query = """
-        INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (user_id, verse_id) DO UPDATE SET
-            practice_count = EXCLUDED.practice_count,
-            last_practiced = EXCLUDED.last_practiced,
-            updated_at = CURRENT_TIMESTAMP
+        WITH verses AS (
+            SELECT id FROM bible_verses WHERE book_id = %s
+        ), saved AS (
+            INSERT INTO user_verses (user_id, verse_id, practice_count, last_practiced)
+            SELECT %s, id, 1, NOW() FROM verses
+            ON CONFLICT (user_id, verse_id) DO UPDATE SET
+                practice_count = EXCLUDED.practice_count,
+                last_practiced = EXCLUDED.last_practiced,
+                updated_at = CURRENT_TIMESTAMP
+        )
+        SELECT COUNT(*) AS verses_count FROM verses
     """
+    row = await db.fetch_one(query, (book_id, user_id), commit=True)
     
-    db.execute_many(query, params_list)
+    if not row["verses_count"]:
+        raise HTTPException(status_code=404, detail="Book not found")
     
-    logger.info(f"Saved {len(verses)} verses for book {book_id}")
-    return {"message": f"Book saved successfully", "verses_count": len(verses)}
+    logger.info(f"Saved {row['verses_count']} verses for book {book_id}")
+    return {"message": f"Book saved successfully", "verses_count": row["verses_count"]}
 
 @router.delete("/{user_id}/books/{book_id:int}")
 async def clear_book(
     user_id: int,
     book_id: int,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ):
     """Clear all memorized verses in a book"""
     logger.info(f"Clearing book {book_id} for user {user_id}")
@@ -276,7 +257,7 @@ async def clear_book(
         )
     """
     
-    db.execute(query, (user_id, book_id))
+    await db.execute(query, (user_id, book_id))
     logger.info(f"Cleared book {book_id} for user {user_id}")
     return {"message": "Book cleared successfully"}
 
@@ -284,11 +265,11 @@ async def clear_book(
 async def get_verse_texts(
     user_id: int,
     request: VerseTextsRequest,
-    db: DatabaseConnection = Depends(get_db)
+    db: AsyncDatabaseConnection = Depends(get_db)
 ) -> Dict[str, str]:
     """Get verse texts using the user's preferred provider"""
-    from services.api_bible import APIBibleService
     from services.esv_api import ESVService, ESVRateLimitError
+    from services.verse_text_batcher import verse_text_batcher
     from config import Config
 
     verse_codes = request.verse_codes
@@ -299,7 +280,7 @@ async def get_verse_texts(
     )
 
     # Determine provider from user settings
-    user_pref = db.fetch_one(
+    user_pref = await db.fetch_one(
         "SELECT use_esv_api, esv_api_token FROM users WHERE user_id = %s",
         (user_id,),
     )
@@ -309,25 +290,13 @@ async def get_verse_texts(
     try:
         if use_esv and esv_token:
             logger.info("Using ESV API for verse texts")
-            # Get verse references
-            refs_query = """
-                SELECT bv.verse_code, bb.book_name, bv.chapter_number, bv.verse_number
-                FROM bible_verses bv
-                JOIN bible_books bb ON bv.book_id = bb.book_id
-                WHERE bv.verse_code = ANY(%s)
-            """
-            refs = db.fetch_all(refs_query, (verse_codes,))
-            ref_map = {
-                r["verse_code"]: f"{r['book_name']} {r['chapter_number']}:{r['verse_number']}"
-                for r in refs
-            }
+            ref_map = books.references(verse_codes)
 
             esv = ESVService(esv_token)
-            verse_texts = esv.get_verses_batch(ref_map)
+            verse_texts = await run_in_threadpool(esv.get_verses_batch, ref_map)
         else:
             logger.info("Using API.Bible for verse texts")
-            api_bible = APIBibleService(Config.API_BIBLE_KEY, bible_id)
-            verse_texts = api_bible.get_verses_batch(verse_codes, bible_id)
+            verse_texts = await verse_text_batcher.get_verse_texts(verse_codes, bible_id)
 
         logger.info(f"Successfully retrieved {len(verse_texts)} verse texts")
         # Ensure all requested codes are present
@@ -350,7 +319,7 @@ async def update_confidence(
     user_id: int,
     verse_id: int,
     update: ConfidenceUpdate,
-    db: DatabaseConnection = Depends(get_db),
+    db: AsyncDatabaseConnection = Depends(get_db),
 ):
     """Update a user's confidence score for a verse."""
     logger.info(
@@ -367,7 +336,7 @@ async def update_confidence(
             review_count = user_verse_confidence.review_count + 1
     """
 
-    db.execute(
+    await db.execute(
         query,
         (
             user_id,
@@ -382,14 +351,14 @@ async def update_confidence(
 
 @router.delete("/{user_id}")
 async def clear_user_memorization(
-    user_id: int, db: DatabaseConnection = Depends(get_db)
+    user_id: int, db: AsyncDatabaseConnection = Depends(get_db)
 ) -> dict:
     """Remove all memorization data for a user."""
     logger.info(f"Clearing memorization data for user {user_id}")
 
     try:
-        db.execute("DELETE FROM user_verse_confidence WHERE user_id = %s", (user_id,))
-        db.execute("DELETE FROM user_verses WHERE user_id = %s", (user_id,))
+        await db.execute("DELETE FROM user_verse_confidence WHERE user_id = %s", (user_id,))
+        await db.execute("DELETE FROM user_verses WHERE user_id = %s", (user_id,))
         logger.info(f"Memorization data cleared for user {user_id}")
         return {"message": "Memorization data cleared"}
     except Exception as e:
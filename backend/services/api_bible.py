@@ -7,33 +7,63 @@ import json
 import os
 from collections import defaultdict
 
+from bible_books import books
+from services.upstream_http import upstream
+from services.verse_text_cache import verse_text_cache
+
 logger = logging.getLogger(__name__)
 
+
+def split_chapter_content(content: List[Dict], chapter_id: str) -> Dict[int, str]:
+    """Split API.Bible JSON chapter content into {verse_number: text}
+    
+    Text nodes are attributed to a verse by their ``verseId`` attribute
+    (``"JHN.3.16"``).  Verse-number tags, and nodes outside ``chapter_id``,
+    are skipped.  A verse whose text is split across paragraphs (poetry
+    lines such as ``q1``/``q2``) is joined back together in order, with a
+    space at each paragraph boundary; fragments within a paragraph are
+    concatenated as-is, since inline tags may split a word.
+    """
+    prefix = f"{chapter_id}."
+    parts = defaultdict(list)
+    last_para = {}
+    para = 0
+    
+    def walk(nodes):
+        nonlocal para
+        for node in nodes:
+            if node.get("type") == "tag":
+                if node.get("name") == "para":
+                    para += 1
+                if node.get("name") != "verse":
+                    walk(node.get("items", []))
+                continue
+            verse_id = node.get("attrs", {}).get("verseId", "")
+            text = node.get("text")
+            if text and verse_id.startswith(prefix):
+                try:
+                    verse_num = int(verse_id[len(prefix):])
+                except ValueError:
+                    continue
+                if last_para.get(verse_num, para) != para:
+                    parts[verse_num].append(" ")
+                last_para[verse_num] = para
+                parts[verse_num].append(text)
+    
+    walk(content)
+    return {
+        verse_num: " ".join("".join(texts).split())
+        for verse_num, texts in parts.items()
+    }
+
+
 class APIBibleService:
     """Service for interacting with API.Bible - Hybrid approach"""
     
     BASE_URL = os.getenv("API_BIBLE_HOST")
     
     # Book ID mapping from numeric to API.Bible format
-    BOOK_ID_MAP = {
-        1: "GEN", 2: "EXO", 3: "LEV", 4: "NUM", 5: "DEU",
-        6: "JOS", 7: "JDG", 8: "RUT", 9: "1SA", 10: "2SA",
-        11: "1KI", 12: "2KI", 13: "1CH", 14: "2CH", 15: "EZR",
-        16: "NEH", 17: "EST", 18: "JOB", 19: "PSA", 20: "PRO",
-        21: "ECC", 22: "SNG", 23: "ISA", 24: "JER", 25: "LAM",
-        26: "EZK", 27: "DAN", 28: "HOS", 29: "JOL", 30: "AMO",
-        31: "OBA", 32: "JON", 33: "MIC", 34: "NAM", 35: "HAB",
-        36: "ZEP", 37: "HAG", 38: "ZEC", 39: "MAL", 40: "MAT",
-        41: "MRK", 42: "LUK", 43: "JHN", 44: "ACT", 45: "ROM",
-        46: "1CO", 47: "2CO", 48: "GAL", 49: "EPH", 50: "PHP",
-        51: "COL", 52: "1TH", 53: "2TH", 54: "1TI", 55: "2TI",
-        56: "TIT", 57: "PHM", 58: "HEB", 59: "JAS", 60: "1PE",
-        61: "2PE", 62: "1JN", 63: "2JN", 64: "3JN", 65: "JUD",
-        66: "REV",
-        # Apocryphal books
-        67: "TOB", 68: "JDT", 69: "1MA", 70: "2MA", 71: "WIS",
-        72: "SIR", 73: "BAR", 74: "1ES", 75: "3MA", 76: "MAN"
-    }
+    BOOK_ID_MAP = {book.book_id: book.code for book in books}
     
     def __init__(self, api_key: str, default_bible_id: str):
         self.api_key = api_key
@@ -42,7 +72,7 @@ class APIBibleService:
             "api-key": api_key,
             "accept": "application/json"
         }
-        self._cache = {}
+        self._cache = verse_text_cache
         logger.info(f"APIBibleService initialized with Bible ID: {default_bible_id}")
     
     def convert_verse_code(self, verse_code: str) -> tuple:
@@ -62,84 +92,75 @@ class APIBibleService:
         return book_code, chapter, verse
     
     def get_verses_batch(self, verse_codes: List[str], bible_id: Optional[str] = None) -> Dict[str, str]:
-        """Get multiple verse texts with smart batching"""
+        """Get multiple verse texts, fetching each uncached chapter once"""
         bible_id = bible_id or self.default_bible_id
         results = {}
         
         logger.info(f"Fetching {len(verse_codes)} verses in batch")
         
-        # Group verses by book and chapter
-        verse_groups = defaultdict(lambda: defaultdict(list))
+        # Shared cache first (memory, then the persistent tier)
+        results.update(self._cache.get_many(bible_id, verse_codes))
+        
+        # Group uncached verses by book and chapter
+        verse_groups = defaultdict(list)
         
         for code in verse_codes:
+            if code in results:
+                continue
             try:
                 book_code, chapter, verse = self.convert_verse_code(code)
-                verse_groups[book_code][chapter].append((verse, code))
+                verse_groups[(book_code, chapter)].append((verse, code))
             except ValueError as e:
                 logger.error(f"Invalid verse code {code}: {e}")
                 results[code] = ""
         
-        # Process each chapter group
-        for book_code, chapters in verse_groups.items():
-            for chapter, verse_list in chapters.items():
-                verse_list.sort(key=lambda x: x[0])
-                
-                # Check cache first
-                uncached_verses = []
-                for verse_num, original_code in verse_list:
-                    cache_key = f"{bible_id}:{book_code}.{chapter}.{verse_num}"
-                    if cache_key in self._cache:
-                        results[original_code] = self._cache[cache_key]
-                    else:
-                        uncached_verses.append((verse_num, original_code))
-                
-                if not uncached_verses:
-                    continue  # All verses were cached
-                
-                # Group consecutive verses into ranges
-                ranges = self._group_consecutive_verses(uncached_verses)
-                
-                # Fetch each range
-                for range_verses in ranges:
-                    if len(range_verses) == 1:
-                        # Single verse
-                        verse_num, original_code = range_verses[0]
-                        text = self._fetch_single_verse(bible_id, book_code, chapter, verse_num)
-                        results[original_code] = text or ""
-                    else:
-                        # Multiple verses - fetch as small passage
-                        verse_texts = self._fetch_verse_range(bible_id, book_code, chapter, range_verses)
-                        for verse_num, original_code in range_verses:
-                            results[original_code] = verse_texts.get(verse_num, "")
+        # One upstream call per chapter, chapters fetched in parallel.  Every
+        # verse of a chapter is cached, not just the requested ones, so
+        # neighbouring verses are free next time
+        groups = list(verse_groups.items())
+        fetched_groups = upstream.map(
+            lambda group: self._fetch_group(bible_id, group[0][0], group[0][1], group[1]),
+            groups,
+        )
+        
+        for ((book_code, chapter), verse_list), (chapter_texts, fetched) in zip(groups, fetched_groups):
+            if chapter_texts:
+                book_num = verse_list[0][1].split('-', 1)[0]
+                self._cache.put_many(bible_id, {
+                    f"{book_num}-{chapter}-{verse_num}": text
+                    for verse_num, text in chapter_texts.items()
+                })
+            else:
+                self._cache.put_many(bible_id, fetched)
+            results.update(fetched)
         
         # Log summary
         successful = sum(1 for v in results.values() if v)
-        logger.info(f"Batch complete: {successful}/{len(verse_codes)} verses retrieved")
+        logger.info(f"Batch complete: {successful}/{len(verse_codes)} verses retrieved "
+                    f"({len(verse_groups)} chapters fetched)")
         
         return results
     
-    def _group_consecutive_verses(self, verses: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
-        """Group consecutive verses into ranges for efficient fetching"""
-        if not verses:
-            return []
+    def _fetch_group(self, bible_id: str, book_code: str, chapter: int,
+                     verse_list: List[Tuple[int, str]]) -> Tuple[Dict[int, str], Dict[str, str]]:
+        """Fetch one chapter group; runs on the upstream thread pool
         
-        ranges = []
-        current_range = [verses[0]]
+        Returns the whole chapter's texts ({} if the chapter request failed)
+        and the texts of the requested verse codes.  When the chapter request
+        fails, only the requested verses are fetched one by one.
+        """
+        chapter_texts = self._fetch_chapter(bible_id, book_code, chapter)
+        if chapter_texts:
+            return chapter_texts, {
+                original_code: chapter_texts.get(verse_num, "")
+                for verse_num, original_code in verse_list
+            }
         
-        for i in range(1, len(verses)):
-            verse_num, code = verses[i]
-            prev_verse_num = verses[i-1][0]
-            
-            # If consecutive, add to current range
-            if verse_num == prev_verse_num + 1:
-                current_range.append(verses[i])
-            else:
-                # Start new range
-                ranges.append(current_range)
-                current_range = [verses[i]]
-        
-        ranges.append(current_range)
-        return ranges
+        fetched = {}
+        for verse_num, original_code in verse_list:
+            text = self._fetch_single_verse(bible_id, book_code, chapter, verse_num)
+            fetched[original_code] = text or ""
+        return {}, fetched
     
     def _fetch_single_verse(self, bible_id: str, book_code: str, chapter: int, verse: int) -> Optional[str]:
         """Fetch a single verse"""
@@ -147,7 +168,7 @@ class APIBibleService:
             reference = f"{book_code}.{chapter}.{verse}"
             url = f"{self.BASE_URL}/bibles/{bible_id}/verses/{reference}"
             
-            response = requests.get(url, headers=self.headers, params={
+            response = upstream.get(url, headers=self.headers, params={
                 "content-type": "text",
                 "include-notes": "false",
                 "include-titles": "false",
@@ -160,9 +181,6 @@ class APIBibleService:
                 text = data.get("data", {}).get("content", "").strip()
                 
                 if text:
-                    # Cache it
-                    cache_key = f"{bible_id}:{reference}"
-                    self._cache[cache_key] = text
                     logger.debug(f"Fetched verse {reference}")
                 
                 return text
@@ -174,74 +192,42 @@ class APIBibleService:
             logger.error(f"Error fetching verse {book_code}.{chapter}.{verse}: {e}")
             return None
     
-    def _fetch_verse_range(self, bible_id: str, book_code: str, chapter: int, 
-                          verses: List[Tuple[int, str]]) -> Dict[int, str]:
-        """Fetch a range of verses as a passage"""
+    def _fetch_chapter(self, bible_id: str, book_code: str, chapter: int) -> Dict[int, str]:
+        """Fetch a whole chapter and split it into {verse_number: text}
+        
+        The chapter is requested as JSON content, where every text node
+        carries the ``verseId`` ("JHN.3.16") it belongs to, so verses are
+        split on those markers rather than on punctuation.  Returns an
+        empty dict on failure.
+        """
+        chapter_id = f"{book_code}.{chapter}"
         try:
-            min_verse = verses[0][0]
-            max_verse = verses[-1][0]
-            
-            # For ranges larger than 10 verses, fetch individually (more reliable)
-            if max_verse - min_verse + 1 > 10:
-                logger.info(f"Range too large ({max_verse - min_verse + 1} verses), fetching individually")
-                result = {}
-                for verse_num, _ in verses:
-                    text = self._fetch_single_verse(bible_id, book_code, chapter, verse_num)
-                    result[verse_num] = text or ""
-                return result
-            
-            # Fetch as passage
-            passage_ref = f"{book_code}.{chapter}.{min_verse}-{book_code}.{chapter}.{max_verse}"
-            url = f"{self.BASE_URL}/bibles/{bible_id}/passages/{passage_ref}"
+            url = f"{self.BASE_URL}/bibles/{bible_id}/chapters/{chapter_id}"
             
-            logger.info(f"Fetching passage: {passage_ref}")
+            logger.info(f"Fetching chapter: {chapter_id}")
             
-            response = requests.get(url, headers=self.headers, params={
-                "content-type": "text",
+            response = upstream.get(url, headers=self.headers, params={
+                "content-type": "json",
                 "include-notes": "false",
                 "include-titles": "false",
                 "include-chapter-numbers": "false",
-                "include-verse-numbers": "false"
+                "include-verse-numbers": "false",
+                "include-verse-spans": "false"
             })
             
-            if response.status_code == 200:
-                data = response.json()
-                content = data.get("data", {}).get("content", "").strip()
-                
-                # For now, we'll split the content evenly among verses
-                # This is not perfect but works for consecutive verses
-                if content and len(verses) > 0:
-                    # Try to split by common verse separators
-                    parts = content.split('.')
-                    
-                    # Simple distribution - not perfect but functional
-                    verse_texts = {}
-                    if len(parts) >= len(verses):
-                        for i, (verse_num, _) in enumerate(verses):
-                            if i < len(parts):
-                                text = parts[i].strip() + '.'
-                                verse_texts[verse_num] = text
-                                
-                                # Cache it
-                                cache_key = f"{bible_id}:{book_code}.{chapter}.{verse_num}"
-                                self._cache[cache_key] = text
-                    else:
-                        # Fallback: give entire content to first verse
-                        verse_texts[verses[0][0]] = content
-                    
-                    return verse_texts
-            else:
-                logger.error(f"Failed to fetch passage {passage_ref}: {response.status_code}")
-                
+            if response.status_code != 200:
+                logger.error(f"Failed to fetch chapter {chapter_id}: {response.status_code}")
+                return {}
+            
+            content = response.json().get("data", {}).get("content", [])
+            verse_texts = split_chapter_content(content, chapter_id)
+            if not verse_texts:
+                logger.warning(f"No verse markers found in chapter {chapter_id}")
+            return verse_texts
+            
         except Exception as e:
-            logger.error(f"Error fetching verse range: {e}")
-        
-        # Fallback: fetch individually
-        result = {}
-        for verse_num, _ in verses:
-            text = self._fetch_single_verse(bible_id, book_code, chapter, verse_num)
-            result[verse_num] = text or ""
-        return result
+            logger.error(f"Error fetching chapter {chapter_id}: {e}")
+            return {}
     
     @lru_cache(maxsize=1000)
     def get_verse_text(self, verse_code: str, bible_id: Optional[str] = None) -> Optional[str]:
@@ -261,7 +247,7 @@ class APIBibleService:
             logger.info(f"Fetching bibles from {url} with params: {params}")
             logger.info(f"Using API key: {self.api_key[:10]}..." if self.api_key else "NO API KEY SET")
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = upstream.get(url, headers=self.headers, params=params)
             
             logger.info(f"API.Bible response status: {response.status_code}")
             
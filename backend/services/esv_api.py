@@ -1,12 +1,13 @@
-import json
 import logging
+import math
 import re
+import threading
 import time
-from collections import OrderedDict
-from pathlib import Path
-from typing import Dict, Tuple, Set
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
-import requests
+from bible_books import books
+from services.upstream_http import upstream
 
 
 class ESVRateLimitError(Exception):
@@ -20,148 +21,231 @@ logger = logging.getLogger(__name__)
 
 
 class VerseCache:
-    """LRU cache with a hard limit of 500 verses and half-book caps."""
+    """LRU cache with a hard limit of 500 verses and half-book caps.
+
+    Entries are keyed by ESV verse id (``BBCCCVVV``, see ``esv_verse_id``),
+    so book and chapter come from integer arithmetic instead of parsing
+    display references.  ``entries`` is the verse LRU; ``expiry`` is a FIFO
+    of ``(expires_at, verse_id)`` in insertion order, which is also expiry
+    order because every entry has the same TTL, so expired entries are
+    dropped from its head.  Each book keeps an LRU of its cached chapters and
+    never holds more than half of them (ESV license terms).  ``get`` and
+    ``set`` are amortized O(1) and thread-safe: the cache is shared by request
+    threads and the deferred-retry timer.
+    """
 
     def __init__(self, max_size: int = 500, ttl: int = 60 * 60 * 24):
         self.max_size = max_size
         self.ttl = ttl
-        self.cache: "OrderedDict[str, tuple[str, float, str, int]]" = OrderedDict()
-        # Track per book -> OrderedDict of chapter -> None for LRU eviction
-        self.book_chapter_lru: Dict[str, OrderedDict[int, None]] = {}
-        # Mapping of (book, chapter) -> set of verse references stored
-        self.chapter_refs: Dict[Tuple[str, int], Set[str]] = {}
-        # Book -> chapter cache limit (half the number of chapters)
+        # verse id -> (text, expires_at), least recently used first
+        self.entries: "OrderedDict[int, Tuple[str, float]]" = OrderedDict()
+        self.expiry: Deque[Tuple[float, int]] = deque()
+        # book id -> chapter -> verse ids cached in it, least recently used chapter first
+        self.book_chapters: Dict[int, "OrderedDict[int, Set[int]]"] = {}
+        # Book id -> chapter cache limit (half the number of chapters)
         self.book_limits = self._load_book_limits()
+        self._lock = threading.Lock()
 
-    def _load_book_limits(self) -> Dict[str, int]:
-        """Load half-book chapter limits from bible_base_data.json."""
-        limits: Dict[str, int] = {}
-        try:
-            # Try multiple paths to find the file
-            possible_paths = [
-                Path(__file__).resolve().parents[1] / "bible_base_data.json",  # In Docker container
-                Path(__file__).resolve().parents[2] / "sql_setup" / "bible_base_data.json",  # Development
-            ]
-            
-            path = None
-            for p in possible_paths:
-                if p.exists():
-                    path = p
-                    break
-            
-            if not path:
-                raise FileNotFoundError(f"bible_base_data.json not found in any of: {possible_paths}")
-                
-            with open(path) as f:
-                data = json.load(f)
-            for book in data.get("books", []):
-                chapters = book.get("chapters", [])
-                limits[book.get("name")] = len(chapters) // 2
-        except Exception as e:
-            logger.error("Failed to load book chapter counts: %s", e)
-        return limits
+    def __len__(self) -> int:
+        return len(self.entries)
 
-    def _parse_book_chapter(self, reference: str) -> Tuple[str, int]:
-        """Return the book name and chapter number for a reference."""
-        try:
-            book_part, rest = reference.rsplit(" ", 1)
-            chapter_str = rest.split(":", 1)[0]
-            return book_part, int(chapter_str)
-        except Exception:
-            return reference, 0
+    def _load_book_limits(self) -> Dict[int, int]:
+        """Half-book chapter limits from the shared book registry."""
+        return {book.book_id: book.chapter_count // 2 for book in books}
 
-    def _evict(self, reference: str) -> None:
+    def _evict(self, verse_id: int) -> None:
         """Remove a single verse from the cache."""
-        text, ts, book, chapter = self.cache.pop(reference)
-        refs = self.chapter_refs.get((book, chapter))
-        if refs:
-            refs.discard(reference)
-            if not refs:
-                self.chapter_refs.pop((book, chapter), None)
-                lru = self.book_chapter_lru.get(book)
-                if lru and chapter in lru:
-                    lru.pop(chapter, None)
-
-    def _evict_chapter(self, book: str, chapter: int) -> None:
-        """Evict all verses for a given chapter."""
-        refs = list(self.chapter_refs.get((book, chapter), []))
-        for ref in refs:
-            if ref in self.cache:
-                self._evict(ref)
-
-    def _prune_expired(self) -> None:
-        now = time.time()
-        to_remove = [ref for ref, (_, ts, _, _) in self.cache.items() if now - ts > self.ttl]
-        for ref in to_remove:
-            self._evict(ref)
-
-    def get(self, reference: str) -> str | None:
-        self._prune_expired()
-        entry = self.cache.get(reference)
-        if not entry:
-            return None
-        text, ts, book, chapter = entry
-        if time.time() - ts > self.ttl:
-            self._evict(reference)
+        if self.entries.pop(verse_id, None) is None:
+            return
+        book, chapter = divmod(verse_id // 1_000, 1_000)
+        chapters = self.book_chapters.get(book)
+        verses = chapters.get(chapter) if chapters else None
+        if verses is not None:
+            verses.discard(verse_id)
+            if not verses:
+                del chapters[chapter]
+
+    def _prune_expired(self, now: float) -> None:
+        expiry = self.expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, verse_id = expiry.popleft()
+            entry = self.entries.get(verse_id)
+            # Skip stale records of entries evicted (or re-added) since
+            if entry is not None and entry[1] == expires_at:
+                self._evict(verse_id)
+        # Evictions leave stale records behind; compact once they dominate
+        if len(expiry) > 2 * len(self.entries) + 64:
+            self.expiry = deque(
+                (expires_at, verse_id) for expires_at, verse_id in expiry
+                if (entry := self.entries.get(verse_id)) is not None and entry[1] == expires_at
+            )
+
+    def _touch_chapter(self, book: int, chapter: int) -> None:
+        chapters = self.book_chapters.get(book)
+        if chapters is not None and chapter in chapters:
+            chapters.move_to_end(chapter)
+
+    def _get(self, verse_id: int) -> Optional[str]:
+        self._prune_expired(time.time())
+        entry = self.entries.get(verse_id)
+        if entry is None:
             return None
-        self.cache.move_to_end(reference)
-        lru = self.book_chapter_lru.setdefault(book, OrderedDict())
-        if chapter in lru:
-            lru.move_to_end(chapter)
-        return text
-
-    def set(self, reference: str, text: str) -> None:
-        self._prune_expired()
-        book, chapter = self._parse_book_chapter(reference)
+        self.entries.move_to_end(verse_id)
+        self._touch_chapter(*divmod(verse_id // 1_000, 1_000))
+        return entry[0]
+
+    def _set(self, verse_id: int, text: str) -> None:
+        now = time.time()
+        self._prune_expired(now)
+        book, chapter = divmod(verse_id // 1_000, 1_000)
         limit = self.book_limits.get(book, self.max_size)
         if limit <= 0:
             return
 
-        if reference in self.cache:
-            self.cache.move_to_end(reference)
-            lru = self.book_chapter_lru.setdefault(book, OrderedDict())
-            if chapter in lru:
-                lru.move_to_end(chapter)
+        if verse_id in self.entries:
+            self.entries.move_to_end(verse_id)
+            self._touch_chapter(book, chapter)
             return
 
-        while len(self.cache) >= self.max_size:
-            self._evict(next(iter(self.cache)))
+        while len(self.entries) >= self.max_size:
+            self._evict(next(iter(self.entries)))
 
-        self.cache[reference] = (text, time.time(), book, chapter)
-        refs = self.chapter_refs.setdefault((book, chapter), set())
-        refs.add(reference)
+        expires_at = now + self.ttl
+        self.entries[verse_id] = (text, expires_at)
+        self.expiry.append((expires_at, verse_id))
 
-        lru = self.book_chapter_lru.setdefault(book, OrderedDict())
-        if chapter in lru:
-            lru.move_to_end(chapter)
+        chapters = self.book_chapters.setdefault(book, OrderedDict())
+        verses = chapters.get(chapter)
+        if verses is None:
+            chapters[chapter] = {verse_id}
         else:
-            lru[chapter] = None
+            verses.add(verse_id)
+            chapters.move_to_end(chapter)
+
+        while len(chapters) > limit:
+            _, old_verses = chapters.popitem(last=False)
+            for old_id in old_verses:
+                self.entries.pop(old_id, None)
+
+    def get(self, verse_id: int) -> Optional[str]:
+        with self._lock:
+            return self._get(verse_id)
+
+    def set(self, verse_id: int, text: str) -> None:
+        with self._lock:
+            self._set(verse_id, text)
+
+
+class TokenBucket:
+    """Token bucket allowing ``capacity`` requests per ``period`` seconds."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class ESVRateLimiter:
+    """Shared limiter for one ESV API token.
+
+    Enforces the ESV quotas (60 requests a minute, 1,000 an hour, 5,000 a
+    day) with one token bucket per window, honours the retry delay of a 429
+    response, and holds references that could not be fetched because of
+    throttling until they can be retried.  One limiter exists per token and
+    is shared by every ``ESVService`` using that token.
+    """
+
+    QUOTAS = ((60, 60.0), (1000, 60.0 * 60), (5000, 60.0 * 60 * 24))
+    MAX_DEFERRED = 500
+
+    _limiters: Dict[str, "ESVRateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, quotas: Tuple[Tuple[int, float], ...] = QUOTAS):
+        self.buckets = [TokenBucket(capacity, period) for capacity, period in quotas]
+        self.blocked_until = 0.0
+        self.deferred: "OrderedDict[str, str]" = OrderedDict()
+        self.retry_timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_token(cls, token: str) -> "ESVRateLimiter":
+        with cls._registry_lock:
+            limiter = cls._limiters.get(token)
+            if limiter is None:
+                limiter = cls._limiters[token] = cls()
+            return limiter
+
+    def acquire(self) -> float:
+        """Take one request slot; returns 0, or the seconds to wait if none is free."""
+        with self.lock:
+            now = time.monotonic()
+            wait = max([self.blocked_until - now] + [b.wait_time(now) for b in self.buckets])
+            if wait > 0:
+                return wait
+            for bucket in self.buckets:
+                bucket.tokens -= 1
+            return 0.0
+
+    def block(self, seconds: float) -> None:
+        """Stop all requests for ``seconds`` (after a 429)."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def defer(self, references: Dict[str, str]) -> None:
+        """Queue verse code -> reference pairs for a later retry."""
+        with self.lock:
+            for code, ref in references.items():
+                if len(self.deferred) >= self.MAX_DEFERRED:
+                    break
+                self.deferred[code] = ref
 
-        while len(lru) > limit:
-            old_chap, _ = lru.popitem(last=False)
-            self._evict_chapter(book, old_chap)
+    def take_deferred(self) -> Dict[str, str]:
+        with self.lock:
+            deferred, self.deferred = dict(self.deferred), OrderedDict()
+            self.retry_timer = None
+            return deferred
 
+    def schedule_retry(self, delay: float, callback) -> None:
+        """Run ``callback`` once after ``delay`` seconds unless already scheduled."""
+        with self.lock:
+            if self.retry_timer is not None or not self.deferred:
+                return
+            self.retry_timer = threading.Timer(delay, callback)
+            self.retry_timer.daemon = True
+            self.retry_timer.start()
 
 
 class ESVService:
-    """Simple wrapper around the ESV API"""
+    """Wrapper around the ESV API.
+
+    Uncached references are merged into multi-passage queries (``q`` takes
+    references separated by ``;``), so a deck costs one request per
+    ``MAX_REFS_PER_QUERY`` verses.  Requests go through the token's shared
+    ``ESVRateLimiter``; when it is exhausted the remaining references are
+    deferred, fetched in the background once the limit allows, and
+    ``ESVRateLimitError`` tells the caller how long to wait.
+    """
 
     BASE_URL = "https://api.esv.org/v3/passage/text/"
+    MAX_REFS_PER_QUERY = 50
 
     _cache = VerseCache()
 
     def __init__(self, token: str):
         self.token = token
         self.headers = {"Authorization": f"Token {token}"}
-        # Track when the next request is allowed
-        self._next_allowed_time = 0.0
-
-    def _check_rate_limit(self) -> None:
-        """Raise if we are still within the throttle period."""
-        now = time.time()
-        if now < self._next_allowed_time:
-            wait = int(self._next_allowed_time - now)
-            raise ESVRateLimitError(wait)
+        self.limiter = ESVRateLimiter.for_token(token)
 
     def _parse_retry_after(self, detail: str) -> int:
         """Parse the retry delay from the API's error message."""
@@ -171,51 +255,135 @@ class ESVService:
         return 1
 
     def get_verse_text(self, reference: str) -> str:
-        cached = self._cache.get(reference)
-        if cached is not None:
-            return cached
+        return self.get_verses_batch({reference: reference}).get(reference, "")
+
+    def get_verses_batch(self, references: Dict[str, str]) -> Dict[str, str]:
+        """Fetch verse texts for ``{verse_code: reference}``, respecting rate limits."""
+        results: Dict[str, str] = {}
+        missing: Dict[str, str] = {}
+        for code, ref in references.items():
+            cached = self._cache.get(esv_verse_id(code))
+            if cached is not None:
+                results[code] = cached
+            else:
+                missing[code] = ref
+
+        items = list(missing.items())
+        for i in range(0, len(items), self.MAX_REFS_PER_QUERY):
+            chunk = dict(items[i:i + self.MAX_REFS_PER_QUERY])
+            wait = self.limiter.acquire()
+            if wait > 0:
+                self._defer(dict(items[i:]), wait)
+                raise ESVRateLimitError(math.ceil(wait))
+            try:
+                results.update(self._fetch_passages(chunk))
+            except ESVRateLimitError as e:
+                self._defer(dict(items[i:]), e.wait_seconds)
+                raise
+        return results
+
+    def _defer(self, references: Dict[str, str], wait: float) -> None:
+        self.limiter.defer(references)
+        self.limiter.schedule_retry(wait, self._retry_deferred)
+        logger.warning("ESV API throttled; %s references deferred for %.0f seconds", len(references), wait)
+
+    def _retry_deferred(self) -> None:
+        """Fetch deferred references into the cache (runs on a timer thread)."""
+        deferred = self.limiter.take_deferred()
+        if not deferred:
+            return
+        try:
+            self.get_verses_batch(deferred)
+            logger.info("Fetched %s deferred ESV references", len(deferred))
+        except ESVRateLimitError:
+            pass  # re-deferred and rescheduled by get_verses_batch
 
+    def _fetch_passages(self, references: Dict[str, str]) -> Dict[str, str]:
+        """One ESV request for several references; returns texts by verse code."""
         params = {
-            "q": reference,
+            "q": ";".join(references.values()),
             "include-headings": False,
             "include-footnotes": False,
-            "include-verse-numbers": False,
+            "include-verse-numbers": True,
             "include-short-copyright": False,
             "include-passage-references": False,
         }
         try:
-            self._check_rate_limit()
-            response = requests.get(self.BASE_URL, params=params, headers=self.headers)
-            if response.status_code == 200:
-                self._next_allowed_time = time.time()
-                data = response.json()
-                passages = data.get("passages", [])
-                if passages:
-                    text = passages[0].strip()
-                    text = re.sub(r"<[^>]+>", "", text).strip()
-                    self._cache.set(reference, text)
-                    return text
-                logger.error("No passages returned for %s", reference)
-                return ""
-            if response.status_code == 429:
-                try:
-                    detail = response.json().get("detail", "")
-                except Exception:
-                    detail = response.text
-                wait = self._parse_retry_after(detail)
-                self._next_allowed_time = time.time() + wait
-                logger.warning("ESV API throttled; wait %s seconds", wait)
-                raise ESVRateLimitError(wait)
-            logger.error("ESV API error %s: %s", response.status_code, response.text)
-        except ESVRateLimitError:
-            raise
+            response = upstream.get(self.BASE_URL, params=params, headers=self.headers)
         except Exception as e:
-            logger.error("Failed to fetch verse from ESV API: %s", e)
-        return ""
+            logger.error("Failed to fetch verses from ESV API: %s", e)
+            return {}
 
-    def get_verses_batch(self, references: Dict[str, str]) -> Dict[str, str]:
-        """Fetch multiple verses while respecting rate limits."""
-        results: Dict[str, str] = {}
-        for code, ref in references.items():
-            results[code] = self.get_verse_text(ref)
+        if response.status_code == 429:
+            try:
+                detail = response.json().get("detail", "")
+            except Exception:
+                detail = response.text
+            wait = self._parse_retry_after(detail)
+            self.limiter.block(wait)
+            raise ESVRateLimitError(wait)
+        if response.status_code != 200:
+            logger.error("ESV API error %s: %s", response.status_code, response.text)
+            return {}
+
+        data = response.json()
+        parsed, passages = data.get("parsed", []), data.get("passages", [])
+        texts = split_passages(parsed, passages)
+        # Keys that are not verse codes (``get_verse_text``) match by position
+        positional = len(passages) == len(references)
+        results = {}
+        for i, (code, ref) in enumerate(references.items()):
+            verse_id = esv_verse_id(code)
+            if verse_id < 0 and positional:
+                text = " ".join(_VERSE_MARKER.sub("", re.sub(r"<[^>]+>", "", passages[i])).split())
+            else:
+                text = texts.get(verse_id, "")
+            if text and verse_id >= 0:
+                self._cache.set(verse_id, text)
+            if not text:
+                logger.error("No passage returned for %s", ref)
+            results[code] = text
         return results
+
+
+_VERSE_MARKER = re.compile(r"\[(\d+)\]")
+
+
+def esv_verse_id(verse_code: str) -> int:
+    """ESV verse id (``BBCCCVVV``) for a verse code such as ``"43-3-16"``; -1 if malformed."""
+    try:
+        book, chapter, verse = (int(part) for part in verse_code.split("-"))
+    except ValueError:
+        return -1
+    return book * 1_000_000 + chapter * 1_000 + verse
+
+
+def split_passages(parsed: List[List[int]], passages: List[str]) -> Dict[int, str]:
+    """Split ESV passages into ``{esv_verse_id: text}``.
+
+    ``parsed`` holds the ``[start, end]`` verse ids of each passage (ESV may
+    merge adjacent references into one passage).  A passage covering several
+    verses is split on its ``[n]`` verse-number markers; when the numbering
+    restarts, the passage has run into the next chapter.
+    """
+    texts: Dict[int, str] = {}
+    for (start, end), passage in zip(parsed, passages):
+        passage = re.sub(r"<[^>]+>", "", passage)
+        parts = _VERSE_MARKER.split(passage)
+        base = start - start % 1_000
+        last = 0
+        # parts: [before, n1, text1, n2, text2, ...]
+        for number, text in zip(parts[1::2], parts[2::2]):
+            verse = int(number)
+            if verse < last:
+                base += 1_000
+            last = verse
+            verse_id = base + verse
+            text = " ".join(text.split())
+            if start <= verse_id <= end and text:
+                texts[verse_id] = text
+        if start == end and start not in texts:
+            text = " ".join(_VERSE_MARKER.sub("", passage).split())
+            if text:
+                texts[start] = text
+    return texts
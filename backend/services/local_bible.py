@@ -0,0 +1,144 @@
+# backend/services/local_bible.py
+"""Locally stored translations
+
+Public-domain translations imported with ``sql_setup/import_bible_text.py``
+live in ``bible_texts`` (keyed by translation and verse id) and are served
+from there: no network call, no rate limit and no dependency on API.Bible
+being up.  Licensed translations are still fetched from API.Bible::
+
+    if local_bible.serves(bible_id):
+        texts = local_bible.get_texts(bible_id, verse_codes)
+
+The set of local translations is read once (at startup, or on first use) and
+refreshed with ``reload``.  Each translation is also packed into a
+memory-mapped file under ``Config.LOCAL_BIBLE_DIR`` (``services.packed_bible``)
+and served from there without a query; Postgres is the fallback when the file
+cannot be written.  The first-use load queries the database and maps files,
+so async callers check ``loaded`` and run it in a worker thread.
+"""
+
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+import db_pool
+from config import Config
+from database import DatabaseConnection
+from services.packed_bible import PackedBible, open_packed, write_packed
+from verse_catalog import get_catalog
+
+logger = logging.getLogger(__name__)
+
+TRANSLATIONS_QUERY = """
+    SELECT bible_id, abbreviation, name, license, verse_count,
+           EXTRACT(EPOCH FROM imported_at)::bigint AS imported_at
+    FROM local_translations
+    WHERE verse_count > 0
+"""
+
+TEXTS_QUERY = "SELECT verse_id, text FROM bible_texts WHERE bible_id = %s AND verse_id = ANY(%s)"
+
+TRANSLATION_QUERY = "SELECT verse_id, text FROM bible_texts WHERE bible_id = %s"
+
+
+class LocalBible:
+    """Serves verse texts of locally imported translations"""
+
+    def __init__(self, pool=None, directory: Optional[str] = None):
+        self._pool = pool
+        self.directory = directory or Config.LOCAL_BIBLE_DIR
+        self._translations: Optional[Dict[str, Dict]] = None
+        self._packed: Dict[str, PackedBible] = {}
+        self._lock = threading.Lock()
+
+    def _db(self) -> DatabaseConnection:
+        return DatabaseConnection(self._pool or db_pool.db_pool)
+
+    def reload(self) -> Dict[str, Dict]:
+        """Re-read ``local_translations``; a missing table means none are local"""
+        try:
+            rows = self._db().fetch_all(TRANSLATIONS_QUERY)
+        except Exception as e:
+            logger.warning(f"Local translations unavailable, using API.Bible only: {e}")
+            rows = []
+        translations = {row["bible_id"]: dict(row) for row in rows}
+        # Mappings being replaced are left to the garbage collector: callers
+        # may still hold views into them
+        self._packed = {
+            bible_id: packed
+            for bible_id, translation in translations.items()
+            if (packed := self._open_packed(bible_id, translation["imported_at"])) is not None
+        }
+        self._translations = translations
+        if translations:
+            logger.info(
+                "Serving translations locally: "
+                + ", ".join(f"{t['abbreviation']} ({t['verse_count']} verses)" for t in translations.values())
+            )
+        return translations
+
+    def _pack_path(self, bible_id: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]", "_", bible_id) + ".wvt")
+
+    def _open_packed(self, bible_id: str, imported_at: int) -> Optional[PackedBible]:
+        """Map the translation's packed file, (re)building it if stale"""
+        path = self._pack_path(bible_id)
+        packed = open_packed(path)
+        if packed is not None:
+            if packed.imported_at == imported_at:
+                return packed
+            packed.close()  # stale; rebuilt below
+        try:
+            count = write_packed(path, self._db().fetch_rows(TRANSLATION_QUERY, (bible_id,)), imported_at)
+            logger.info(f"Packed {bible_id} into {path} ({count} verse slots)")
+        except Exception as e:
+            logger.warning(f"Could not pack {bible_id} into {path}, serving it from Postgres: {e}")
+            return None
+        return open_packed(path)
+
+    @property
+    def loaded(self) -> bool:
+        """True once ``local_translations`` has been read (``reload`` ran)"""
+        return self._translations is not None
+
+    def translations(self) -> Dict[str, Dict]:
+        if self._translations is None:
+            with self._lock:
+                if self._translations is None:
+                    self.reload()
+        return self._translations
+
+    def serves(self, bible_id: str) -> bool:
+        return bible_id in self.translations()
+
+    def is_packed(self, bible_id: str) -> bool:
+        """Whether lookups for ``bible_id`` are served from memory (no query)"""
+        return bible_id in self._packed
+
+    def get_texts(self, bible_id: str, verse_codes: List[str]) -> Dict[str, str]:
+        """Texts for ``verse_codes``; unknown codes map to ``""``"""
+        catalog = get_catalog()
+        packed = self._packed.get(bible_id)
+        if packed is not None:
+            texts = {}
+            for code in verse_codes:
+                verse_id = catalog.id_for_code(code)
+                texts[code] = packed.text(verse_id) if verse_id is not None else ""
+            return texts
+
+        ids = {}
+        for code in verse_codes:
+            verse_id = catalog.id_for_code(code)
+            if verse_id is not None:
+                ids[verse_id] = code
+
+        texts = dict.fromkeys(verse_codes, "")
+        if ids:
+            for row in self._db().fetch_rows(TEXTS_QUERY, (bible_id, list(ids))):
+                texts[ids[row.verse_id]] = row.text
+        return texts
+
+
+local_bible = LocalBible()
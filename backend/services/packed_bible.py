@@ -0,0 +1,126 @@
+# backend/services/packed_bible.py
+"""Packed, memory-mapped verse texts
+
+A locally stored translation is written once to a single file::
+
+    header   magic "WVTX", version, entry count, imported_at (epoch seconds)
+    offsets  uint32[count + 1], native byte order, indexed by bible_verses.id
+    blob     UTF-8 text of every verse, back to back
+
+The text of verse ``id`` is ``blob[offsets[id]:offsets[id + 1]]`` (empty when
+the translation has no such verse).  Each worker ``mmap``s the file
+read-only, so all uvicorn workers share the same pages through the OS page
+cache, and a lookup is two array reads and a slice of the mapping: nothing is
+copied or decoded until the text is needed as a ``str``.
+
+Files are rebuilt from ``bible_texts`` by ``services.local_bible`` whenever
+the translation is re-imported (``imported_at`` no longer matches).
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Iterable, Optional, Tuple
+
+MAGIC = b"WVTX"
+VERSION = 1
+_HEADER = struct.Struct("=4sHBxIq")  # magic, version, little-endian flag, count, imported_at
+_LITTLE = 1 if sys.byteorder == "little" else 0
+
+
+def write_packed(path: str, rows: Iterable[Tuple[int, str]], imported_at: int) -> int:
+    """Write ``(verse_id, text)`` rows to ``path``; returns the entry count.
+
+    The file is written next to ``path`` and renamed into place, so workers
+    opening it concurrently never see a partial file.
+    """
+    texts = {verse_id: text.encode("utf-8") for verse_id, text in rows}
+    count = max(texts, default=-1) + 1
+
+    offsets = array("I", [0]) * (count + 1)
+    blob = bytearray()
+    for verse_id in range(count):
+        blob += texts.get(verse_id, b"")
+        offsets[verse_id + 1] = len(blob)
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, _LITTLE, count, imported_at))
+            f.write(offsets.tobytes())
+            f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+class PackedBible:
+    """Read-only view of one packed translation file"""
+
+    __slots__ = ("path", "imported_at", "_file", "_map", "_offsets", "_blob")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        magic, version, little, count, self.imported_at = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or little != _LITTLE:
+            self.close()
+            raise ValueError(f"{path} is not a packed verse text file for this platform")
+
+        view = memoryview(self._map)
+        start = _HEADER.size
+        end = start + (count + 1) * 4
+        if len(view) < end:
+            view.release()
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self._offsets = view[start:end].cast("I")
+        self._blob = view[end:]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, verse_id: int) -> memoryview:
+        """UTF-8 bytes of ``verse_id`` as a view into the mapping (no copy)"""
+        if not 0 <= verse_id < len(self._offsets) - 1:
+            return self._blob[0:0]
+        return self._blob[self._offsets[verse_id]:self._offsets[verse_id + 1]]
+
+    def text(self, verse_id: int) -> str:
+        return str(self.raw(verse_id), "utf-8")
+
+    def close(self) -> None:
+        """Release the mapping and the file.
+
+        Views returned by ``raw()`` that are still alive keep their pages
+        mapped; the mapping then goes away when the last of them is released.
+        """
+        for view in (getattr(self, "_offsets", None), getattr(self, "_blob", None)):
+            if view is not None:
+                view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # outstanding raw() views; see above
+        self._file.close()
+
+
+def open_packed(path: str) -> Optional[PackedBible]:
+    """Open ``path`` if it exists and is valid, else ``None``"""
+    try:
+        return PackedBible(path)
+    except (OSError, ValueError, TypeError, struct.error):
+        return None
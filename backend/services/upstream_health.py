@@ -0,0 +1,116 @@
+# backend/services/upstream_health.py
+"""Background health probes for upstream APIs
+
+Startup and ``/api/health`` must not wait on a third party, so API.Bible is
+probed by a background task and readers only see the cached result::
+
+    api_bible_health.start()      # in the lifespan, after the event loop is up
+    api_bible_health.snapshot()   # {"status": "healthy", "checked_at": ..., ...}
+
+A healthy upstream is probed every ``interval`` seconds.  After a failure the
+probe retries sooner and backs off exponentially (``retry``, ``2 * retry``,
+... up to ``max_backoff``) until it succeeds again.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from config import Config
+from services.upstream_http import upstream
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "unknown"
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+
+
+class UpstreamHealth:
+    """Periodically runs a blocking ``probe`` and caches the outcome"""
+
+    def __init__(self, name: str, probe: Callable[[], None], interval: float = 60.0,
+                 retry: float = 5.0, max_backoff: float = 300.0):
+        self.name = name
+        self.probe = probe
+        self.interval = interval
+        self.retry = retry
+        self.max_backoff = max_backoff
+        self.status = UNKNOWN
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.healthy_at: Optional[float] = None
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> str:
+        """Probe once and record the result"""
+        try:
+            await asyncio.to_thread(self.probe)
+        except Exception as e:
+            self.failures += 1
+            self.error = str(e)
+            if self.status != UNHEALTHY:
+                logger.error(f"{self.name} health check failed: {e}")
+            self.status = UNHEALTHY
+        else:
+            if self.status != HEALTHY:
+                logger.info(f"{self.name} health check passed")
+            self.failures = 0
+            self.error = None
+            self.status = HEALTHY
+            self.healthy_at = time.time()
+        self.checked_at = time.time()
+        return self.status
+
+    def next_delay(self) -> float:
+        if not self.failures:
+            return self.interval
+        return min(self.retry * 2 ** (self.failures - 1), self.max_backoff)
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.next_delay())
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-health")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "checked_at": self.checked_at,
+            "healthy_at": self.healthy_at,
+            "consecutive_failures": self.failures,
+        }
+
+
+def _probe_api_bible() -> None:
+    """Fetch the default Bible's metadata: one small authenticated request"""
+    response = upstream.get(
+        f"{Config.API_BIBLE_HOST}/bibles/{Config.DEFAULT_BIBLE_ID}",
+        headers={"api-key": Config.API_BIBLE_KEY, "accept": "application/json"},
+    )
+    if response.status_code in (401, 403):
+        raise Exception(f"API.Bible rejected the API key ({response.status_code})")
+    if response.status_code != 200:
+        raise Exception(f"API.Bible returned {response.status_code}")
+
+
+api_bible_health = UpstreamHealth(
+    "API.Bible",
+    _probe_api_bible,
+    interval=Config.UPSTREAM_HEALTH_INTERVAL,
+)
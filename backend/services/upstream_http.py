@@ -0,0 +1,100 @@
+# backend/services/upstream_http.py
+"""Shared HTTP client for the upstream Bible APIs
+
+Every request goes through one ``requests.Session`` so TCP/TLS connections
+are kept alive and reused across requests and threads.  The number of
+requests in flight to each host is capped, every request gets a
+connect/read timeout, and independent requests can be fanned out over a
+bounded thread pool::
+
+    from services.upstream_http import upstream
+
+    response = upstream.get(url, headers=headers, params=params)
+    results = upstream.map(fetch_chapter, chapters)  # in parallel, in order
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class UpstreamClient:
+    """Keep-alive session with per-host concurrency limits and timeouts"""
+
+    def __init__(
+        self,
+        max_per_host: int = 8,
+        max_workers: int = 16,
+        timeout: Tuple[float, float] = (3.05, 10.0),
+    ):
+        self.max_per_host = max_per_host
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        # One pooled connection per allowed in-flight request to a host
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_per_host, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _limit_for(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return limit
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """``GET`` through the shared session, waiting for a free slot on the host"""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._limit_for(url):
+            return self.session.get(url, **kwargs)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Run ``fn`` over ``items`` concurrently; results keep the input order.
+
+        A single item runs inline.  ``fn`` must not call ``map`` itself.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        return list(self._pool().map(fn, items))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="upstream"
+                    )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut the thread pool down and drop pooled connections"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.session.close()
+
+
+upstream = UpstreamClient(
+    max_per_host=Config.UPSTREAM_MAX_PER_HOST,
+    max_workers=Config.UPSTREAM_MAX_WORKERS,
+    timeout=(Config.UPSTREAM_CONNECT_TIMEOUT, Config.UPSTREAM_READ_TIMEOUT),
+)
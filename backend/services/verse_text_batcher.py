@@ -1,87 +1,158 @@
-from typing import List, Dict, Set
+from typing import Dict, List, Set, Tuple
 import asyncio
-from collections import defaultdict
 import logging
-from datetime import datetime, timedelta
+
+from config import Config
+from services.api_bible import APIBibleService
+from services.local_bible import local_bible
+from services.verse_text_cache import verse_text_cache
 
 logger = logging.getLogger(__name__)
 
+FlightKey = Tuple[str, str]  # (bible_id, verse_code)
+
+
 class VerseTextBatcher:
-    """Batches verse text requests to reduce API calls."""
+    """Single entry point for API.Bible verse texts.
+
+    Lookups are micro-batched per translation: uncached codes requested
+    within ``wait_time_ms`` of each other are collected into one window, and
+    each window is dispatched as one ``get_verses_batch`` call (split into
+    chunks of ``batch_size``), so concurrent requests share upstream calls.
+    A window is dispatched early once it holds ``batch_size`` codes.
 
-    def __init__(self, api_service, batch_size: int = 50, wait_time_ms: int = 50):
+    Every uncached ``(bible_id, verse_code)`` also has at most one fetch in
+    flight per worker (single-flight): a caller asking for a verse that is
+    already queued or being fetched awaits that fetch instead of starting
+    another one.  Each code resolves its own future, so every caller gets
+    exactly the texts it asked for.
+
+    Translations stored locally (``services.local_bible``) bypass all of
+    this and are read from the database; only licensed translations go
+    upstream.
+    """
+
+    def __init__(self, api_service, batch_size: int = 200, wait_time_ms: int = 10,
+                 timeout: float = 30.0, cache=verse_text_cache, local=local_bible):
         self.api_service = api_service
+        self.local = local
         self.batch_size = batch_size
         self.wait_time_ms = wait_time_ms
-        self.pending_requests: Dict[str, List[asyncio.Future]] = defaultdict(list)
-        self.processing = False
-        self._cache: Dict[str, str] = {}
-        self._cache_expiry: Dict[str, datetime] = {}
-        self._cache_ttl = timedelta(hours=24)
+        self.timeout = timeout
+        self._cache = cache
+        self._inflight: Dict[FlightKey, asyncio.Future] = {}
+        self._pending: Dict[str, List[str]] = {}
+        self._windows: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.local_lookups = 0
+        self.batches = 0
+        self.fetches = 0
+        self.coalesced = 0
 
     async def get_verse_texts(self, verse_codes: List[str], bible_id: str) -> Dict[str, str]:
-        now = datetime.now()
-        cached_results = {}
-        uncached_codes = []
+        if self.local is not None and not self.local.loaded:
+            # Startup did not load local translations; don't block the loop on it
+            await asyncio.to_thread(self.local.translations)
+        if self.local is not None and self.local.serves(bible_id):
+            if self.local.is_packed(bible_id):
+                # Memory-mapped: microseconds, no need to leave the event loop
+                self.local_lookups += 1
+                return self.local.get_texts(bible_id, verse_codes)
+            try:
+                texts = await asyncio.to_thread(self.local.get_texts, bible_id, verse_codes)
+                self.local_lookups += 1
+                return texts
+            except Exception as e:
+                logger.error(f"Local text lookup failed for {bible_id}, using API.Bible: {e}")
+
+        results = self._cache.peek_many(bible_id, verse_codes)
+
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[str] = []
+        loop = asyncio.get_running_loop()
         for code in verse_codes:
-            if code in self._cache and self._cache_expiry.get(code, now) > now:
-                cached_results[code] = self._cache[code]
+            if code in results or code in waiting:
+                continue
+            key = (bible_id, code)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = loop.create_future()
+                to_fetch.append(code)
             else:
-                uncached_codes.append(code)
-        if not uncached_codes:
-            return cached_results
-        future = asyncio.Future()
-        for code in uncached_codes:
-            self.pending_requests[f"{bible_id}:{code}"].append(future)
-        if not self.processing:
-            asyncio.create_task(self._process_batch(bible_id))
+                self.coalesced += 1
+            waiting[code] = future
+
+        if to_fetch:
+            self._enqueue(loop, bible_id, to_fetch)
+        if not waiting:
+            return results
+
         try:
-            results = await asyncio.wait_for(future, timeout=5.0)
-            expiry = now + self._cache_ttl
-            for code, text in results.items():
-                self._cache[code] = text
-                self._cache_expiry[code] = expiry
-            final_results = {**cached_results}
-            for code in uncached_codes:
-                if code in results:
-                    final_results[code] = results[code]
-            return final_results
+            # Shielded so one caller timing out does not cancel a fetch others await
+            texts = await asyncio.wait_for(
+                asyncio.gather(*(asyncio.shield(f) for f in waiting.values())),
+                timeout=self.timeout,
+            )
+            results.update(zip(waiting.keys(), texts))
         except asyncio.TimeoutError:
-            logger.error("Timeout waiting for verse texts")
-            return cached_results
+            logger.error(f"Timeout waiting for {len(waiting)} verse texts")
+            results.update(
+                (code, future.result()) for code, future in waiting.items() if future.done()
+            )
+        return results
+
+    def _enqueue(self, loop: asyncio.AbstractEventLoop, bible_id: str, verse_codes: List[str]):
+        """Add codes to the translation's open window, opening one if needed"""
+        pending = self._pending.setdefault(bible_id, [])
+        pending.extend(verse_codes)
+        if len(pending) >= self.batch_size:
+            self._dispatch(bible_id)
+        elif bible_id not in self._windows:
+            self._windows[bible_id] = loop.call_later(
+                self.wait_time_ms / 1000.0, self._dispatch, bible_id
+            )
 
-    async def _process_batch(self, bible_id: str):
-        self.processing = True
+    def _dispatch(self, bible_id: str):
+        """Close the translation's window and fetch everything it collected"""
+        window = self._windows.pop(bible_id, None)
+        if window is not None:
+            window.cancel()
+        verse_codes = self._pending.pop(bible_id, [])
+        if not verse_codes:
+            return
+        self.batches += 1
+        for i in range(0, len(verse_codes), self.batch_size):
+            task = asyncio.create_task(self._fetch(bible_id, verse_codes[i:i + self.batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, bible_id: str, verse_codes: List[str]):
+        """Fetch one chunk upstream and resolve its in-flight futures"""
+        results: Dict[str, str] = {}
+        self.fetches += 1
         try:
-            await asyncio.sleep(self.wait_time_ms / 1000.0)
-            all_requests = {}
-            for key, futures in list(self.pending_requests.items()):
-                if key.startswith(f"{bible_id}:"):
-                    verse_code = key.split(":", 1)[1]
-                    all_requests[verse_code] = futures
-            if not all_requests:
-                return
-            for code in all_requests:
-                del self.pending_requests[f"{bible_id}:{code}"]
-            verse_codes = list(all_requests.keys())
-            chunks = [verse_codes[i:i+self.batch_size] for i in range(0, len(verse_codes), self.batch_size)]
-            all_results = {}
-            for chunk in chunks:
-                try:
-                    chunk_results = self.api_service.get_verses_batch(chunk, bible_id)
-                    all_results.update(chunk_results)
-                except Exception as e:
-                    logger.error(f"Error fetching verse chunk: {e}")
-            for code, futures in all_requests.items():
-                result = {code: all_results.get(code, "")}
-                for future in futures:
-                    if not future.done():
-                        future.set_result(result)
+            results = await asyncio.to_thread(self.api_service.get_verses_batch, verse_codes, bible_id)
+        except Exception as e:
+            logger.error(f"Error fetching verse chunk: {e}")
         finally:
-            self.processing = False
-            if self.pending_requests:
-                asyncio.create_task(self._process_batch(bible_id))
+            for code in verse_codes:
+                future = self._inflight.pop((bible_id, code), None)
+                if future is not None and not future.done():
+                    future.set_result(results.get(code, ""))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "open_windows": len(self._windows),
+            "local_lookups": self.local_lookups,
+            "batches": self.batches,
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+        }
+
 
-    def clear_cache(self):
-        self._cache.clear()
-        self._cache_expiry.clear()
+verse_text_batcher = VerseTextBatcher(
+    APIBibleService(Config.API_BIBLE_KEY, Config.DEFAULT_BIBLE_ID),
+    batch_size=Config.VERSE_TEXT_BATCH_SIZE,
+    wait_time_ms=Config.VERSE_TEXT_BATCH_WINDOW_MS,
+)
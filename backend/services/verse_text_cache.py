@@ -0,0 +1,191 @@
+# backend/services/verse_text_cache.py
+"""Process-wide verse-text cache
+
+Verse texts are keyed by ``(bible_id, verse_code)`` and held in a bounded
+in-memory LRU shared by every request in the worker.  Misses fall through to
+an optional persistent tier (``PostgresVerseTextStore``, the
+``verse_text_cache`` table) so texts fetched by one worker, or before a
+restart, are not fetched from the upstream API again::
+
+    cached = verse_text_cache.get_many(bible_id, codes)
+    ...fetch the rest upstream...
+    verse_text_cache.put_many(bible_id, fetched)
+
+Empty texts are never cached, so a failed fetch is retried next time.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import psycopg2.errors
+
+import db_pool
+from config import Config
+from database import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+class PostgresVerseTextStore:
+    """Second cache tier in Postgres, shared by all workers.
+
+    The store is best effort: a database error is logged and treated as a
+    miss, and a missing table disables the tier until restart.
+    """
+
+    def __init__(self, pool=None):
+        self._pool = pool
+        self.enabled = True
+
+    def _db(self) -> DatabaseConnection:
+        return DatabaseConnection(self._pool or db_pool.db_pool)
+
+    def get_many(self, bible_id: str, verse_codes: Iterable[str]) -> Dict[str, str]:
+        if not self.enabled:
+            return {}
+        try:
+            rows = self._db().fetch_rows(
+                "SELECT verse_code, text FROM verse_text_cache WHERE bible_id = %s AND verse_code = ANY(%s)",
+                (bible_id, list(verse_codes)),
+            )
+        except Exception as e:
+            self._failed(e)
+            return {}
+        return {row.verse_code: row.text for row in rows}
+
+    def put_many(self, bible_id: str, texts: Dict[str, str]) -> None:
+        if not self.enabled or not texts:
+            return
+        try:
+            self._db().copy_upsert(
+                "verse_text_cache",
+                ("bible_id", "verse_code", "text"),
+                ((bible_id, code, text) for code, text in texts.items()),
+                conflict=("bible_id", "verse_code"),
+            )
+        except Exception as e:
+            self._failed(e)
+
+    def clear(self) -> None:
+        if self.enabled:
+            try:
+                self._db().execute("DELETE FROM verse_text_cache")
+            except Exception as e:
+                self._failed(e)
+
+    def _failed(self, error: Exception) -> None:
+        if isinstance(error, psycopg2.errors.UndefinedTable):
+            logger.warning("verse_text_cache table missing; persistent verse text cache disabled")
+            self.enabled = False
+        else:
+            logger.error(f"Persistent verse text cache error: {error}")
+
+
+class VerseTextCache:
+    """Thread-safe LRU of verse texts with an optional persistent tier"""
+
+    def __init__(self, max_entries: int = 50_000, store: Optional[PostgresVerseTextStore] = None):
+        self.max_entries = max_entries
+        self.store = store
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._hits = 0
+        self._store_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, bible_id: str, verse_code: str) -> Optional[str]:
+        return self.get_many(bible_id, [verse_code]).get(verse_code)
+
+    def get_many(self, bible_id: str, verse_codes: Iterable[str]) -> Dict[str, str]:
+        """Cached texts for ``verse_codes``; codes not cached are left out"""
+        found: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for code in verse_codes:
+                key = (bible_id, code)
+                text = self._entries.get(key)
+                if text is None:
+                    missing.append(code)
+                else:
+                    self._entries.move_to_end(key)
+                    found[code] = text
+            self._hits += len(found)
+
+        if missing and self.store is not None:
+            stored = self.store.get_many(bible_id, missing)
+            if stored:
+                self._remember(bible_id, stored)
+                found.update(stored)
+            with self._lock:
+                self._store_hits += len(stored)
+                self._misses += len(missing) - len(stored)
+        elif missing:
+            with self._lock:
+                self._misses += len(missing)
+        return found
+
+    def peek_many(self, bible_id: str, verse_codes: Iterable[str]) -> Dict[str, str]:
+        """Texts held in memory, without touching the persistent tier or the stats"""
+        with self._lock:
+            return {
+                code: text
+                for code in verse_codes
+                if (text := self._entries.get((bible_id, code))) is not None
+            }
+
+    def put_many(self, bible_id: str, texts: Dict[str, str]) -> None:
+        """Cache freshly fetched texts in memory and in the persistent tier"""
+        texts = {code: text for code, text in texts.items() if text}
+        if not texts:
+            return
+        self._remember(bible_id, texts)
+        if self.store is not None:
+            self.store.put_many(bible_id, texts)
+
+    def clear(self, persistent: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+        if persistent and self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._store_hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "store_hits": self._store_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._store_hits) / lookups, 3) if lookups else None,
+                "evictions": self._evictions,
+                "persistent": self.store is not None and self.store.enabled,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._store_hits = self._misses = self._evictions = 0
+
+    def _remember(self, bible_id: str, texts: Dict[str, str]) -> None:
+        with self._lock:
+            for code, text in texts.items():
+                key = (bible_id, code)
+                self._entries[key] = text
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+
+verse_text_cache = VerseTextCache(
+    Config.VERSE_TEXT_CACHE_SIZE,
+    PostgresVerseTextStore() if Config.VERSE_TEXT_CACHE_PERSIST else None,
+)
@@ -1,5 +1,6 @@
 import time
 import functools
+import inspect
 import logging
 import warnings
 from typing import Dict, List, Optional, Callable
@@ -23,9 +24,62 @@ class QueryLimitExceeded(Warning):
     """Warning raised when a method exceeds the query limit"""
     pass
 
+def _record_metrics(obj, func: Callable, queries: int, elapsed: float, max_queries: int, log_details: bool) -> None:
+    metrics = QueryMetrics(
+        method_name=f"{obj.__class__.__name__}.{func.__name__}",
+        query_count=queries,
+        execution_time=elapsed,
+        timestamp=datetime.now(),
+        exceeded_limit=queries > max_queries
+    )
+
+    if metrics.method_name not in PERFORMANCE_REGISTRY:
+        PERFORMANCE_REGISTRY[metrics.method_name] = []
+    PERFORMANCE_REGISTRY[metrics.method_name].append(metrics)
+
+    if log_details:
+        logger.info(
+            f"{metrics.method_name}: {queries} queries in {elapsed:.3f}s" +
+            (" \u26A0\uFE0F EXCEEDED LIMIT" if metrics.exceeded_limit else "")
+        )
+
+    if metrics.exceeded_limit:
+        warnings.warn(
+            f"{metrics.method_name} executed {queries} queries "
+            f"(limit: {max_queries}). Consider optimizing this method.",
+            QueryLimitExceeded,
+            stacklevel=3
+        )
+
+
 def track_queries(max_queries: int = 3, log_details: bool = True):
-    """Decorator to track query count and execution time."""
+    """Decorator to track query count and execution time.
+
+    Works on plain and ``async def`` methods of objects with a ``db``
+    attribute (``DatabaseConnection`` or ``AsyncDatabaseConnection``).
+    """
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                db = getattr(args[0], "db", None)
+                if not db:
+                    return await func(*args, **kwargs)
+
+                start_count = db.query_count if hasattr(db, 'query_count') else 0
+                start_time = time.time()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    elapsed = time.time() - start_time
+                    logger.error(f"{func.__name__} failed after {elapsed:.3f}s: {e}")
+                    raise
+                elapsed = time.time() - start_time
+                queries = (db.query_count - start_count) if hasattr(db, 'query_count') else 0
+                _record_metrics(args[0], func, queries, elapsed, max_queries, log_details)
+                return result
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             db = getattr(args[0], "db", None)
@@ -36,40 +90,14 @@ def track_queries(max_queries: int = 3, log_details: bool = True):
             start_time = time.time()
             try:
                 result = func(*args, **kwargs)
-                elapsed = time.time() - start_time
-                queries = (db.query_count - start_count) if hasattr(db, 'query_count') else 0
-
-                metrics = QueryMetrics(
-                    method_name=f"{args[0].__class__.__name__}.{func.__name__}",
-                    query_count=queries,
-                    execution_time=elapsed,
-                    timestamp=datetime.now(),
-                    exceeded_limit=queries > max_queries
-                )
-
-                if metrics.method_name not in PERFORMANCE_REGISTRY:
-                    PERFORMANCE_REGISTRY[metrics.method_name] = []
-                PERFORMANCE_REGISTRY[metrics.method_name].append(metrics)
-
-                if log_details:
-                    logger.info(
-                        f"{metrics.method_name}: {queries} queries in {elapsed:.3f}s" +
-                        (" \u26A0\uFE0F EXCEEDED LIMIT" if metrics.exceeded_limit else "")
-                    )
-
-                if metrics.exceeded_limit:
-                    warnings.warn(
-                        f"{metrics.method_name} executed {queries} queries "
-                        f"(limit: {max_queries}). Consider optimizing this method.",
-                        QueryLimitExceeded,
-                        stacklevel=2
-                    )
-
-                return result
             except Exception as e:
                 elapsed = time.time() - start_time
                 logger.error(f"{func.__name__} failed after {elapsed:.3f}s: {e}")
                 raise
+            elapsed = time.time() - start_time
+            queries = (db.query_count - start_count) if hasattr(db, 'query_count') else 0
+            _record_metrics(args[0], func, queries, elapsed, max_queries, log_details)
+            return result
         return wrapper
     return decorator
 
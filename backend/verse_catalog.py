@@ -0,0 +1,251 @@
+# backend/verse_catalog.py
+"""In-process catalog of ``bible_verses``
+
+The verse table is static reference data (~31k rows), so it is read once at
+startup into flat arrays instead of being queried on every request::
+
+    catalog = verse_catalog.get_catalog()
+    verse_id = catalog.id_for_code("43-3-16")
+    verse_id = catalog.id_for(43, 3, 16)
+    first_id, last_id = catalog.chapter_bounds(43, 3)
+
+Verses are stored in canonical order (book, chapter, verse); each chapter and
+book is a contiguous slice of that order, so reference lookups are index
+arithmetic on ``array`` columns: O(1), no per-lookup containers and no
+database round trip.  The catalog is immutable; ``reload_catalog`` swaps in a new
+one after the table changes (e.g. after ``sql_setup`` re-imports it).
+"""
+
+import logging
+import threading
+from array import array
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+import db_pool
+from database import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+# Chapter slots reserved per book in the chapter index (Psalms has 150)
+_CHAPTER_STRIDE = 256
+
+CATALOG_QUERY = """
+    SELECT id, verse_code, book_id, chapter_number, verse_number, is_apocryphal
+    FROM bible_verses
+    ORDER BY book_id, chapter_number, verse_number
+"""
+
+
+class CatalogVerse(NamedTuple):
+    """One catalog entry, shaped like a ``bible_verses`` row"""
+
+    id: int
+    verse_code: str
+    book_id: int
+    chapter_number: int
+    verse_number: int
+    is_apocryphal: bool
+
+
+class VerseCatalog:
+    """Immutable, array-backed index of every verse.
+
+    Positions (0..n-1) follow canonical order.  ``ids``, ``books``,
+    ``chapters``, ``verses`` and ``apocryphal`` are parallel columns indexed by
+    position; ``verse_codes`` holds the code strings.  Three indexes map into
+    positions: verse code -> position (dict), verse id -> position (array
+    indexed by id) and (book, chapter) -> first position (array indexed by
+    ``book * 256 + chapter``).
+    """
+
+    __slots__ = (
+        "ids", "books", "chapters", "verses", "apocryphal", "verse_codes",
+        "_by_code", "_by_id", "_chapter_start", "_chapter_len", "_book_start", "_book_end",
+    )
+
+    def __init__(self, rows: Iterable[Tuple[int, str, int, int, int, bool]]):
+        self.ids = array("i")
+        self.books = array("B")
+        self.chapters = array("H")
+        self.verses = array("H")
+        self.apocryphal = array("B")
+        self.verse_codes = []
+        self._by_code = {}
+
+        for verse_id, code, book, chapter, verse, is_apocryphal in rows:
+            self._by_code[code] = len(self.ids)
+            self.ids.append(verse_id)
+            self.books.append(book)
+            self.chapters.append(chapter)
+            self.verses.append(verse)
+            self.apocryphal.append(1 if is_apocryphal else 0)
+            self.verse_codes.append(code)
+
+        max_id = max(self.ids, default=0)
+        max_book = max(self.books, default=0)
+        self._by_id = array("i", [-1]) * (max_id + 1)
+        self._chapter_start = array("i", [-1]) * ((max_book + 1) * _CHAPTER_STRIDE)
+        self._chapter_len = array("H", [0]) * ((max_book + 1) * _CHAPTER_STRIDE)
+        self._book_start = array("i", [-1]) * (max_book + 1)
+        self._book_end = array("i", [-1]) * (max_book + 1)
+
+        for pos, verse_id in enumerate(self.ids):
+            book = self.books[pos]
+            slot = book * _CHAPTER_STRIDE + self.chapters[pos]
+            self._by_id[verse_id] = pos
+            if self._chapter_start[slot] < 0:
+                self._chapter_start[slot] = pos
+            self._chapter_len[slot] += 1
+            if self._book_start[book] < 0:
+                self._book_start[book] = pos
+            self._book_end[book] = pos
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, verse_code: str) -> bool:
+        return verse_code in self._by_code
+
+    # ------------------------------------------------------------------
+    # Positions
+    # ------------------------------------------------------------------
+
+    def position_of_code(self, verse_code: str) -> int:
+        """Position of ``verse_code``, or -1"""
+        return self._by_code.get(verse_code, -1)
+
+    def position_of_id(self, verse_id: int) -> int:
+        """Position of ``verse_id``, or -1"""
+        if 0 <= verse_id < len(self._by_id):
+            return self._by_id[verse_id]
+        return -1
+
+    def position_of(self, book_id: int, chapter: int, verse: int) -> int:
+        """Position of book:chapter:verse, or -1"""
+        if not (0 <= book_id < len(self._book_start) and 0 < chapter < _CHAPTER_STRIDE and verse > 0):
+            return -1
+        slot = book_id * _CHAPTER_STRIDE + chapter
+        start = self._chapter_start[slot]
+        if start < 0 or verse > self._chapter_len[slot]:
+            return -1
+        pos = start + verse - 1
+        # Chapters are stored densely from verse 1; anything else falls back to a scan
+        if self.verses[pos] == verse:
+            return pos
+        for pos in range(start, start + self._chapter_len[slot]):
+            if self.verses[pos] == verse:
+                return pos
+        return -1
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def id_for_code(self, verse_code: str) -> Optional[int]:
+        """Verse id for ``verse_code`` (``"43-3-16"``)"""
+        pos = self._by_code.get(verse_code, -1)
+        return self.ids[pos] if pos >= 0 else None
+
+    def code_for_id(self, verse_id: int) -> Optional[str]:
+        """Verse code for ``verse_id``"""
+        pos = self.position_of_id(verse_id)
+        return self.verse_codes[pos] if pos >= 0 else None
+
+    def id_for(self, book_id: int, chapter: int, verse: int) -> Optional[int]:
+        """Verse id for book:chapter:verse"""
+        pos = self.position_of(book_id, chapter, verse)
+        return self.ids[pos] if pos >= 0 else None
+
+    def verse_at(self, pos: int) -> CatalogVerse:
+        """The full entry at ``pos``"""
+        return CatalogVerse(
+            self.ids[pos],
+            self.verse_codes[pos],
+            self.books[pos],
+            self.chapters[pos],
+            self.verses[pos],
+            bool(self.apocryphal[pos]),
+        )
+
+    def by_code(self, verse_code: str) -> Optional[CatalogVerse]:
+        pos = self._by_code.get(verse_code, -1)
+        return self.verse_at(pos) if pos >= 0 else None
+
+    def by_id(self, verse_id: int) -> Optional[CatalogVerse]:
+        pos = self.position_of_id(verse_id)
+        return self.verse_at(pos) if pos >= 0 else None
+
+    # ------------------------------------------------------------------
+    # Ranges
+    # ------------------------------------------------------------------
+
+    def chapter_positions(self, book_id: int, chapter: int) -> Optional[Tuple[int, int]]:
+        """Half-open position range ``(start, end)`` of a chapter"""
+        if not (0 <= book_id < len(self._book_start) and 0 < chapter < _CHAPTER_STRIDE):
+            return None
+        slot = book_id * _CHAPTER_STRIDE + chapter
+        start = self._chapter_start[slot]
+        return (start, start + self._chapter_len[slot]) if start >= 0 else None
+
+    def book_positions(self, book_id: int) -> Optional[Tuple[int, int]]:
+        """Half-open position range ``(start, end)`` of a book"""
+        if not 0 <= book_id < len(self._book_start) or self._book_start[book_id] < 0:
+            return None
+        return self._book_start[book_id], self._book_end[book_id] + 1
+
+    def chapter_bounds(self, book_id: int, chapter: int) -> Optional[Tuple[int, int]]:
+        """First and last verse id of a chapter"""
+        span = self.chapter_positions(book_id, chapter)
+        return (self.ids[span[0]], self.ids[span[1] - 1]) if span else None
+
+    def book_bounds(self, book_id: int) -> Optional[Tuple[int, int]]:
+        """First and last verse id of a book"""
+        span = self.book_positions(book_id)
+        return (self.ids[span[0]], self.ids[span[1] - 1]) if span else None
+
+    def chapter_ids(self, book_id: int, chapter: int) -> memoryview:
+        """Verse ids of a chapter in order (a view, not a copy)"""
+        span = self.chapter_positions(book_id, chapter)
+        return memoryview(self.ids)[span[0]:span[1]] if span else memoryview(self.ids)[0:0]
+
+    def book_ids(self, book_id: int) -> memoryview:
+        """Verse ids of a book in order (a view, not a copy)"""
+        span = self.book_positions(book_id)
+        return memoryview(self.ids)[span[0]:span[1]] if span else memoryview(self.ids)[0:0]
+
+    def chapter_count(self, book_id: int) -> int:
+        span = self.book_positions(book_id)
+        return self.chapters[span[1] - 1] if span else 0
+
+    def verse_count(self, book_id: int, chapter: int) -> int:
+        span = self.chapter_positions(book_id, chapter)
+        return span[1] - span[0] if span else 0
+
+
+_catalog: Optional[VerseCatalog] = None
+_lock = threading.Lock()
+
+
+def load_catalog(db: DatabaseConnection) -> VerseCatalog:
+    """Read ``bible_verses`` into a new catalog"""
+    catalog = VerseCatalog(db.fetch_rows(CATALOG_QUERY))
+    logger.info(f"Verse catalog loaded: {len(catalog)} verses")
+    return catalog
+
+
+def reload_catalog(db: Optional[DatabaseConnection] = None) -> VerseCatalog:
+    """(Re)load the process-wide catalog from the database"""
+    global _catalog
+    catalog = load_catalog(db or DatabaseConnection(db_pool.db_pool))
+    _catalog = catalog
+    return catalog
+
+
+def get_catalog() -> VerseCatalog:
+    """The process-wide catalog, loaded on first use if startup did not"""
+    global _catalog
+    if _catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = load_catalog(DatabaseConnection(db_pool.db_pool))
+    return _catalog
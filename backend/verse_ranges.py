@@ -0,0 +1,111 @@
+# backend/verse_ranges.py
+"""Grouping of consecutive verses into ranges
+
+Cross-reference and topical listings show runs of consecutive verses as one
+range ("Romans 8:28-30").  The routes pass their rows as parallel columns
+and get back one ``VerseRange`` per run, with the range aggregates computed
+in the same pass::
+
+    book_ids, chapters, verse_numbers = columns(rows, "book_id", "chapter", "verse_number")
+    ranges = group_ranges(book_ids, chapters, verse_numbers, scores, practice, confidence)
+    for r in ranges:
+        first, last = rows[r.start], rows[r.end - 1]
+
+Rows must already be in canonical order.  Verses are consecutive when they
+share a book, a chapter and (optionally) a ``keys`` value, and the verse
+number goes up by one.
+"""
+
+import logging
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class VerseRange(NamedTuple):
+    """Rows ``start:end`` form one range"""
+
+    start: int
+    end: int
+    max_score: float        # highest ``scores`` value in the range
+    practice_total: int     # sum of practice counts
+    all_memorized: bool     # every verse has been practised
+    confidence_mean: float  # mean user confidence
+
+    @property
+    def is_range(self) -> bool:
+        return self.end - self.start > 1
+
+
+def columns(rows: Sequence[Any], *names: str) -> Tuple[List[Any], ...]:
+    """Pull the named fields out of ``rows`` as one list per field"""
+    return tuple([row[name] for row in rows] for name in names)
+
+
+def group_ranges(
+    book_ids: Sequence[int],
+    chapters: Sequence[int],
+    verse_numbers: Sequence[int],
+    scores: Sequence[float],
+    practice_counts: Sequence[int],
+    confidence_scores: Sequence[float],
+    keys: Optional[Sequence[Any]] = None,
+) -> List[VerseRange]:
+    """Split rows into runs of consecutive verses, aggregating as it goes"""
+    count = len(book_ids)
+    if not count:
+        return []
+
+    ranges = []
+    start = 0
+    max_score = scores[0]
+    practice_total = min_practice = practice_counts[0]
+    confidence_total = confidence_scores[0]
+    for i in range(1, count + 1):
+        if (
+            i < count
+            and verse_numbers[i] == verse_numbers[i - 1] + 1
+            and chapters[i] == chapters[i - 1]
+            and book_ids[i] == book_ids[i - 1]
+            and (keys is None or keys[i] == keys[i - 1])
+        ):
+            score = scores[i]
+            if score > max_score:
+                max_score = score
+            practice = practice_counts[i]
+            practice_total += practice
+            if practice < min_practice:
+                min_practice = practice
+            confidence_total += confidence_scores[i]
+            continue
+
+        ranges.append(VerseRange(
+            start, i, max_score, practice_total, min_practice > 0, confidence_total / (i - start)
+        ))
+        if i < count:
+            start = i
+            max_score = scores[i]
+            practice_total = min_practice = practice_counts[i]
+            confidence_total = confidence_scores[i]
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Grouped {count} verses into {len(ranges)} ranges: "
+            + ", ".join(
+                f"{book_ids[r.start]}:{chapters[r.start]}:{verse_numbers[r.start]}"
+                + (f"-{verse_numbers[r.end - 1]}" if r.is_range else "")
+                for r in ranges[:5]
+            )
+        )
+    return ranges
+
+
+def display_reference(book_name: str, chapter: int, verse_number: int,
+                      end_chapter: Optional[int] = None, end_verse_number: Optional[int] = None) -> str:
+    """Display form of a verse or range: ``John 3:16``, ``John 3:16-18``, ``John 3:16-4:2``"""
+    reference = f"{book_name} {chapter}:{verse_number}"
+    if end_verse_number is None or (end_chapter == chapter and end_verse_number == verse_number):
+        return reference
+    if end_chapter is None or end_chapter == chapter:
+        return f"{reference}-{end_verse_number}"
+    return f"{reference}-{end_chapter}:{end_verse_number}"
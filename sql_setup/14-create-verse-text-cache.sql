@@ -0,0 +1,15 @@
+-- =====================================================
+-- 14-create-verse-text-cache.sql
+-- Persistent tier of the backend's verse-text cache
+-- (services/verse_text_cache.py); shared by all workers
+-- and kept across restarts
+-- =====================================================
+SET search_path TO wellversed01DEV;
+
+CREATE TABLE IF NOT EXISTS verse_text_cache (
+    bible_id VARCHAR(64) NOT NULL,
+    verse_code VARCHAR(20) NOT NULL,
+    text TEXT NOT NULL,
+    fetched_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (bible_id, verse_code)
+);
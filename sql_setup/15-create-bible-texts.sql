@@ -0,0 +1,25 @@
+-- =====================================================
+-- 15-create-bible-texts.sql
+-- Locally stored texts of public-domain translations,
+-- served by the backend without calling API.Bible
+-- (services/local_bible.py); loaded by import_bible_text.py
+-- =====================================================
+SET search_path TO wellversed01DEV;
+
+-- One row per imported translation; bible_id is the API.Bible id the
+-- local copy stands in for, so requests for it never leave the server
+CREATE TABLE IF NOT EXISTS local_translations (
+    bible_id VARCHAR(64) PRIMARY KEY,
+    abbreviation VARCHAR(20) NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    license VARCHAR(100) NOT NULL DEFAULT 'Public Domain',
+    verse_count INTEGER NOT NULL DEFAULT 0,
+    imported_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS bible_texts (
+    bible_id VARCHAR(64) NOT NULL REFERENCES local_translations(bible_id) ON DELETE CASCADE,
+    verse_id INTEGER NOT NULL REFERENCES bible_verses(id) ON DELETE CASCADE,
+    text TEXT NOT NULL,
+    PRIMARY KEY (bible_id, verse_id)
+);
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+import_bible_text.py - Import a public-domain translation for offline serving
+
+Loads a whole translation into bible_texts so the backend serves it without
+calling API.Bible. The input is a tab- or comma-separated file with one verse
+per line:
+
+    book    chapter    verse    text
+
+where book is the numeric book_id, a book code from bible_books, or the
+book name. A header line is skipped automatically.
+
+Usage:
+    python3 import_bible_text.py kjv.tsv --bible-id de4e12af7f28f599-02 \\
+        --abbreviation KJV --name "King James Version"
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import psycopg2
+
+from setup_database import copy_upsert
+
+# Get database connection
+def get_db_connection():
+    conn_params = {
+        'host': os.getenv('DATABASE_HOST', '127.0.0.1'),
+        'port': os.getenv('DATABASE_PORT', '5432'),
+        'database': os.getenv('DATABASE_NAME', 'wellversed01DEV'),
+        'user': os.getenv('DATABASE_USER', 'wellversed01'),
+        'password': os.getenv('DATABASE_PASSWORD', 'wellversed01')
+    }
+
+    print(f"Connecting to {conn_params['host']}:{conn_params['port']}/{conn_params['database']}...")
+    conn = psycopg2.connect(**conn_params)
+    print("✓ Connected")
+    return conn
+
+def load_verse_ids(cur):
+    """Map book ids, codes and names to book_id, and (book, chapter, verse) to verse id"""
+    cur.execute("SELECT book_id, book_code_3, book_code_4, book_name FROM bible_books")
+    books = {}
+    for book_id, book_code_3, book_code_4, book_name in cur.fetchall():
+        books[str(book_id)] = book_id
+        books[book_name.upper()] = book_id
+        for book_code in (book_code_3, book_code_4):
+            if book_code:
+                books[book_code.upper()] = book_id
+
+    cur.execute("SELECT id, book_id, chapter_number, verse_number FROM bible_verses")
+    verses = {(book_id, chapter, verse): verse_id for verse_id, book_id, chapter, verse in cur.fetchall()}
+    return books, verses
+
+def read_rows(path, books, verses):
+    """Read the input file into (verse_id, text) rows; returns rows, lines read, lines skipped"""
+    rows = []
+    lines = skipped = 0
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        dialect = 'excel-tab' if '\t' in f.readline() else 'excel'
+        f.seek(0)
+
+        for parts in csv.reader(f, dialect):
+            if len(parts) < 4:
+                continue
+            lines += 1
+
+            book_id = books.get(parts[0].strip().upper())
+            try:
+                key = (book_id, int(parts[1]), int(parts[2]))
+            except ValueError:
+                # Header line or malformed reference
+                skipped += 1
+                continue
+
+            verse_id = verses.get(key)
+            text = ' '.join(parts[3].split())
+            if verse_id is None or not text:
+                skipped += 1
+                continue
+
+            rows.append((verse_id, text))
+
+            if lines % 5000 == 0:
+                print(f"  Read {lines} lines...")
+
+    return rows, lines, skipped
+
+def import_translation(conn, path, bible_id, abbreviation, name, license):
+    """Replace the stored text of one translation with the contents of path"""
+    print(f"\n=== Importing {abbreviation} ({bible_id}) ===")
+
+    cur = conn.cursor()
+    cur.execute("SET search_path TO wellversed01DEV")
+
+    try:
+        start = time.time()
+        books, verses = load_verse_ids(cur)
+
+        cur.execute("""
+            INSERT INTO local_translations (bible_id, abbreviation, name, license)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (bible_id) DO UPDATE
+            SET abbreviation = EXCLUDED.abbreviation,
+                name = EXCLUDED.name,
+                license = EXCLUDED.license,
+                imported_at = CURRENT_TIMESTAMP
+        """, (bible_id, abbreviation, name, license))
+        cur.execute("DELETE FROM bible_texts WHERE bible_id = %s", (bible_id,))
+
+        rows, lines, skipped = read_rows(path, books, verses)
+        imported = copy_upsert(cur, 'bible_texts', ['bible_id', 'verse_id', 'text'],
+                               ((bible_id, verse_id, text) for verse_id, text in rows),
+                               conflict=['bible_id', 'verse_id'])
+
+        cur.execute("UPDATE local_translations SET verse_count = %s WHERE bible_id = %s",
+                    (imported, bible_id))
+        conn.commit()
+
+        print(f"✓ Imported {imported} of {len(verses)} verses from {lines} lines "
+              f"({skipped} skipped) in {time.time() - start:.1f}s")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Error importing {abbreviation}: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        cur.close()
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Import a public-domain Bible translation")
+    parser.add_argument('file', help="tab- or comma-separated file: book, chapter, verse, text")
+    parser.add_argument('--bible-id', required=True, help="API.Bible id the local copy replaces")
+    parser.add_argument('--abbreviation', required=True)
+    parser.add_argument('--name', required=True)
+    parser.add_argument('--license', default='Public Domain')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"✗ {args.file} not found")
+        sys.exit(1)
+
+    conn = get_db_connection()
+
+    try:
+        ok = import_translation(conn, args.file, args.bible_id, args.abbreviation, args.name, args.license)
+        if not ok:
+            sys.exit(1)
+        print("\n✓ Import complete! Restart the backend to serve it locally.")
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,12 @@
 import_openbible.py - Import OpenBible topics and cross-references
 """
 import psycopg2
-from psycopg2.extras import execute_values
 import csv
 import os
 import sys
+import time
+
+from setup_database import copy_upsert, load_osis_verse_ids
 
 # Get database connection
 def get_db_connection():
@@ -106,40 +108,15 @@ def import_topics(conn):
                         batch_mappings.append((verse_id, topic_id, votes, confidence))
                 
                 lines_processed += 1
-                
-                # Insert in batches
-                if len(batch_mappings) >= 1000:
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO verse_topics (verse_id, topic_id, votes, confidence_score)
-                        VALUES %s
-                        ON CONFLICT (verse_id, topic_id) DO UPDATE
-                        SET votes = EXCLUDED.votes,
-                            confidence_score = EXCLUDED.confidence_score
-                        """,
-                        batch_mappings,
-                        template="(%s, %s, %s, %s)"
-                    )
-                    conn.commit()
+                if lines_processed % 1000 == 0:
                     print(f"  Processed {lines_processed} lines, {len(batch_mappings)} mappings...")
-                    batch_mappings = []
         
-        # Insert remaining
-        if batch_mappings:
-            execute_values(
-                cur,
-                """
-                INSERT INTO verse_topics (verse_id, topic_id, votes, confidence_score)
-                VALUES %s
-                ON CONFLICT (verse_id, topic_id) DO UPDATE
-                SET votes = EXCLUDED.votes,
-                    confidence_score = EXCLUDED.confidence_score
-                """,
-                batch_mappings,
-                template="(%s, %s, %s, %s)"
-            )
-            conn.commit()
+        # Load every mapping with a single COPY and merge
+        copy_upsert(
+            cur, 'verse_topics', ['verse_id', 'topic_id', 'votes', 'confidence_score'],
+            batch_mappings, conflict=['verse_id', 'topic_id']
+        )
+        conn.commit()
         
         print(f"✓ Imported {len(topics_cache)} topics with {lines_processed} lines")
         return True
@@ -166,6 +143,10 @@ def import_cross_references(conn):
     cur.execute("SET search_path TO wellversed01DEV")
     
     try:
+        started = time.perf_counter()
+        osis_ids = load_osis_verse_ids(cur)
+        print(f"  Loaded {len(osis_ids)} OSIS verse ids in {time.perf_counter() - started:.2f}s")
+        
         batch_refs = []
         lines_processed = 0
         skipped = 0
@@ -184,14 +165,8 @@ def import_cross_references(conn):
                 votes = int(parts[2]) if parts[2].strip() else 0
                 
                 if from_verse and to_verse:
-                    # Get verse IDs
-                    cur.execute("SELECT get_verse_id_from_osis(%s)", (from_verse,))
-                    from_result = cur.fetchone()
-                    from_id = from_result[0] if from_result else None
-                    
-                    cur.execute("SELECT get_verse_id_from_osis(%s)", (to_verse,))
-                    to_result = cur.fetchone()
-                    to_id = to_result[0] if to_result else None
+                    from_id = osis_ids.get(from_verse)
+                    to_id = osis_ids.get(to_verse)
                     
                     if from_id and to_id and from_id != to_id:
                         confidence = min(votes / 100.0, 1.0)
@@ -200,42 +175,22 @@ def import_cross_references(conn):
                         skipped += 1
                 
                 lines_processed += 1
-                
-                # Insert in batches
-                if len(batch_refs) >= 1000:
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO cross_references (from_verse_id, to_verse_id, votes, confidence_score)
-                        VALUES %s
-                        ON CONFLICT (from_verse_id, to_verse_id) DO UPDATE
-                        SET votes = EXCLUDED.votes,
-                            confidence_score = EXCLUDED.confidence_score
-                        """,
-                        batch_refs,
-                        template="(%s, %s, %s, %s)"
-                    )
-                    conn.commit()
+                if lines_processed % 25000 == 0:
                     print(f"  Processed {lines_processed} lines, {len(batch_refs)} references...")
-                    batch_refs = []
         
-        # Insert remaining
-        if batch_refs:
-            execute_values(
-                cur,
-                """
-                INSERT INTO cross_references (from_verse_id, to_verse_id, votes, confidence_score)
-                VALUES %s
-                ON CONFLICT (from_verse_id, to_verse_id) DO UPDATE
-                SET votes = EXCLUDED.votes,
-                    confidence_score = EXCLUDED.confidence_score
-                """,
-                batch_refs,
-                template="(%s, %s, %s, %s)"
-            )
-            conn.commit()
+        parsed = time.perf_counter()
+        print(f"  Resolved {len(batch_refs)} references from {lines_processed} lines in {parsed - started:.2f}s")
+        
+        # Load every reference with a single COPY and merge
+        copy_upsert(
+            cur, 'cross_references', ['from_verse_id', 'to_verse_id', 'votes', 'confidence_score'],
+            batch_refs, conflict=['from_verse_id', 'to_verse_id']
+        )
+        conn.commit()
+        print(f"  Loaded with COPY and merged in {time.perf_counter() - parsed:.2f}s")
         
-        print(f"✓ Imported {lines_processed - skipped} cross-references ({skipped} skipped)")
+        print(f"✓ Imported {lines_processed - skipped} cross-references ({skipped} skipped) "
+              f"in {time.perf_counter() - started:.1f}s")
         return True
         
     except Exception as e:
@@ -329,4 +284,4 @@ def main():
         conn.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
\ No newline at end of file
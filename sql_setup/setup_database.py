@@ -4,7 +4,7 @@ setup_database.py - Database setup script for Well Versed
 Updated to work with reorganized SQL file structure and OpenBible data import
 """
 import psycopg2
-from psycopg2.extras import execute_values
+import io
 import json
 import logging
 import os
@@ -102,6 +102,14 @@ SCHEMA_SQL_FILES = [
     {
         'file': '09-create-cross-references-topics.sql',
         'description': 'Create cross-references and topics tables'
+    },
+    {
+        'file': '14-create-verse-text-cache.sql',
+        'description': 'Create persistent verse text cache'
+    },
+    {
+        'file': '15-create-bible-texts.sql',
+        'description': 'Create local Bible text tables'
     }
 ]
 
@@ -154,6 +162,76 @@ def get_db_connection():
                 logger.error(f"Failed to connect after {max_retries} attempts: {e}")
                 sys.exit(1)
 
+def _copy_field(value):
+    """Encode one value in COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def copy_upsert(cur, table, columns, rows, conflict, update=None):
+    """Bulk upsert rows: COPY into a temp staging table, then merge once
+
+    Same approach as DatabaseConnection.copy_upsert in the backend. By default
+    every non-conflict column is overwritten; update='' means DO NOTHING.
+    Rows sharing a conflict key collapse to the last one. Rows are merged in
+    input order, so SERIAL ids follow it. Returns the merged row count.
+    """
+    staging = f"_copy_{table}"
+    cols = ', '.join(columns)
+    keys = ', '.join(conflict)
+    if update is None:
+        update = ', '.join(f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict)
+    action = f"DO UPDATE SET {update}" if update else "DO NOTHING"
+
+    buffer = io.StringIO()
+    for position, row in enumerate(rows):
+        buffer.write(f"{position}\t" + '\t'.join(_copy_field(v) for v in row) + '\n')
+    buffer.seek(0)
+
+    # _position keeps the input order through DISTINCT ON, which sorts by key
+    cur.execute(f"DROP TABLE IF EXISTS {staging}; "
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT 0::bigint AS _position, {cols} FROM {table} WITH NO DATA")
+    cur.copy_expert(f"COPY {staging} (_position, {cols}) FROM STDIN", buffer)
+    cur.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM ("
+                f"SELECT DISTINCT ON ({keys}) * FROM {staging} ORDER BY {keys}, _position DESC"
+                f") latest ORDER BY _position "
+                f"ON CONFLICT ({keys}) {action}")
+    return cur.rowcount
+
+# OSIS book abbreviations, as mapped by get_verse_id_from_osis() in
+# 09-create-cross-references-topics.sql
+OSIS_BOOKS = {
+    # Old Testament
+    'Gen': 1, 'Exod': 2, 'Lev': 3, 'Num': 4, 'Deut': 5, 'Josh': 6, 'Judg': 7, 'Ruth': 8,
+    '1Sam': 9, '2Sam': 10, '1Kgs': 11, '2Kgs': 12, '1Chr': 13, '2Chr': 14, 'Ezra': 15, 'Neh': 16,
+    'Esth': 17, 'Job': 18, 'Ps': 19, 'Prov': 20, 'Eccl': 21, 'Song': 22, 'Isa': 23, 'Jer': 24,
+    'Lam': 25, 'Ezek': 26, 'Dan': 27, 'Hos': 28, 'Joel': 29, 'Amos': 30, 'Obad': 31, 'Jonah': 32,
+    'Mic': 33, 'Nah': 34, 'Hab': 35, 'Zeph': 36, 'Hag': 37, 'Zech': 38, 'Mal': 39,
+    # New Testament
+    'Matt': 40, 'Mark': 41, 'Luke': 42, 'John': 43, 'Acts': 44, 'Rom': 45, '1Cor': 46, '2Cor': 47,
+    'Gal': 48, 'Eph': 49, 'Phil': 50, 'Col': 51, '1Thess': 52, '2Thess': 53, '1Tim': 54, '2Tim': 55,
+    'Titus': 56, 'Phlm': 57, 'Heb': 58, 'Jas': 59, '1Pet': 60, '2Pet': 61, '1John': 62, '2John': 63,
+    '3John': 64, 'Jude': 65, 'Rev': 66,
+}
+
+def load_osis_verse_ids(cur):
+    """Map every OSIS verse reference ("Gen.1.1") to its bible_verses id
+
+    One query up front replaces a get_verse_id_from_osis() round trip per
+    reference. Like that function, ranges ("Gen.1.1-Gen.1.3") have no entry.
+    """
+    abbrevs = {book_id: abbrev for abbrev, book_id in OSIS_BOOKS.items()}
+    cur.execute("SELECT id, book_id, chapter_number, verse_number FROM bible_verses")
+    return {
+        f"{abbrevs[book_id]}.{chapter}.{verse}": verse_id
+        for verse_id, book_id, chapter, verse in cur.fetchall()
+        if book_id in abbrevs
+    }
+
 def execute_sql_file(conn, filepath, description):
     """Execute a SQL file with proper error handling"""
     if not os.path.exists(filepath):
@@ -310,43 +388,23 @@ def populate_bible_data(conn):
         
         # Insert books
         logger.info("\nInserting Bible books...")
-        execute_values(
-            cur,
-            """INSERT INTO bible_books (book_id, book_name, book_code_3, book_code_4,
-                                       testament, book_group, canonical_affiliation, chapter_count)
-               VALUES %s ON CONFLICT (book_id) DO NOTHING""",
-            books_to_insert,
-            template="(%s, %s, %s, %s, %s, %s, %s, %s)"
+        copy_upsert(
+            cur, 'bible_books',
+            ['book_id', 'book_name', 'book_code_3', 'book_code_4',
+             'testament', 'book_group', 'canonical_affiliation', 'chapter_count'],
+            books_to_insert, conflict=['book_id'], update=''
         )
         logger.success(f"Inserted {len(books_to_insert)} Bible books")
         
-        # Insert verses in batches with progress
+        # Insert all verses with a single COPY
         logger.info("\nInserting Bible verses...")
-        batch_size = 1000
-        total_batches = (len(verses_to_insert) + batch_size - 1) // batch_size
-        
-        for i in range(0, len(verses_to_insert), batch_size):
-            batch = verses_to_insert[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            
-            execute_values(
-                cur,
-                """INSERT INTO bible_verses (verse_code, book_id, chapter_number, verse_number, is_apocryphal)
-                   VALUES %s ON CONFLICT (verse_code) DO NOTHING""",
-                batch,
-                template="(%s, %s, %s, %s, %s)"
-            )
-            
-            # Progress bar
-            progress = batch_num / total_batches
-            bar_length = 40
-            filled_length = int(bar_length * progress)
-            bar = '█' * filled_length + '░' * (bar_length - filled_length)
-            sys.stdout.write(f'\r  Progress: [{bar}] {batch_num}/{total_batches} batches')
-            sys.stdout.flush()
-        
-        print()  # New line after progress bar
-        logger.success(f"Inserted {len(verses_to_insert)} Bible verses")
+        start = time.time()
+        copy_upsert(
+            cur, 'bible_verses',
+            ['verse_code', 'book_id', 'chapter_number', 'verse_number', 'is_apocryphal'],
+            verses_to_insert, conflict=['verse_code'], update=''
+        )
+        logger.success(f"Inserted {len(verses_to_insert)} Bible verses in {time.time() - start:.2f}s")
         
         conn.commit()
         return True
@@ -419,45 +477,17 @@ def import_openbible_topics(conn):
                             batch_mappings[key] = (votes, confidence)
                 
                 lines_processed += 1
-                
-                # Insert in batches
-                if len(batch_mappings) >= 1000:
-                    # Convert dict to list for execute_values
-                    mappings_list = [(k[0], k[1], v[0], v[1]) for k, v in batch_mappings.items()]
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO verse_topics (verse_id, topic_id, votes, confidence_score)
-                        VALUES %s
-                        ON CONFLICT (verse_id, topic_id) DO UPDATE
-                        SET votes = EXCLUDED.votes,
-                            confidence_score = EXCLUDED.confidence_score
-                        """,
-                        mappings_list,
-                        template="(%s, %s, %s, %s)"
-                    )
-                    conn.commit()
+                if lines_processed % 1000 == 0:
                     sys.stdout.write(f"\r  Progress: {lines_processed} lines processed, {len(topics_cache)} topics...")
                     sys.stdout.flush()
-                    batch_mappings = {}
-        
-        # Insert remaining batch
-        if batch_mappings:
-            # Convert dict to list for execute_values
-            mappings_list = [(k[0], k[1], v[0], v[1]) for k, v in batch_mappings.items()]
-            execute_values(
-                cur,
-                """
-                INSERT INTO verse_topics (verse_id, topic_id, votes, confidence_score)
-                VALUES %s
-                ON CONFLICT (verse_id, topic_id) DO UPDATE
-                SET votes = EXCLUDED.votes,
-                    confidence_score = EXCLUDED.confidence_score
-                """,
-                mappings_list,
-                template="(%s, %s, %s, %s)"
-            )
-            conn.commit()
+        
+        # Load every mapping with a single COPY and merge
+        mappings_list = [(k[0], k[1], v[0], v[1]) for k, v in batch_mappings.items()]
+        copy_upsert(
+            cur, 'verse_topics', ['verse_id', 'topic_id', 'votes', 'confidence_score'],
+            mappings_list, conflict=['verse_id', 'topic_id']
+        )
+        conn.commit()
         
         print()  # New line after progress
         logger.success(f"Imported {len(topics_cache)} topics with {lines_processed} mappings")
@@ -487,7 +517,11 @@ def import_openbible_cross_references(conn):
     cur.execute("SET search_path TO wellversed01DEV")
     
     try:
-        logger.info("\nReading cross-references file...")
+        started = time.perf_counter()
+        osis_ids = load_osis_verse_ids(cur)
+        logger.info(f"\nLoaded {len(osis_ids)} OSIS verse ids in {time.perf_counter() - started:.2f}s")
+        
+        logger.info("Reading cross-references file...")
         batch_refs = []
         lines_processed = 0
         skipped = 0
@@ -505,14 +539,8 @@ def import_openbible_cross_references(conn):
                 votes = int(row[2]) if row[2].strip() else 0
                 
                 if from_verse and to_verse:
-                    # Get verse IDs using OSIS format
-                    cur.execute("SELECT get_verse_id_from_osis(%s)", (from_verse,))
-                    from_result = cur.fetchone()
-                    from_id = from_result[0] if from_result else None
-                    
-                    cur.execute("SELECT get_verse_id_from_osis(%s)", (to_verse,))
-                    to_result = cur.fetchone()
-                    to_id = to_result[0] if to_result else None
+                    from_id = osis_ids.get(from_verse)
+                    to_id = osis_ids.get(to_verse)
                     
                     if from_id and to_id and from_id != to_id:
                         # Normalize confidence score (max votes seen is around 100)
@@ -522,44 +550,24 @@ def import_openbible_cross_references(conn):
                         skipped += 1
                 
                 lines_processed += 1
-                
-                # Insert in batches
-                if len(batch_refs) >= 1000:
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO cross_references (from_verse_id, to_verse_id, votes, confidence_score)
-                        VALUES %s
-                        ON CONFLICT (from_verse_id, to_verse_id) DO UPDATE
-                        SET votes = EXCLUDED.votes,
-                            confidence_score = EXCLUDED.confidence_score
-                        """,
-                        batch_refs,
-                        template="(%s, %s, %s, %s)"
-                    )
-                    conn.commit()
+                if lines_processed % 25000 == 0:
                     sys.stdout.write(f"\r  Progress: {lines_processed} lines, {len(batch_refs)} references...")
                     sys.stdout.flush()
-                    batch_refs = []
-        
-        # Insert remaining batch
-        if batch_refs:
-            execute_values(
-                cur,
-                """
-                INSERT INTO cross_references (from_verse_id, to_verse_id, votes, confidence_score)
-                VALUES %s
-                ON CONFLICT (from_verse_id, to_verse_id) DO UPDATE
-                SET votes = EXCLUDED.votes,
-                    confidence_score = EXCLUDED.confidence_score
-                """,
-                batch_refs,
-                template="(%s, %s, %s, %s)"
-            )
-            conn.commit()
         
         print()  # New line after progress
-        logger.success(f"Imported {lines_processed - skipped} cross-references ({skipped} skipped)")
+        parsed = time.perf_counter()
+        logger.info(f"Resolved {len(batch_refs)} references from {lines_processed} lines in {parsed - started:.2f}s")
+        
+        # Load every reference with a single COPY and merge
+        copy_upsert(
+            cur, 'cross_references', ['from_verse_id', 'to_verse_id', 'votes', 'confidence_score'],
+            batch_refs, conflict=['from_verse_id', 'to_verse_id']
+        )
+        conn.commit()
+        logger.info(f"Loaded with COPY and merged in {time.perf_counter() - parsed:.2f}s")
+        
+        logger.success(f"Imported {lines_processed - skipped} cross-references ({skipped} skipped) "
+                       f"in {time.perf_counter() - started:.1f}s")
         return True
         
     except Exception as e:
@@ -846,4 +854,4 @@ def main():
         print()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
\ No newline at end of file